@@ -1,18 +1,30 @@
 import datetime
 import logging
 import math
-import os
 import time
 from typing import Optional, Tuple
 from requests import Session
 from requests.adapters import HTTPAdapter, Retry
 
 from staketaxcsv.algo.config_algo import localconfig
-from staketaxcsv.common.debug_util import debug_cache
-from staketaxcsv.settings_csv import ALGO_INDEXER_NODE, REPORTS_DIR
+from staketaxcsv.common.response_cache import response_cache, TTL_FOREVER
+from staketaxcsv.settings_csv import ALGO_INDEXER_NODE
 
 # https://developer.algorand.org/docs/get-details/indexer/#paginated-results
 INDEXER_LIMIT = 2000
+TTL_ASSET = 7 * 24 * 3600
+
+
+def _ttl_transactions(call_args, result):
+    # Pages behind a next-token never change; the first page is the head.  Empty/failed queries not cached.
+    transactions, next = result
+    if not transactions:
+        return 0
+    return TTL_FOREVER if call_args["next"] else None
+
+
+def _ttl_finalized(call_args, result):
+    return TTL_FOREVER if result else 0
 
 
 # API documentation: https://editor.swagger.io/?url=https://openapi.algonode.cloud/indexer2.oas3.json
@@ -33,7 +45,7 @@ class Indexer:
 
         return status_code == 200
 
-    @debug_cache(os.path.join(REPORTS_DIR, "algo", "accounts"))
+    @response_cache()
     def get_account(self, address: str) -> Optional[dict]:
         """
         This function retrieves account information for a given address.
@@ -75,6 +87,7 @@ class Indexer:
         else:
             return None
 
+    @response_cache(ttl=_ttl_transactions)
     def get_transactions(self,
                          address: str,
                          after_date: Optional[datetime.date] = None,
@@ -117,7 +130,6 @@ class Indexer:
         else:
             return [], None
 
-    @debug_cache(os.path.join(REPORTS_DIR, "algo", "transactions"))
     def get_all_transactions(self, address: str) -> list:
         """
         This function retrieves all transactions for a given address within a specified date range and
@@ -174,7 +186,7 @@ class Indexer:
         else:
             return []
 
-    @debug_cache(os.path.join(REPORTS_DIR, "algo", "transactions"))
+    @response_cache(ttl=_ttl_finalized)
     def get_transactions_by_app(self, app_id: int, round: int, address: Optional[str] = None) -> list[dict]:
         """
         This function retrieves a list of transactions for a specific application ID, round, and optional
@@ -204,7 +216,7 @@ class Indexer:
         else:
             return []
 
-    @debug_cache(os.path.join(REPORTS_DIR, "algo", "assets"))
+    @response_cache(ttl=TTL_ASSET)
     def get_asset(self, id: int) -> Optional[dict]:
         """
         This function retrieves asset information.
@@ -230,7 +242,7 @@ class Indexer:
         else:
             return None
 
-    @debug_cache(os.path.join(REPORTS_DIR, "algo", "assets"))
+    @response_cache(ttl=TTL_ASSET)
     def get_deleted_asset(self, id: int) -> Optional[dict]:
         """
         This function retrieves information for an asset that has been deleted.
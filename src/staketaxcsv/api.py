@@ -1,81 +1,64 @@
+import importlib
 import logging
+from collections.abc import Mapping
 
 from staketaxcsv import settings_csv as co
 from staketaxcsv.common.ExporterTypes import FORMATS
 
-import staketaxcsv.report_algo
-import staketaxcsv.report_akt
-import staketaxcsv.report_arch
-import staketaxcsv.report_atom
-import staketaxcsv.report_bld
-import staketaxcsv.report_btsg
-import staketaxcsv.report_cosmosplus
-import staketaxcsv.report_dvpn
-import staketaxcsv.report_dydx
-import staketaxcsv.report_dym
-import staketaxcsv.report_evmos
-import staketaxcsv.report_fet
-import staketaxcsv.report_grav
-import staketaxcsv.report_huahua
-import staketaxcsv.report_inj
-import staketaxcsv.report_iotex
-import staketaxcsv.report_juno
-import staketaxcsv.report_kuji
-import staketaxcsv.report_kyve
-import staketaxcsv.report_luna1
-import staketaxcsv.report_luna2
-import staketaxcsv.report_mntl
-import staketaxcsv.report_nls
-import staketaxcsv.report_ntrn
-import staketaxcsv.report_osmo
-import staketaxcsv.report_orai
-import staketaxcsv.report_regen
-import staketaxcsv.report_rowan
-import staketaxcsv.report_saga
-import staketaxcsv.report_scrt
-import staketaxcsv.report_sol
-import staketaxcsv.report_stars
-import staketaxcsv.report_strd
-import staketaxcsv.report_tia
-import staketaxcsv.report_tori
-
-REPORT_MODULES = {
-    co.TICKER_ALGO: staketaxcsv.report_algo,
-    co.TICKER_AKT: staketaxcsv.report_akt,
-    co.TICKER_ARCH: staketaxcsv.report_arch,
-    co.TICKER_ATOM: staketaxcsv.report_atom,
-    co.TICKER_BLD: staketaxcsv.report_bld,
-    co.TICKER_BTSG: staketaxcsv.report_btsg,
-    co.TICKER_COSMOSPLUS: staketaxcsv.report_cosmosplus,
-    co.TICKER_DVPN: staketaxcsv.report_dvpn,
-    co.TICKER_DYDX: staketaxcsv.report_dydx,
-    co.TICKER_DYM: staketaxcsv.report_dym,
-    co.TICKER_EVMOS: staketaxcsv.report_evmos,
-    co.TICKER_FET: staketaxcsv.report_fet,
-    co.TICKER_GRAV: staketaxcsv.report_grav,
-    co.TICKER_HUAHUA: staketaxcsv.report_huahua,
-    co.TICKER_IOTEX: staketaxcsv.report_iotex,
-    co.TICKER_INJ: staketaxcsv.report_inj,
-    co.TICKER_JUNO: staketaxcsv.report_juno,
-    co.TICKER_KUJI: staketaxcsv.report_kuji,
-    co.TICKER_KYVE: staketaxcsv.report_kyve,
-    co.TICKER_LUNA1: staketaxcsv.report_luna1,
-    co.TICKER_LUNA2: staketaxcsv.report_luna2,
-    co.TICKER_MNTL: staketaxcsv.report_mntl,
-    co.TICKER_NLS: staketaxcsv.report_nls,
-    co.TICKER_NTRN: staketaxcsv.report_ntrn,
-    co.TICKER_OSMO: staketaxcsv.report_osmo,
-    co.TICKER_ORAI: staketaxcsv.report_orai, 
-    co.TICKER_REGEN: staketaxcsv.report_regen,
-    co.TICKER_ROWAN: staketaxcsv.report_rowan,
-    co.TICKER_SAGA: staketaxcsv.report_saga,
-    co.TICKER_SCRT: staketaxcsv.report_scrt,
-    co.TICKER_SOL: staketaxcsv.report_sol,
-    co.TICKER_STARS: staketaxcsv.report_stars,
-    co.TICKER_STRD: staketaxcsv.report_strd,
-    co.TICKER_TIA: staketaxcsv.report_tia,
-    co.TICKER_TORI: staketaxcsv.report_tori,
-}
+
+class _ReportModules(Mapping):
+    """ ticker -> report module.  Each module is imported on first use (importing all of them is slow). """
+
+    def __init__(self, module_names):
+        self.module_names = module_names
+
+    def __getitem__(self, ticker):
+        return importlib.import_module(self.module_names[ticker])
+
+    def __iter__(self):
+        return iter(self.module_names)
+
+    def __len__(self):
+        return len(self.module_names)
+
+
+REPORT_MODULES = _ReportModules({
+    co.TICKER_ALGO: "staketaxcsv.report_algo",
+    co.TICKER_AKT: "staketaxcsv.report_akt",
+    co.TICKER_ARCH: "staketaxcsv.report_arch",
+    co.TICKER_ATOM: "staketaxcsv.report_atom",
+    co.TICKER_BLD: "staketaxcsv.report_bld",
+    co.TICKER_BTSG: "staketaxcsv.report_btsg",
+    co.TICKER_COSMOSPLUS: "staketaxcsv.report_cosmosplus",
+    co.TICKER_DVPN: "staketaxcsv.report_dvpn",
+    co.TICKER_DYDX: "staketaxcsv.report_dydx",
+    co.TICKER_DYM: "staketaxcsv.report_dym",
+    co.TICKER_EVMOS: "staketaxcsv.report_evmos",
+    co.TICKER_FET: "staketaxcsv.report_fet",
+    co.TICKER_GRAV: "staketaxcsv.report_grav",
+    co.TICKER_HUAHUA: "staketaxcsv.report_huahua",
+    co.TICKER_IOTEX: "staketaxcsv.report_iotex",
+    co.TICKER_INJ: "staketaxcsv.report_inj",
+    co.TICKER_JUNO: "staketaxcsv.report_juno",
+    co.TICKER_KUJI: "staketaxcsv.report_kuji",
+    co.TICKER_KYVE: "staketaxcsv.report_kyve",
+    co.TICKER_LUNA1: "staketaxcsv.report_luna1",
+    co.TICKER_LUNA2: "staketaxcsv.report_luna2",
+    co.TICKER_MNTL: "staketaxcsv.report_mntl",
+    co.TICKER_NLS: "staketaxcsv.report_nls",
+    co.TICKER_NTRN: "staketaxcsv.report_ntrn",
+    co.TICKER_OSMO: "staketaxcsv.report_osmo",
+    co.TICKER_ORAI: "staketaxcsv.report_orai",
+    co.TICKER_REGEN: "staketaxcsv.report_regen",
+    co.TICKER_ROWAN: "staketaxcsv.report_rowan",
+    co.TICKER_SAGA: "staketaxcsv.report_saga",
+    co.TICKER_SCRT: "staketaxcsv.report_scrt",
+    co.TICKER_SOL: "staketaxcsv.report_sol",
+    co.TICKER_STARS: "staketaxcsv.report_stars",
+    co.TICKER_STRD: "staketaxcsv.report_strd",
+    co.TICKER_TIA: "staketaxcsv.report_tia",
+    co.TICKER_TORI: "staketaxcsv.report_tori",
+})
 
 
 def tickers():
@@ -128,7 +111,7 @@ def csv(ticker, wallet_address, csv_format, path=None, options=None, logs=True):
     exporter.export_format(csv_format, path)
 
 
-def csv_all(ticker, wallet_address, dirpath=None, options=None, logs=True):
+def csv_all(ticker, wallet_address, dirpath=None, options=None, logs=True, max_workers=None):
     """ Writes CSV files, for this wallet address, in all CSV formats.
 
     :param ticker: ALGO|ATOM|LUNA1|LUNA2|...   [see staketaxcsv.tickers()]
@@ -137,6 +120,8 @@ def csv_all(ticker, wallet_address, dirpath=None, options=None, logs=True):
                      By default, writes to /tmp .
     :param options: (optional)
     :param logs: (optional) show logging.  Defaults to True.
+    :param max_workers: (optional) number of processes writing CSV files.  Defaults to
+                        STAKETAX_EXPORT_MAX_WORKERS environment variable (1).
     """
     dirpath = dirpath if dirpath else "/tmp"
     options = options if options else {}
@@ -154,9 +139,29 @@ def csv_all(ticker, wallet_address, dirpath=None, options=None, logs=True):
         exporter.export_print()
 
     # Write CSVs
-    for cur_format in FORMATS:
-        path = "{}/{}.{}.{}.csv".format(dirpath, ticker, wallet_address, cur_format)
-        exporter.export_format(cur_format, path)
+    formats_paths = {
+        cur_format: "{}/{}.{}.{}.csv".format(dirpath, ticker, wallet_address, cur_format) for cur_format in FORMATS
+    }
+    exporter.export_formats(formats_paths, max_workers if max_workers else co.EXPORT_MAX_WORKERS)
+
+
+def csv_batch(jobs, dirpath=None, max_workers=None, logs=True):
+    """ Writes CSV files for many wallets, running jobs concurrently in worker processes.
+
+    :param jobs: list of dicts {"ticker": ..., "wallet": ..., "format": (optional), "options": (optional)}
+                 (no "format" means all CSV formats, as in csv_all())
+    :param dirpath: (optional) <string directory path> directory to write CSV files to.
+                     By default, writes to /tmp .
+    :param max_workers: (optional) number of worker processes.  Defaults to 4.
+    :param logs: (optional) show logging.  Defaults to True.
+    :return: list of results {"ticker", "wallet", "ok", "error", "paths", "seconds"}, in order of jobs
+    """
+    from staketaxcsv.batch import MAX_WORKERS, run_batch
+
+    if logs:
+        logging.basicConfig(level=logging.INFO)
+
+    return run_batch(jobs, dirpath, max_workers if max_workers else MAX_WORKERS)
 
 
 def transaction(ticker, wallet_address, txid, csv_format="", path="", options=None):
@@ -203,7 +208,7 @@ def historical_balances(ticker, wallet_address, path=None, options=None, logs=""
 
     module = REPORT_MODULES[ticker]
 
-    if hasattr(module, staketaxcsv.report_akt.balhistory.__name__):
+    if hasattr(module, "balhistory"):
         module.read_options(options)
         bal_exporter = module.balhistory(wallet_address)
         if not bal_exporter:
@@ -3,6 +3,7 @@ import staketaxcsv.atom.cosmoshub123.processor_1
 import staketaxcsv.atom.cosmoshub123.processor_2
 import staketaxcsv.atom.cosmoshub123.processor_3
 import staketaxcsv.common.ibc.api_lcd_v1
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 from staketaxcsv.atom.config_atom import localconfig
@@ -10,6 +11,8 @@ from staketaxcsv.settings_csv import ATOM_NODE
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(ATOM_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
@@ -0,0 +1,162 @@
+"""
+usage: python3 staketaxcsv/batch.py <manifest.json|manifest.jsonl> [--dirpath DIR] [--max_workers N]
+
+Writes CSVs for many wallets (of any tickers), running jobs in a pool of worker processes.
+
+  * manifest: json list (or one json object per line) of jobs:
+      {"ticker": "ATOM", "wallet": "cosmos1...", "format": "koinly", "options": {"start_date": "2023-01-01"}}
+    "format" is optional (default: all formats, as in api.csv_all()).  "options" is optional (as in api.csv()).
+  * Each job runs with fresh report config (localconfig), so options never leak between jobs of the same worker.
+  * Node rate limits (STAKETAX_NODE_REQUESTS_PER_SECOND, etc.) are shared by all workers.
+  * Progress is logged as jobs finish; results are written to <dirpath>/batch_results.json .
+
+"""
+
+import argparse
+import copy
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from staketaxcsv.common.rate_limiter import RateLimiter
+
+MAX_WORKERS = 4
+RESULTS_FILENAME = "batch_results.json"
+
+# report module name -> {attribute: default value} of its localconfig (before any job ran in this process)
+_config_defaults = {}
+
+
+def read_manifest(path):
+    """ Returns list of job dicts from json list file or json lines file. """
+    with open(path, "r") as f:
+        text = f.read().strip()
+
+    if text.startswith("["):
+        jobs = json.loads(text)
+    else:
+        jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    for i, job in enumerate(jobs):
+        if "ticker" not in job or "wallet" not in job:
+            raise Exception(f"Bad manifest job #{i}: ticker and wallet are required: {job}")
+    return jobs
+
+
+def run_batch(jobs, dirpath=None, max_workers=MAX_WORKERS, progress_callback=None):
+    """ Runs jobs in worker processes.  Returns list of results (same order as jobs).
+
+    :param jobs: list of dicts {"ticker", "wallet", "format" (optional), "options" (optional)}
+    :param dirpath: (optional) directory to write CSV files to.  By default, writes to /tmp .
+    :param max_workers: (optional) number of worker processes
+    :param progress_callback: (optional) function(num_done, num_jobs, result), called as each job finishes
+    """
+    dirpath = dirpath if dirpath else "/tmp"
+    results = [None] * len(jobs)
+    time_start = time.time()
+    num_failed = 0
+
+    with multiprocessing.Manager() as manager:
+        next_times, lock = manager.dict(), manager.Lock()
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(next_times, lock)) as executor:
+            futures = {executor.submit(_run_job, job, dirpath): i for i, job in enumerate(jobs)}
+
+            for num_done, future in enumerate(as_completed(futures), start=1):
+                i = futures[future]
+                results[i] = future.result()
+                if not results[i]["ok"]:
+                    num_failed += 1
+
+                logging.info("batch: %s/%s jobs done (%s failed, %.0f seconds elapsed).  %s %s: %s",
+                             num_done, len(jobs), num_failed, time.time() - time_start,
+                             results[i]["ticker"], results[i]["wallet"],
+                             "ok" if results[i]["ok"] else results[i]["error"])
+                if progress_callback:
+                    progress_callback(num_done, len(jobs), results[i])
+
+    return results
+
+
+def _init_worker(next_times, lock):
+    RateLimiter.share_across_processes(next_times, lock)
+
+
+def _run_job(job, dirpath):
+    from staketaxcsv import api
+
+    ticker, wallet = job["ticker"], job["wallet"]
+    csv_format = job.get("format")
+    options = job.get("options") or {}
+
+    result = {"ticker": ticker, "wallet": wallet, "ok": True, "error": None, "paths": [], "seconds": 0}
+    time_start = time.time()
+    try:
+        _reset_config(api.REPORT_MODULES[ticker])
+
+        if csv_format:
+            path = os.path.join(dirpath, "{}.{}.{}.csv".format(ticker, wallet, csv_format))
+            api.csv(ticker, wallet, csv_format, path=path, options=options, logs=False)
+            result["paths"] = [path]
+        else:
+            api.csv_all(ticker, wallet, dirpath=dirpath, options=options, logs=False, max_workers=1)
+            result["paths"] = [os.path.join(dirpath, "{}.{}.{}.csv".format(ticker, wallet, cur_format))
+                               for cur_format in api.formats()]
+    except Exception as e:
+        logging.exception("batch: job failed for ticker=%s, wallet=%s", ticker, wallet)
+        result["ok"] = False
+        result["error"] = "{}: {}".format(type(e).__name__, e)
+
+    result["seconds"] = round(time.time() - time_start, 1)
+    return result
+
+
+def _reset_config(module):
+    """ Restores module's localconfig to defaults (worker processes run many jobs). """
+    localconfig = module.localconfig
+    name = module.__name__
+
+    if name not in _config_defaults:
+        # First job in this worker: current values are defaults
+        _config_defaults[name] = {
+            k: copy.deepcopy(v) for k, v in vars(localconfig).items()
+            if not k.startswith("__") and not inspect.isroutine(v) and not isinstance(v, (classmethod, staticmethod))
+        }
+        return
+
+    defaults = _config_defaults[name]
+    for k in list(vars(localconfig)):
+        if not k.startswith("__") and k not in defaults and not inspect.isroutine(getattr(localconfig, k)):
+            delattr(localconfig, k)
+    for k, v in defaults.items():
+        setattr(localconfig, k, copy.deepcopy(v))
+
+
+def main():
+    logging.basicConfig(format='%(asctime)s %(levelname)-8s %(message)s',
+                        level=logging.INFO,
+                        datefmt='%Y-%m-%d %H:%M:%S')
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("manifest", help="json (or json lines) file of jobs")
+    parser.add_argument("--dirpath", type=str, default="/tmp", help="directory to write CSV files to")
+    parser.add_argument("--max_workers", type=int, default=MAX_WORKERS, help="number of worker processes")
+    args = parser.parse_args()
+
+    jobs = read_manifest(args.manifest)
+    results = run_batch(jobs, args.dirpath, args.max_workers)
+
+    path = os.path.join(args.dirpath, RESULTS_FILENAME)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+    num_failed = len([r for r in results if not r["ok"]])
+    logging.info("Wrote %s (%s jobs, %s failed)", path, len(results), num_failed)
+
+
+if __name__ == "__main__":
+    main()
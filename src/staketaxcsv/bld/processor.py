@@ -1,6 +1,7 @@
 import logging
 
 import staketaxcsv.bld.constants as co
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 from staketaxcsv.bld.config_bld import localconfig
@@ -8,6 +9,8 @@ from staketaxcsv.settings_csv import BLD_NODE
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(BLD_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
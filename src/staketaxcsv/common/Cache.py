@@ -1,6 +1,11 @@
-import boto3
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+
+from staketaxcsv.common.cache_backends import make_backend
+from staketaxcsv.settings_csv import DB_CACHE_BACKEND, DB_CACHE_PATH, REPORTS_DIR
 
 STAGE = os.environ.get("STAGE")
 DYNAMO_TABLE_CACHE = "prod_cache" if STAGE == "prod" else "dev_cache"
@@ -13,47 +18,84 @@ FIELD_OSMO_EXPONENTS = "osmo_exponents"
 FIELD_LUNA2_CONTRACTS = "luna2_contracts"
 FIELD_LUNA2_CURRENCY_ADDRESSES = "luna2_currency_addresses"
 FIELD_LUNA2_LP_CURRENCY_ADDRESSES = "luna2_lp_currency_addresses"
+LRU_MAX_FIELDS = 32
+LRU_TTL_SECONDS = 600  # fields are read from backend again after this (to pick up other processes' writes)
 
 
 class Cache:
+    """
+    Cached lookup data, stored in backend (STAKETAX_DB_CACHE_BACKEND) and fronted by process-wide LRU of fields.
+
+    Merged fields are read from backend at most once per LRU_TTL_SECONDS.  Merges then only write the keys that
+    changed (instead of rewriting the whole field).  Overwritten fields (i.e. koinly null map) are not kept in the
+    LRU, so that each read gets the backend's latest value.
+    """
 
-    dynamodb = None
-    table = None
+    backend = None
+    lru = OrderedDict()  # field_name -> (expires_at, data)
+    lock = threading.Lock()
 
     def __init__(self):
-        if not Cache.dynamodb:
-            Cache.dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-            Cache.table = Cache.dynamodb.Table(DYNAMO_TABLE_CACHE)
+        if not Cache.backend:
+            Cache.backend = make_backend(
+                DB_CACHE_BACKEND,
+                path=DB_CACHE_PATH or os.path.join(REPORTS_DIR, "cache.db"),
+                table_name=DYNAMO_TABLE_CACHE,
+            )
+
+    @classmethod
+    def clear_lru(cls):
+        with cls.lock:
+            cls.lru.clear()
 
     def _set_overwrite(self, field_name, data):
-        response = Cache.table.put_item(
-            Item={
-                'field': field_name,
-                'data': data
-            }
-        )
-        logging.info("Updated %s ", field_name, extra={"response": response})
+        Cache.backend.put(field_name, data)
 
     def _set_merge(self, field_name, data):
-        prev_data = self._get(field_name)
-        prev_data.update(data)
+        prev_data = self._get_cached(field_name)
+        changed = {k: v for k, v in data.items() if k not in prev_data or prev_data[k] != v}
+        if not changed:
+            return
 
-        self._set_overwrite(field_name, prev_data)
+        Cache.backend.upsert(field_name, changed)
+        self._lru_set(field_name, {**prev_data, **changed})
 
     def _get(self, field_name):
-        response = Cache.table.get_item(
-            Key={'field': field_name}
-        )
+        # Copy, since callers mutate result (i.e. add newly found addresses before calling set_*())
+        data = self._get_cached(field_name)
+        return data.copy() if isinstance(data, (dict, list)) else data
+
+    def _get_cached(self, field_name):
+        with Cache.lock:
+            if field_name in Cache.lru:
+                expires_at, data = Cache.lru[field_name]
+                if time.monotonic() < expires_at:
+                    Cache.lru.move_to_end(field_name)
+                    return data
+                del Cache.lru[field_name]
+
+        data = self._get_backend(field_name)
+        self._lru_set(field_name, data)
+        return data
 
-        if "Item" not in response:
+    def _get_backend(self, field_name):
+        data = Cache.backend.get(field_name)
+        if data is None:
             logging.warning("_get(): Unable to retrieve for field_name=%s", field_name)
-
-            return {}
-        item = response['Item']
-        logging.info("Retrieved %s data.", field_name)
-        data = item['data']
+            data = {}
+        else:
+            logging.info("Retrieved %s data.", field_name)
         return data
 
+    def _lru_set(self, field_name, data):
+        # Copy, since caller may keep mutating data
+        data = data.copy() if isinstance(data, (dict, list)) else data
+        with Cache.lock:
+            Cache.lru[field_name] = (time.monotonic() + LRU_TTL_SECONDS, data)
+            Cache.lru.move_to_end(field_name)
+            while len(Cache.lru) > LRU_MAX_FIELDS:
+                Cache.lru.popitem(last=False)
+
     def set_terra_currency_addresses(self, data):
         # Remove entries where no symbol was found or empty attribute
         data = {k: v for k, v in data.items() if (k and v)}
@@ -121,7 +163,7 @@ class Cache:
         return self._set_overwrite(FIELD_KOINLY_NULL_MAP, data)
 
     def get_koinly_null_map(self):
-        val = self._get(FIELD_KOINLY_NULL_MAP)
+        val = self._get_backend(FIELD_KOINLY_NULL_MAP)
         if val:
             return val
         else:
@@ -1,27 +1,38 @@
 import csv
 import io
 import logging
+import sys
 import time
 import json
 from datetime import datetime, timedelta
-import copy
+from concurrent.futures import ProcessPoolExecutor
 
-import pandas as pd
 import pytz
 from pytz import timezone
 from staketaxcsv.common import ExporterTypes as et
+from staketaxcsv.common.exporter_currency import currency_map
 from staketaxcsv.common.exporter_koinly import NullMap
-from staketaxcsv.settings_csv import TICKER_ALGO, TICKER_LUNA1, TICKER_LUNA2, TICKER_OSMO, CRYPTACT_UNSUPPORTED_COINS
+from staketaxcsv.settings_csv import TICKER_OSMO, CRYPTACT_UNSUPPORTED_COINS
 from tabulate import tabulate
 from staketaxcsv.luna1.constants import EXCHANGE_TERRA_CLASSIC_BLOCKCHAIN
 
 
+def _parse_timestamp(ts):
+    """ Parses "2021-08-04 15:25:43" (much faster than datetime.strptime(), which is called for every row) """
+    return datetime.fromisoformat(ts)
+
+
 class Row:
+    # __slots__: no per-row __dict__ (reports can have hundreds of thousands of rows)
+    __slots__ = ("timestamp", "tx_type", "received_amount", "received_currency", "sent_amount", "sent_currency",
+                 "fee", "fee_currency", "exchange", "wallet_address", "txid", "url", "z_index", "comment")
 
     def __init__(self, timestamp, tx_type, received_amount, received_currency, sent_amount, sent_currency, fee,
                  fee_currency, exchange, wallet_address, txid, url="", z_index=0, comment=""):
         self.timestamp = timestamp
         self.tx_type = tx_type
+        # Formatted once here rather than at export: each export format reads these fields again, and formatted
+        # values are the input objects themselves (except zero/tiny amounts), so this costs no extra memory.
         self.received_amount = self._format_amount(received_amount)
         self.received_currency = self._format_currency(received_currency, exchange, timestamp)
         self.sent_amount = self._format_amount(sent_amount)
@@ -35,7 +46,18 @@ class Row:
         self.z_index = z_index  # Determines ordering for rows with same txid
         self.comment = comment
 
+    def copy(self, **kwargs):
+        """ Returns copy of row, with attributes in kwargs replaced (values are not formatted again) """
+        row = Row.__new__(Row)
+        for attr in Row.__slots__:
+            setattr(row, attr, kwargs[attr] if attr in kwargs else getattr(self, attr))
+        return row
+
     def _format_currency(self, currency, exchange, timestamp):
+        if currency.__class__ is str:
+            # Same currency string is repeated across many rows
+            currency = sys.intern(currency)
+
         if currency == "BLUNA":
             return "bLUNA"
         if exchange == EXCHANGE_TERRA_CLASSIC_BLOCKCHAIN:
@@ -70,7 +92,7 @@ class Row:
         }
 
         # Use new currency names for Terra classic after new Terra blockchain launched 5/28/22.
-        timestamp_dt = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+        timestamp_dt = _parse_timestamp(timestamp)
         cutoff_date = datetime(2022, 5, 28)
 
         if timestamp_dt > cutoff_date and currency in remap:
@@ -82,10 +104,12 @@ class Row:
         """ Avoid scientific notation """
         if amount is None or amount == "":
             return ""
-        elif float(amount) == 0:
+
+        value = float(amount)
+        if value == 0:
             return 0
-        elif float(amount) < .001:
-            return "{:.9f}".format(float(amount))
+        elif value < .001:
+            return "{:.9f}".format(value)
         else:
             return amount
 
@@ -139,6 +163,9 @@ class Exporter:
         else:
             self.lp_treatment = et.LP_TREATMENT_DEFAULT
 
+        # Rows prepared by _rows_export(), shared by all formats during export_formats()
+        self._rows_export_cache = None
+
     def ingest_row(self, row):
         self.rows.append(row)
 
@@ -173,16 +200,28 @@ class Exporter:
             self.is_reverse = reverse
 
     def _rows_export(self, csv_format, reverse=True, export_all=False):
+        native_lp = csv_format in [et.FORMAT_COINTRACKING, et.FORMAT_COINPANDA, et.FORMAT_COINTELLI,
+                                   et.FORMAT_DIVLY, et.FORMAT_CRYPTOBOOKS, et.FORMAT_KOINLY]
+        key = (reverse, export_all, native_lp, self.lp_treatment)
+        if self._rows_export_cache is not None and key in self._rows_export_cache:
+            return self._rows_export_cache[key]
+
+        rows = self._rows_export_uncached(native_lp, reverse, export_all)
+
+        if self._rows_export_cache is not None:
+            self._rows_export_cache[key] = rows
+        return rows
+
+    def _rows_export_uncached(self, native_lp, reverse, export_all):
         self.sort_rows(reverse)
 
         if export_all:
             # custom behavior: exports rows with tx_type=_* (.i.e _UNKNOWN)
-            rows = self.rows
+            rows = list(self.rows)
         else:
-            rows = filter(lambda row: row.tx_type in et.TX_TYPES_CSVEXPORT, self.rows)
+            rows = [row for row in self.rows if row.tx_type in et.TX_TYPES_CSVEXPORT]
 
-        if csv_format in [et.FORMAT_COINTRACKING, et.FORMAT_COINPANDA, et.FORMAT_COINTELLI,
-                          et.FORMAT_DIVLY, et.FORMAT_CRYPTOBOOKS, et.FORMAT_KOINLY]:
+        if native_lp:
             return rows
 
         # For non-koinly CSVs, convert LP_DEPOSIT/LP_WITHDRAW into transfers/omit/trades
@@ -213,58 +252,13 @@ class Exporter:
         return out
 
     def _row_as_transfer_out(self, row):
-        return Row(
-            timestamp=row.timestamp,
-            tx_type=et.TX_TYPE_TRANSFER,
-            received_amount="",
-            received_currency="",
-            sent_amount=row.sent_amount,
-            sent_currency=row.sent_currency,
-            fee=row.fee,
-            fee_currency=row.fee_currency,
-            exchange=row.exchange,
-            wallet_address=row.wallet_address,
-            txid=row.txid,
-            url=row.url,
-            z_index=row.z_index,
-            comment=row.comment,
-        )
+        return row.copy(tx_type=et.TX_TYPE_TRANSFER, received_amount="", received_currency="")
 
     def _row_as_transfer_in(self, row):
-        return Row(
-            timestamp=row.timestamp,
-            tx_type=et.TX_TYPE_TRANSFER,
-            received_amount=row.received_amount,
-            received_currency=row.received_currency,
-            sent_amount="",
-            sent_currency="",
-            fee=row.fee,
-            fee_currency=row.fee_currency,
-            exchange=row.exchange,
-            wallet_address=row.wallet_address,
-            txid=row.txid,
-            url=row.url,
-            z_index=row.z_index,
-            comment=row.comment,
-        )
+        return row.copy(tx_type=et.TX_TYPE_TRANSFER, sent_amount="", sent_currency="")
 
     def _row_as_trade(self, row):
-        return Row(
-            timestamp=row.timestamp,
-            tx_type=et.TX_TYPE_TRADE,
-            received_amount=row.received_amount,
-            received_currency=row.received_currency,
-            sent_amount=row.sent_amount,
-            sent_currency=row.sent_currency,
-            fee=row.fee,
-            fee_currency=row.fee_currency,
-            exchange=row.exchange,
-            wallet_address=row.wallet_address,
-            txid=row.txid,
-            url=row.url,
-            z_index=row.z_index,
-            comment=row.comment,
-        )
+        return row.copy(tx_type=et.TX_TYPE_TRADE)
 
     def export_print(self):
         """ Prints transactions """
@@ -281,11 +275,40 @@ class Exporter:
         table.extend([row.as_array_short() for row in self.rows])
         return tabulate(table)
 
+    def export_formats(self, formats_paths, max_workers=1):
+        """ Writes files for multiple formats in one pass.
+
+        Sorting, filtering, and LP row conversion are done once and shared by all formats.  If max_workers > 1,
+        formats are split among that many worker processes.
+
+        :param formats_paths: dict of csvformat -> csvpath
+        :return: dict of csvformat -> written path (as returned by export_format())
+        """
+        items = list(formats_paths.items())
+
+        if max_workers > 1 and len(items) > 1:
+            # round robin, so that the slowest formats are spread across processes
+            groups = [dict(items[i::max_workers]) for i in range(min(max_workers, len(items)))]
+            with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+                futures = [executor.submit(_export_formats_worker, self, group) for group in groups]
+                written = {}
+                for future in futures:
+                    written.update(future.result())
+            return {csvformat: written[csvformat] for csvformat, _ in items}
+
+        self._rows_export_cache = {}
+        try:
+            return {csvformat: self.export_format(csvformat, csvpath) for csvformat, csvpath in items}
+        finally:
+            self._rows_export_cache = None
+
     def export_format(self, csvformat, csvpath):
         if csvformat == et.FORMAT_DEFAULT:
             self.export_default_csv(csvpath)
         elif csvformat == et.FORMAT_BALANCES_CALCULATED:
             self.export_balances_csv(csvpath)
+        elif csvformat == et.FORMAT_BALANCES_CALCULATED_SPARSE:
+            self.export_balances_csv(csvpath, sparse=True)
         elif csvformat == et.FORMAT_ACCOINTING:
             self.export_accointing_csv(csvpath)
             xlsxpath = csvpath.replace(".csv", ".xlsx")
@@ -384,31 +407,21 @@ class Exporter:
                     lp_token = row.received_currency
 
                     # Provide Liquidity line
-                    row1 = copy.deepcopy(row)
-                    row1.received_amount = ""
-                    row1.received_currency = ""
-                    row1.fee = ""
+                    row1 = row.copy(received_amount="", received_currency="", fee="")
                     self._cointracking_write_line(mywriter, "Provide Liquidity", row1, lp_token)
 
                     # Receive LP Token line (+ fee for transaction)
-                    row2 = copy.deepcopy(row)
-                    row2.sent_amount = ""
-                    row2.sent_currency = ""
+                    row2 = row.copy(sent_amount="", sent_currency="")
                     self._cointracking_write_line(mywriter, "Receive LP Token", row2, lp_token)
                 elif row.tx_type == et.TX_TYPE_LP_WITHDRAW:
                     lp_token = row.sent_currency
 
                     # Remove Liquidity line
-                    row1 = copy.deepcopy(row)
-                    row1.sent_amount = ""
-                    row1.sent_currency = ""
-                    row1.fee = ""
+                    row1 = row.copy(sent_amount="", sent_currency="", fee="")
                     self._cointracking_write_line(mywriter, "Remove Liquidity", row1, lp_token)
 
                     # Return LP Token line (+ fee for transaction)
-                    row2 = copy.deepcopy(row)
-                    row2.received_amount = ""
-                    row2.received_currency = ""
+                    row2 = row.copy(received_amount="", received_currency="")
                     self._cointracking_write_line(mywriter, "Return LP Token", row2, lp_token)
                 else:
                     # default "normal" case
@@ -661,7 +674,7 @@ class Exporter:
 
     def _coinledger_timestamp(self, ts):
         # Convert "2021-08-04 15:25:43" to "08/14/2021 15:25:43"
-        dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(ts)
         return dt.strftime("%m/%d/%Y %H:%M:%S")
 
     def _coinledger_code(self, currency):
@@ -739,7 +752,7 @@ class Exporter:
 
     def _cryptocom_timestamp(self, ts):
         # Convert "2021-08-04 15:25:43" to "08/14/2021 15:25:43"
-        dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(ts)
         return dt.strftime("%m/%d/%Y %H:%M:%S")
 
     def export_divly_csv(self, csvpath):
@@ -870,8 +883,7 @@ class Exporter:
                 notes = f"{row.comment}"
 
                 # Fix no-value fees
-                if not row.fee_currency:
-                    row.fee = ""
+                fee = row.fee if row.fee_currency else ""
 
                 line = [
                     transaction_type,
@@ -882,7 +894,7 @@ class Exporter:
                     to_currency,
                     to_amount,
                     row.fee_currency,
-                    row.fee,
+                    fee,
                     notes,
                     row.txid
                 ]
@@ -961,65 +973,9 @@ class Exporter:
         self.koinly_nullmap.flush()
 
     def koinly_currency(self, currency):
-        # Reference: https://app.koinly.io/p/markets?search=STARS
-
-        # Remap per CSV
-        remap = {
-            TICKER_LUNA1: {
-                "APOLLO": "ID:28478",
-                "AUST": "ID:81473",
-                "ASTRO": "ID:48993",
-                "BETH": "ID:30493",
-                "LOOP": "ID:10933",
-                "LUNI": "ID:26855",
-                "MARS": "ID:41838",
-                "MINE": "ID:21256",
-                "MKO": "ID:42777",
-                "PSI": "ID:106376",
-                "PYLONDP": "ID:3649656",
-            },
-            TICKER_ALGO: {
-                "AKITA": "ID:132343",
-                "AKTA": "ID:182292",
-                "BANK": "ID:7452250",
-                "COW": "ID:400876",
-                "DEGEN": "ID:124845",
-                "DEFLY": "ID:171818",
-                "ESK": "ID:9839864",
-                "FAME": "ID:197314",
-                "FMA": "ID:417313",
-                "GALGO": "ID:5217593",
-                "GHOST": "ID:4399523",
-                "HUNT": "ID:10251351",
-                "LOUD": "ID:404289",
-                "OCTO": "ID:174045",
-                "REV": "ID:7179131",
-                "SNOOP": "ID:185103",
-                "SOCKS": "ID:186027",
-                "WASP": "ID:274467",
-                "XET": "ID:80828",
-                "ZONE": "ID:547025",
-            },
-            TICKER_LUNA2: {
-                "LUNA": "ID:6089",
-            }
-        }
-
-        # Global remap across all CSVs (especially suited for IBC currencies that appear in many CSVs)
-        remap_global = {
-            "ARCH": "ID:10759253",
-            "STARS": "ID:36899",
-            "ROAR": "ID:16962317",
-            "CNTO": "ID:19886237",
-        }
-
         if self._is_koinly_lp(currency):
             return self.koinly_nullmap.get_null_symbol(currency)
-        if currency and currency.upper() in remap.get(self.ticker, {}):
-            return remap[self.ticker][currency.upper()]
-        if currency and currency.upper() in remap_global:
-            return remap_global[currency.upper()]
-        return currency
+        return currency_map(et.FORMAT_KOINLY, self.ticker).get(currency)
 
     def _is_koinly_lp(self, currency):
         """ Returns True if lp currency should be replaced with NULL* in koinly CSV (i.e. GAMM-22, LP_MIR_UST) """
@@ -1130,7 +1086,7 @@ class Exporter:
 
     def _calculator_timestamp(self, ts):
         # Convert "2021-08-04 15:25:43" to "08/14/2021 15:25:43"
-        dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(ts)
 
         return dt.strftime("%d/%m/%Y %H:%M:%S")
 
@@ -1199,8 +1155,17 @@ class Exporter:
         logging.info("Wrote to %s", csvpath)
 
     def convert_csv_to_xlsx(self, csvpath, xlsxpath):
+        # pandas used for numeric column detection; openpyxl write-only mode is much faster than df.to_excel()
+        import openpyxl
+        import pandas as pd
         read_file = pd.read_csv(csvpath)
-        read_file.to_excel(xlsxpath, index=None, header=True)
+
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(list(read_file.columns))
+        for values in read_file.itertuples(index=False):
+            sheet.append([None if pd.isna(value) else value for value in values])
+        workbook.save(xlsxpath)
         logging.info("Wrote to %s", xlsxpath)
 
     def export_awakentax_csv(self, csvpath):
@@ -1683,7 +1648,7 @@ class Exporter:
 
     def _blockpit_timestamp(self, ts):
         # Convert "2021-08-04 15:25:43" to "14.08.2021 15:25:43"
-        dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(ts)
 
         return dt.strftime("%d.%m.%Y %H:%M:%S")
 
@@ -1751,19 +1716,19 @@ class Exporter:
 
     def _accointing_timestamp(self, ts):
         # Convert "2021-08-04 15:25:43" to "08/14/2021 15:25:43"
-        dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(ts)
 
         return dt.strftime("%m/%d/%Y %H:%M:%S")
 
     def _tokentax_timestamp(self, ts):
         # Convert "2021-08-04 15:25:43" to "08/14/2021 15:25:43"
-        dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(ts)
 
         return dt.strftime("%m/%d/%Y %H:%M:%S")
 
     def _cointelli_timestamp(self, ts):
         # Convert "2021-08-04 15:25:43" to "08/14/2021 15:25:43"
-        dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(ts)
 
         return dt.strftime("%m/%d/%Y %H:%M:%S")
 
@@ -1773,7 +1738,7 @@ class Exporter:
         return "{}T{}Z".format(d, t)
 
     def _utc_to_local(self, date_string, timezone_string):
-        dt = datetime.strptime(date_string, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(date_string)
         utc_dt = pytz.utc.localize(dt)
         local_tz = timezone(timezone_string)
         local_dt = local_tz.normalize(utc_dt.astimezone(local_tz))
@@ -1781,105 +1746,28 @@ class Exporter:
         return local_dt.strftime("%Y-%m-%d %H:%M:%S")
 
     def _cointracking_code(self, currency):
-        # Reference: https://cointracking.info/coin_charts.php
-        remap = {
-            "ANC": "ANC2",
-            "ASTRO": "ASTRO5",
-            "ATOM": "ATOM2",
-            "GLOW": "GLOW3",
-            "BETH": "BETH3",
-            "INJ": "INJ2",
-            "LOOP": "LOOP2",
-            "LUNI": "LUNI2",
-            "MARS": "MARS6",
-            "MINE": "MINE2",
-            "MIR": "MIR2",
-            "NTRN": "NTRN2",
-            "ORION": "ORION2",
-            "PLY": "PLY3",
-            "PRISM": "PRISM3",
-            "PSI": "PSI2",
-            "SD": "SD2",
-            "SOL": "SOL2",
-            "STARS": "STARS3",
-            "TIA": "TIA3",
-            "TNS": "TNS2",
-            "TWD": "TWD2",
-            "WEN": "WEN3",
-            "WHALE": "WHALE3",
-            "WTUST": "UST3",
-        }
-        if self.ticker == TICKER_LUNA1:
-            remap["LUNA"] = "LUNA2"  # Terra Classic
-        else:
-            remap["LUNA"] = "LUNA3"  # Terra v2
-
-        if currency and currency.upper() in remap:
-            return remap[currency.upper()]
-        return currency
+        return currency_map(et.FORMAT_COINTRACKING, self.ticker).get(currency)
 
     def _cointracker_code(self, currency):
         return currency
 
     def _cointracker_timestamp(self, ts):
         # Convert "2021-08-04 15:25:43" to "08/14/2021 15:25:43"
-        dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
+        dt = _parse_timestamp(ts)
 
         return dt.strftime("%m/%d/%Y %H:%M:%S")
 
-    def export_balances_csv(self, csvpath, truncate=None):
-        """ Writes CSV, which shows balance history of wallet based on CSV. """
-        self.sort_rows(reverse=False)
-
-        # Find all currencies
-        currencies = set()
-        for row in self.rows:
-            if row.received_currency:
-                currencies.add(row.received_currency)
-            if row.sent_currency:
-                currencies.add(row.sent_currency)
-            if row.fee_currency:
-                currencies.add(row.fee_currency)
-
-        # Initialize balance of each currency to zero at beginning
-        balances = {}
-        for currency in currencies:
-            balances[currency] = 0
-
-        # Create table array that represents new csv
-        currencies_list = sorted(list(currencies))
-        table = []
-
-        # For each original row, create a corresponding row with all currency balances.
-        for row in self.rows:
-            if row.received_currency and row.received_amount:
-                balances[row.received_currency] += float(row.received_amount)
-            if row.sent_currency and row.sent_amount:
-                balances[row.sent_currency] -= float(row.sent_amount)
-            if row.fee_currency and row.fee:
-                balances[row.fee_currency] -= float(row.fee)
-
-            balance_row = [row.timestamp, row.txid]
-            for currency in currencies_list:
-                balance_row.append(balances[currency])
-
-            table.append(balance_row)
+    def export_balances_csv(self, csvpath, truncate=None, sparse=False):
+        """ Writes CSV, which shows balance history of wallet based on CSV.
 
-        table.reverse()
-
-        if truncate:
-            table = table[:truncate]
-
-        # Add header row to beginning of array
-        header_row = ["timestamp", "txid"]
-        header_row.extend(currencies_list)
-        table.insert(0, header_row)
+        If sparse, only writes (timestamp, txid, currency, balance) for currencies changed by each row.
+        """
+        # numpy import deferred (only needed for this format)
+        from staketaxcsv.common.exporter_balances import write_balances_csv
 
-        # Write table array to csv
-        with open(csvpath, 'w', newline='', encoding='utf-8') as f:
-            mywriter = csv.writer(f)
-            mywriter.writerows(table)
-            logging.info("Wrote to %s", csvpath)
+        self.sort_rows(reverse=False)
+        write_balances_csv(self.rows, csvpath, truncate, sparse)
+        logging.info("Wrote to %s", csvpath)
 
     def convert_alloyed_symbols(self):
         """
@@ -1908,6 +1796,7 @@ class Exporter:
             et.TX_TYPE_UNKNOWN: "UNKNOWN",
         }
         rows = self._rows_export(et.FORMAT_CRYPTACT, export_all=True)
+        cryptact_unsupported_coins = set(CRYPTACT_UNSUPPORTED_COINS.split(","))
 
         with open(csvpath, 'w', newline='', encoding='utf-8') as f:
             mywriter = csv.writer(f)
@@ -1963,7 +1852,6 @@ class Exporter:
                     counter_volume = row.received_amount
                 
                 # クリプタクト未対応コインの場合はカスタムコインを作成
-                cryptact_unsupported_coins = str.split(CRYPTACT_UNSUPPORTED_COINS ,",") 
                 if base in cryptact_unsupported_coins:
                     base = self._generate_cryptact_custom_coin(base)
                 if counter in cryptact_unsupported_coins:
@@ -2044,3 +1932,7 @@ class Exporter:
 
     def _is_cryptact_custom_coin(self, token_name):
         return token_name.startswith("USER-")
+
+
+def _export_formats_worker(exporter, formats_paths):
+    return exporter.export_formats(formats_paths)
@@ -1,6 +1,7 @@
 # CSV formats
 FORMAT_DEFAULT = "default"
 FORMAT_BALANCES_CALCULATED = "balances_calculated"  # based on CSV
+FORMAT_BALANCES_CALCULATED_SPARSE = "balances_calculated_sparse"  # same, only currencies changed by each row
 FORMAT_ACCOINTING = "accointing"
 FORMAT_AWAKENTAX = "awakentax"
 FORMAT_BITCOINTAX = "bitcointax"
@@ -50,6 +51,10 @@ FORMATS = [
     FORMAT_ZENLEDGER,
     FORMAT_BALANCES_CALCULATED,
 ]
+# Only written when requested explicitly (i.e. --format balances_calculated_sparse); not part of FORMATS ("all")
+FORMATS_OPTIONAL = [
+    FORMAT_BALANCES_CALCULATED_SPARSE,
+]
 
 # Other
 LP_TREATMENT_TRANSFERS = "transfers"
@@ -0,0 +1,173 @@
+"""
+Storage backends for common.Cache (selected by STAKETAX_DB_CACHE_BACKEND).
+
+Each backend stores one value per field (i.e. FIELD_IBC_ADDRESSES).  Values are dicts (merged per key by upsert())
+or other json values (i.e. koinly null map list, replaced by put()).
+
+  * dynamodb: dynamodb table (default; original behavior)
+  * sqlite: local sqlite file STAKETAX_DB_CACHE_PATH (default <REPORTS_DIR>/cache.db)
+  * memory: in-process only (i.e. for tests or one-off runs)
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+BACKEND_DYNAMODB = "dynamodb"
+BACKEND_SQLITE = "sqlite"
+BACKEND_MEMORY = "memory"
+UPDATE_KEYS_PER_REQUEST = 50  # keys per dynamodb update_item call (limited by expression size)
+
+
+def make_backend(name, path=None, table_name=None):
+    if name == BACKEND_DYNAMODB:
+        return DynamoCacheBackend(table_name)
+    elif name == BACKEND_SQLITE:
+        return SqliteCacheBackend(path)
+    elif name == BACKEND_MEMORY:
+        return MemoryCacheBackend()
+    else:
+        raise Exception(f"Unknown cache backend {name}.  Must be one of {BACKEND_DYNAMODB}|{BACKEND_SQLITE}|"
+                        f"{BACKEND_MEMORY}")
+
+
+class MemoryCacheBackend:
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, field_name):
+        return self.data.get(field_name)
+
+    def put(self, field_name, data):
+        self.data[field_name] = data
+
+    def upsert(self, field_name, data):
+        self.data.setdefault(field_name, {}).update(data)
+
+
+class SqliteCacheBackend:
+
+    def __init__(self, path):
+        self.path = path
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_maps ("
+            "  field TEXT, key TEXT, value TEXT, PRIMARY KEY (field, key)) WITHOUT ROWID")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS cache_values (field TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+    def get(self, field_name):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM cache_values WHERE field = ?", (field_name,)).fetchone()
+            if row:
+                return json.loads(row[0])
+
+            rows = self.conn.execute("SELECT key, value FROM cache_maps WHERE field = ?", (field_name,)).fetchall()
+            if not rows:
+                return None
+            return {k: json.loads(v) for k, v in rows}
+
+    def put(self, field_name, data):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM cache_maps WHERE field = ?", (field_name,))
+            self.conn.execute("DELETE FROM cache_values WHERE field = ?", (field_name,))
+            if isinstance(data, dict):
+                self._insert_map(field_name, data)
+            else:
+                self.conn.execute(
+                    "INSERT INTO cache_values (field, value) VALUES (?, ?)", (field_name, json.dumps(data)))
+
+    def upsert(self, field_name, data):
+        with self.lock, self.conn:
+            self._insert_map(field_name, data)
+
+    def _insert_map(self, field_name, data):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO cache_maps (field, key, value) VALUES (?, ?, ?)",
+            ((field_name, k, json.dumps(v)) for k, v in data.items()))
+
+
+class DynamoCacheBackend:
+
+    def __init__(self, table_name):
+        import boto3
+
+        self.table = boto3.resource('dynamodb', region_name='us-east-1').Table(table_name)
+
+    def get(self, field_name):
+        response = self.table.get_item(
+            Key={'field': field_name}
+        )
+
+        if "Item" not in response:
+            return None
+        return response['Item']['data']
+
+    def put(self, field_name, data):
+        response = self.table.put_item(
+            Item={
+                'field': field_name,
+                'data': data
+            }
+        )
+        logging.info("Updated %s ", field_name, extra={"response": response})
+
+    def upsert(self, field_name, data):
+        """ Sets only the given keys of the stored map (instead of rewriting whole map) """
+        from botocore.exceptions import ClientError
+
+        items = list(data.items())
+        for i in range(0, len(items), UPDATE_KEYS_PER_REQUEST):
+            chunk = items[i:i + UPDATE_KEYS_PER_REQUEST]
+            names = {"#d": "data"}
+            values = {}
+            for j, (k, v) in enumerate(chunk):
+                names[f"#k{j}"] = k
+                values[f":v{j}"] = v
+
+            try:
+                self.table.update_item(
+                    Key={'field': field_name},
+                    UpdateExpression="SET " + ", ".join(f"#d.#k{j} = :v{j}" for j in range(len(chunk))),
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=values,
+                )
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ValidationException":
+                    raise
+                # Item may not exist yet: create it with all remaining keys, but only if it is
+                # really missing (ValidationException is also raised for e.g. oversized items).
+                if not self._create(field_name, dict(items[i:])):
+                    raise
+                return
+
+        logging.info("Updated %s keys of %s", len(items), field_name)
+
+    def _create(self, field_name, data):
+        """ Writes new item; returns False if item already exists """
+        from botocore.exceptions import ClientError
+
+        try:
+            self.table.put_item(
+                Item={
+                    'field': field_name,
+                    'data': data
+                },
+                ConditionExpression="attribute_not_exists(#f)",
+                ExpressionAttributeNames={"#f": "field"},
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise
+        logging.info("Created %s", field_name)
+        return True
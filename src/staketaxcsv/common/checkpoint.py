@@ -0,0 +1,95 @@
+"""
+Checkpoint for incremental re-runs of txhistory() (options["incremental"] / --incremental).
+
+Stores, per (ticker, wallet_address), the newest tx height/txhash seen and the csv rows produced so far.
+A re-run then only fetches/processes transactions newer than the checkpoint and merges them into the
+stored rows.
+
+usage (in txhistory()):
+    checkpoint = Checkpoint(localconfig, TICKER_ATOM, wallet_address)
+    checkpoint.restore(exporter)
+    elems = txdata.get_txs_all(wallet_address, progress, start_date, end_date, min_height=checkpoint.height)
+    ... process elems into exporter ...
+    checkpoint.save(exporter, elems)
+"""
+
+import json
+import logging
+import os
+
+from staketaxcsv import settings_csv
+from staketaxcsv.common.Exporter import Row
+
+ROW_ATTRS = [
+    "timestamp", "tx_type", "received_amount", "received_currency", "sent_amount", "sent_currency",
+    "fee", "fee_currency", "exchange", "wallet_address", "txid", "url", "z_index", "comment",
+]
+
+
+class Checkpoint:
+
+    def __init__(self, localconfig, ticker, wallet_address):
+        self.ticker = ticker
+        self.wallet_address = wallet_address
+        self.height = None
+        self.txhash = None
+        self.rows = []
+
+        # Only applies to full history reports (stored rows would not match a date-filtered report)
+        self.enabled = (getattr(localconfig, "incremental", False)
+                        and not getattr(localconfig, "start_date", None)
+                        and not getattr(localconfig, "end_date", None))
+        if getattr(localconfig, "incremental", False) and not self.enabled:
+            logging.warning("Ignoring incremental option, since start_date/end_date specified.")
+
+        if self.enabled:
+            self._load()
+
+    def _path(self):
+        dirpath = settings_csv.CHECKPOINT_DIR or os.path.join(settings_csv.REPORTS_DIR, "checkpoints")
+        return os.path.join(dirpath, f"{self.ticker}.{self.wallet_address}.json")
+
+    def _load(self):
+        path = self._path()
+        if not os.path.exists(path):
+            logging.info("No checkpoint found for %s %s.  Fetching full history.", self.ticker, self.wallet_address)
+            return
+
+        with open(path, "r") as f:
+            data = json.load(f)
+        self.height = data["height"]
+        self.txhash = data["txhash"]
+        self.rows = data["rows"]
+        logging.info("Loaded checkpoint %s: height=%s, txhash=%s, %s rows", path, self.height, self.txhash,
+                     len(self.rows))
+
+    def restore(self, exporter):
+        """ Adds rows stored in checkpoint to exporter """
+        for row in self.rows:
+            exporter.ingest_row(Row(**dict(zip(ROW_ATTRS, row))))
+
+    def save(self, exporter, elems):
+        """ Stores all exporter rows, along with newest tx in elems (txs with "height" and "txhash" fields) """
+        if not self.enabled:
+            return
+
+        for elem in elems:
+            height = int(elem["height"])
+            if self.height is None or height > self.height:
+                self.height = height
+                self.txhash = elem["txhash"]
+        if self.height is None:
+            return
+
+        data = {
+            "height": self.height,
+            "txhash": self.txhash,
+            "rows": [[getattr(row, attr) for attr in ROW_ATTRS] for row in exporter.rows],
+        }
+
+        path = self._path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+        logging.info("Wrote checkpoint %s: height=%s, %s rows", path, self.height, len(exporter.rows))
@@ -0,0 +1,46 @@
+from collections import deque
+from concurrent.futures import as_completed, ThreadPoolExecutor
+
+
+def run_concurrent(func, list_args, max_workers):
+    """
+    Runs func(*args) for each args in list_args using a pool of threads.
+
+    Yields (index into list_args, result) in completion order.  Exceptions from func are re-raised.
+    """
+    if not list_args:
+        return
+
+    if max_workers <= 1:
+        for i, args in enumerate(list_args):
+            yield i, func(*args)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(list_args))) as executor:
+        futures = {executor.submit(func, *args): i for i, args in enumerate(list_args)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def run_pipelined(func, list_args, max_workers, max_pending=None):
+    """
+    Runs func(*args) for each args in list_args using a pool of threads.
+
+    Yields results in list_args order, so the caller can process each result while later ones are fetched.
+    At most max_pending calls (default 2 * max_workers) are submitted ahead of the caller.
+    """
+    if max_workers <= 1:
+        for args in list_args:
+            yield func(*args)
+        return
+
+    max_pending = max_pending if max_pending else 2 * max_workers
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for args in list_args:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(executor.submit(func, *args))
+
+        while pending:
+            yield pending.popleft().result()
@@ -7,3 +7,4 @@ class config:
     debug = False
     limit = 20000  # max txs
     koinlynullmap = None
+    incremental = False  # only fetch/process txs newer than previous run's checkpoint
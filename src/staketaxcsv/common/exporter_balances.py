@@ -0,0 +1,133 @@
+"""
+Balance history CSVs (balances_calculated, balances_calculated_sparse), computed from exporter rows.
+
+Balances are cumulative sums of per-currency deltas.  Only the (sparse) deltas are held in memory; dense balance
+rows are built one chunk at a time and written newest first.
+"""
+
+import csv
+
+import numpy as np
+
+CHUNK_ROWS = 2048  # rows per dense block written to csv
+
+
+def write_balances_csv(rows, csvpath, truncate=None, sparse=False):
+    """
+    rows: exporter rows, sorted oldest first.
+    Writes balance of every currency after each row (newest first).  If sparse, writes one line (timestamp, txid,
+    currency, balance) for each currency changed by each row instead.
+    """
+    currencies, keys, balances = _balances(rows)
+    num_rows = len(rows)
+    stop = max(num_rows - truncate, 0) if truncate else 0  # oldest row written
+
+    with open(csvpath, 'w', newline='', encoding='utf-8') as f:
+        mywriter = csv.writer(f)
+        if sparse:
+            mywriter.writerow(["timestamp", "txid", "currency", "balance"])
+            _write_sparse(mywriter, rows, currencies, keys, balances, stop)
+        else:
+            mywriter.writerow(["timestamp", "txid"] + currencies)
+            _write_dense(mywriter, rows, len(currencies), keys, balances, stop)
+
+
+def _balances(rows):
+    """
+    Returns (sorted currencies, keys, balances), where balances[i] is balance of currency keys[i] // len(rows)
+    after row keys[i] % len(rows), for each (currency, row) changing the balance.  keys are sorted.
+    """
+    currencies = set()
+    for row in rows:
+        if row.received_currency:
+            currencies.add(row.received_currency)
+        if row.sent_currency:
+            currencies.add(row.sent_currency)
+        if row.fee_currency:
+            currencies.add(row.fee_currency)
+    currencies = sorted(currencies)
+    index = {currency: i for i, currency in enumerate(currencies)}
+
+    # Deltas, in same order balances were updated (received, sent, fee of each row)
+    num_rows = len(rows)
+    keys = []
+    deltas = []
+    for i, row in enumerate(rows):
+        if row.received_currency and row.received_amount:
+            keys.append(index[row.received_currency] * num_rows + i)
+            deltas.append(float(row.received_amount))
+        if row.sent_currency and row.sent_amount:
+            keys.append(index[row.sent_currency] * num_rows + i)
+            deltas.append(-float(row.sent_amount))
+        if row.fee_currency and row.fee:
+            keys.append(index[row.fee_currency] * num_rows + i)
+            deltas.append(-float(row.fee))
+
+    keys = np.array(keys, dtype=np.int64)
+    deltas = np.array(deltas, dtype=np.float64)
+    order = np.argsort(keys, kind="stable")
+    keys, deltas = keys[order], deltas[order]
+
+    # Running total of each currency (cumsum is sequential, so same values as adding deltas one at a time)
+    balances = np.empty_like(deltas)
+    bounds = np.searchsorted(keys, np.arange(len(currencies) + 1, dtype=np.int64) * num_rows)
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        np.cumsum(deltas[start:end], out=balances[start:end])
+
+    # Keep balance after last delta of each (currency, row)
+    is_last = np.append(keys[1:] != keys[:-1], True) if len(keys) else np.zeros(0, dtype=bool)
+    return currencies, keys[is_last], balances[is_last]
+
+
+def _last_changes(keys, num_rows, num_currencies, row_index):
+    """ Returns index into keys of last change of each currency before row_index (-1 if none) """
+    starts = np.arange(num_currencies, dtype=np.int64) * num_rows
+    j = np.searchsorted(keys, starts + row_index, side="left") - 1
+    has_balance = (j >= 0) & (keys[np.maximum(j, 0)] >= starts) if len(keys) else np.zeros(num_currencies, bool)
+    return np.where(has_balance, j, -1)
+
+
+def _write_dense(mywriter, rows, num_currencies, keys, balances, stop):
+    num_rows = len(rows)
+    if not num_rows:
+        return
+
+    # Each balance formatted once (as csv.writer would); index -1 (no balance yet) is written as 0
+    strs = np.array([repr(balance) for balance in balances.tolist()] + ["0"], dtype=object)
+
+    # Changes ordered by row (to select each chunk's changes)
+    positions = np.argsort(keys % num_rows, kind="stable")
+    row_indices = keys[positions] % num_rows
+    currency_indices = keys[positions] // num_rows
+
+    for end in range(num_rows, stop, -CHUNK_ROWS):
+        start = max(end - CHUNK_ROWS, stop)
+        lo, hi = np.searchsorted(row_indices, [start, end])
+
+        # Index of last change of each currency as of each row.  keys are sorted by (currency, row), so this
+        # is the running max of indices of changes in chunk (and of last change before chunk).
+        last_change = np.full((end - start, num_currencies), -1, dtype=np.int64)
+        last_change[row_indices[lo:hi] - start, currency_indices[lo:hi]] = positions[lo:hi]
+        np.maximum(last_change[0], _last_changes(keys, num_rows, num_currencies, start), out=last_change[0])
+        np.maximum.accumulate(last_change, axis=0, out=last_change)
+
+        table = strs[last_change]
+        for i, balance_row in zip(range(end - 1, start - 1, -1), table[::-1].tolist()):
+            row = rows[i]
+            mywriter.writerow([row.timestamp, row.txid] + balance_row)
+
+
+def _write_sparse(mywriter, rows, currencies, keys, balances, stop):
+    num_rows = len(rows)
+    if not num_rows:
+        return
+    row_indices = keys % num_rows
+    currency_indices = keys // num_rows
+
+    # Newest row first; currencies of same row in sorted order
+    order = np.lexsort((currency_indices, -row_indices))
+    order = order[row_indices[order] >= stop]
+    for i, c, balance in zip(row_indices[order].tolist(), currency_indices[order].tolist(),
+                             balances[order].tolist()):
+        row = rows[i]
+        mywriter.writerow([row.timestamp, row.txid, currencies[c], balance])
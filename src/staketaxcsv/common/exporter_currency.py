@@ -0,0 +1,124 @@
+"""
+Currency symbol remapping for export formats (i.e. koinly ids, cointracking codes).
+
+Each format's remap rules are compiled once per (format, ticker) into a single lookup table, and the result for each
+distinct currency string is memoized (an export maps a few hundred currencies, not one per row).
+"""
+
+import functools
+
+from staketaxcsv.common import ExporterTypes as et
+from staketaxcsv.settings_csv import TICKER_ALGO, TICKER_LUNA1, TICKER_LUNA2
+
+# Reference: https://app.koinly.io/p/markets?search=STARS
+# Remap per CSV
+KOINLY_REMAP = {
+    TICKER_LUNA1: {
+        "APOLLO": "ID:28478",
+        "AUST": "ID:81473",
+        "ASTRO": "ID:48993",
+        "BETH": "ID:30493",
+        "LOOP": "ID:10933",
+        "LUNI": "ID:26855",
+        "MARS": "ID:41838",
+        "MINE": "ID:21256",
+        "MKO": "ID:42777",
+        "PSI": "ID:106376",
+        "PYLONDP": "ID:3649656",
+    },
+    TICKER_ALGO: {
+        "AKITA": "ID:132343",
+        "AKTA": "ID:182292",
+        "BANK": "ID:7452250",
+        "COW": "ID:400876",
+        "DEGEN": "ID:124845",
+        "DEFLY": "ID:171818",
+        "ESK": "ID:9839864",
+        "FAME": "ID:197314",
+        "FMA": "ID:417313",
+        "GALGO": "ID:5217593",
+        "GHOST": "ID:4399523",
+        "HUNT": "ID:10251351",
+        "LOUD": "ID:404289",
+        "OCTO": "ID:174045",
+        "REV": "ID:7179131",
+        "SNOOP": "ID:185103",
+        "SOCKS": "ID:186027",
+        "WASP": "ID:274467",
+        "XET": "ID:80828",
+        "ZONE": "ID:547025",
+    },
+    TICKER_LUNA2: {
+        "LUNA": "ID:6089",
+    }
+}
+
+# Global remap across all CSVs (especially suited for IBC currencies that appear in many CSVs)
+KOINLY_REMAP_GLOBAL = {
+    "ARCH": "ID:10759253",
+    "STARS": "ID:36899",
+    "ROAR": "ID:16962317",
+    "CNTO": "ID:19886237",
+}
+
+# Reference: https://cointracking.info/coin_charts.php
+COINTRACKING_REMAP = {
+    "ANC": "ANC2",
+    "ASTRO": "ASTRO5",
+    "ATOM": "ATOM2",
+    "GLOW": "GLOW3",
+    "BETH": "BETH3",
+    "INJ": "INJ2",
+    "LOOP": "LOOP2",
+    "LUNI": "LUNI2",
+    "MARS": "MARS6",
+    "MINE": "MINE2",
+    "MIR": "MIR2",
+    "NTRN": "NTRN2",
+    "ORION": "ORION2",
+    "PLY": "PLY3",
+    "PRISM": "PRISM3",
+    "PSI": "PSI2",
+    "SD": "SD2",
+    "SOL": "SOL2",
+    "STARS": "STARS3",
+    "TIA": "TIA3",
+    "TNS": "TNS2",
+    "TWD": "TWD2",
+    "WEN": "WEN3",
+    "WHALE": "WHALE3",
+    "WTUST": "UST3",
+}
+
+
+class CurrencyMap:
+    """ Maps currency -> exported symbol using table of uppercase currency -> symbol (other currencies unchanged) """
+
+    def __init__(self, table):
+        self.table = table
+        self.mapped = {}
+
+    def get(self, currency):
+        try:
+            return self.mapped[currency]
+        except KeyError:
+            symbol = self.table.get(currency.upper(), currency) if currency else currency
+            self.mapped[currency] = symbol
+            return symbol
+
+
+@functools.lru_cache(maxsize=None)
+def currency_map(csv_format, ticker):
+    """ Returns CurrencyMap for export format (shared by all exports of format for ticker) """
+    if csv_format == et.FORMAT_KOINLY:
+        table = dict(KOINLY_REMAP_GLOBAL)
+        table.update(KOINLY_REMAP.get(ticker, {}))  # per CSV remap takes precedence
+    elif csv_format == et.FORMAT_COINTRACKING:
+        table = dict(COINTRACKING_REMAP)
+        if ticker == TICKER_LUNA1:
+            table["LUNA"] = "LUNA2"  # Terra Classic
+        else:
+            table["LUNA"] = "LUNA3"  # Terra v2
+    else:
+        table = {}
+    return CurrencyMap(table)
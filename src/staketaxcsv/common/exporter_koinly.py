@@ -13,6 +13,8 @@ class NullMap:
 
     def __init__(self, json_path=None):
         self.null_map = []
+        self.indices = {}  # symbol -> index in null_map
+        self.indices_map = None  # null_map that indices was built from
         self.cache = None
         self.use_cache = settings_csv.DB_CACHE
         self.json_path = json_path if json_path else KOINLY_NULL_MAP_JSON
@@ -49,14 +51,25 @@ class NullMap:
                         json.dump(self.null_map, f, indent=4)
 
     def get_null_symbol(self, symbol):
-        if symbol not in self.null_map:
+        if self.indices_map is not self.null_map:
+            # null_map replaced (i.e. by load())
+            self._index()
+        index = self.indices.get(symbol)
+        if index is None:
+            index = len(self.null_map)
             self.null_map.append(symbol)
-
-        index = self.null_map.index(symbol)
+            self.indices[symbol] = index
 
         # Koinly only accepts indices > 0
         return "NULL{}".format(index + 1)
 
+    def _index(self):
+        # symbol -> index of first occurrence in null_map
+        self.indices = {}
+        for index, symbol in enumerate(self.null_map):
+            self.indices.setdefault(symbol, index)
+        self.indices_map = self.null_map
+
     def list_for_display(self):
         self.load()
 
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import math
 import time
@@ -5,13 +6,26 @@ from urllib.parse import urlencode
 
 import requests
 import staketaxcsv.common.ibc.constants as co
-from staketaxcsv.common.debug_util import debug_cache
+from staketaxcsv.common.response_cache import response_cache, TTL_FOREVER
 from staketaxcsv.common.ibc.constants import (
     EVENTS_TYPE_SENDER, EVENTS_TYPE_RECIPIENT, EVENTS_TYPE_SIGNER, EVENTS_TYPE_LIST_DEFAULT)
-from staketaxcsv.common.ibc.util_ibc import remove_duplicates
-from staketaxcsv.settings_csv import REPORTS_DIR
+from staketaxcsv.common.ibc.util_ibc import remove_duplicates, reached_height, filter_newer, filter_older
+from staketaxcsv.settings_csv import LCD_MAX_WORKERS
 from staketaxcsv.common.query import get_with_retries
+from staketaxcsv.common.rate_limiter import RateLimiter
+from staketaxcsv.common.concurrent_util import run_concurrent
 TXS_LIMIT_PER_QUERY = 50
+DENOM_TRACES_LIMIT_PER_QUERY = 1000
+
+
+def _ttl_txs(call_args, data):
+    # Offset pages shift as new txs arrive, so all pages are cached with default (short) ttl.  Errors not cached.
+    return 0 if data.get("code") else None
+
+
+def _ttl_block(call_args, data):
+    # Blocks never change.  Errors (i.e. pruned block) not cached.
+    return TTL_FOREVER if "block" in data else 0
 
 
 class LcdAPI_v1:
@@ -26,6 +40,7 @@ class LcdAPI_v1:
     def _query(self, uri_path, query_params, sleep_seconds=0):
         url = f"{self.node}{uri_path}"
         logging.info("Requesting url %s?%s ...", url, urlencode(query_params))
+        RateLimiter.for_node(self.node).wait()
         data = get_with_retries(self.session, url, query_params, {})
 
         if sleep_seconds:
@@ -56,6 +71,22 @@ class LcdAPI_v1:
         self.version = version
         return version
 
+    @response_cache(ttl=_ttl_block, instance_key=lambda api: api.node)
+    def _block(self, height):
+        uri_path = f"/cosmos/base/tendermint/v1beta1/blocks/{height}"
+        data = self._query(uri_path, {})
+        return data
+
+    def block_time(self, height):
+        """ i.e. "2021-08-26T21:08:44.86954814Z" """
+        data = self._block(height)
+        return data["block"]["header"]["time"]
+
+    def latest_height(self):
+        uri_path = "/cosmos/base/tendermint/v1beta1/blocks/latest"
+        data = self._query(uri_path, {})
+        return int(data["block"]["header"]["height"])
+
     def get_tx(self, txid):
         uri_path = f"/cosmos/tx/v1beta1/txs/{txid}"
         data = self._query(uri_path, {}, sleep_seconds=1)
@@ -76,7 +107,7 @@ class LcdAPI_v1:
     def account(self, wallet_address):
         return self._account(wallet_address)
 
-    @debug_cache(REPORTS_DIR)
+    @response_cache(ttl=_ttl_txs, instance_key=lambda api: api.node)
     def _get_txs(self, wallet_address, events_type, offset, limit, sleep_seconds):
         uri_path = "/cosmos/tx/v1beta1/txs"
         query_params = {
@@ -130,6 +161,38 @@ class LcdAPI_v1:
 
         return denom
 
+    def _denom_traces(self, pagination_key=None):
+        uri_path = "/ibc/apps/transfer/v1/denom_traces"
+        query_params = {
+            "pagination.limit": DENOM_TRACES_LIMIT_PER_QUERY,
+            "pagination.count_total": True,
+        }
+        if pagination_key:
+            query_params["pagination.key"] = pagination_key
+
+        data = self._query(uri_path, query_params)
+        return data
+
+    def denom_traces(self, pagination_key=None):
+        """ Returns ({ibc_address: base_denom}, next_key, total) for one page of all denom traces on chain.
+
+        (total is only reported for first page, i.e. pagination_key=None)
+        """
+        data = self._denom_traces(pagination_key)
+
+        traces = {}
+        for trace in data["denom_traces"]:
+            path, base_denom = trace["path"], trace["base_denom"]
+            if not path:
+                continue
+            # ibc address is hash of full denom trace, i.e. 'transfer/channel-0/uatom' -> 'ibc/27394FB0...'
+            ibc_hash = hashlib.sha256("{}/{}".format(path, base_denom).encode()).hexdigest().upper()
+            traces["ibc/" + ibc_hash] = base_denom
+
+        next_key = data["pagination"].get("next_key")
+        total = int(data["pagination"].get("total") or 0)
+        return traces, next_key, total
+
     def balances(self, wallet_address, height=None):
         uri_path = "/cosmos/bank/v1beta1/balances/{}".format(wallet_address)
         query_params = {}
@@ -150,35 +213,75 @@ class LcdAPI_v1:
 
 
 def get_txs_all(node, address, max_txs, progress=None, limit=TXS_LIMIT_PER_QUERY, sleep_seconds=1,
-                stage_name="default", events_types=None):
+                stage_name="default", events_types=None, max_workers=LCD_MAX_WORKERS, min_height=None,
+                max_height=None):
+    """
+    Fetches all txs for address.  The first page of each events_type gives the total count, after which
+    the remaining pages are fetched concurrently (up to max_workers), throttled by the node's RateLimiter.
+    max_workers=1 keeps the original one-page-at-a-time behavior (with sleep_seconds between pages).
+
+    min_height: if set, only returns txs with height > min_height, paging (newest first) only until it is reached.
+    max_height: if set, only returns txs with height <= max_height (filtered after fetch; events query param of
+                these node versions can't express height ranges).
+    """
     api = LcdAPI_v1(node)
     events_types = events_types if events_types else EVENTS_TYPE_LIST_DEFAULT
     max_pages = math.ceil(max_txs / limit)
+    page_sleep_seconds = sleep_seconds if max_workers <= 1 else 0
 
     out = []
     pages_total = 0
     for events_type in events_types:
-        offset = 0
         if progress:
             progress.report_message(f"Starting fetch for event_type={events_type}")
 
-        for i in range(max_pages):
-            elems, offset, _ = api.get_txs(address, events_type, offset, limit, sleep_seconds)
-            out.extend(elems)
+        elems, offset, total_count_txs = api.get_txs(address, events_type, 0, limit, page_sleep_seconds)
+        out.extend(elems)
+        pages_total += 1
+        if progress:
+            message = f"Fetched page 1 for {events_type} stage ..."
+            progress.report(pages_total, message, stage_name)
 
+        if offset is None or reached_height(elems, min_height):
+            continue
+
+        if not total_count_txs or min_height:
+            # Node did not report a total count (or min_height set): walk remaining pages one at a time
+            for i in range(1, max_pages):
+                elems, offset, _ = api.get_txs(address, events_type, offset, limit, sleep_seconds)
+                out.extend(elems)
+
+                pages_total += 1
+                if progress:
+                    message = f"Fetched page {i+1} for {events_type} stage ..."
+                    progress.report(pages_total, message, stage_name)
+
+                if offset is None or reached_height(elems, min_height):
+                    break
+            continue
+
+        num_pages = min(max_pages, math.ceil(total_count_txs / limit))
+        list_args = [(address, events_type, i * limit, limit, page_sleep_seconds) for i in range(1, num_pages)]
+
+        pages = [None] * len(list_args)
+        for i, (elems, _, _) in run_concurrent(api.get_txs, list_args, max_workers):
+            pages[i] = elems
             pages_total += 1
             if progress:
-                message = f"Fetched page {i+1} for {events_type} stage ..."
+                message = f"Fetched page {i+2} for {events_type} stage ..."
                 progress.report(pages_total, message, stage_name)
+        for elems in pages:
+            out.extend(elems)
 
-            if offset is None:
-                break
-
+    out = filter_newer(out, min_height)
+    out = filter_older(out, max_height)
     out = remove_duplicates(out)
     return out
 
 
-def get_txs_pages_count(node, address, max_txs, limit=TXS_LIMIT_PER_QUERY, events_types=None, sleep_seconds=1):
+def get_txs_pages_count(node, address, max_txs, limit=TXS_LIMIT_PER_QUERY, events_types=None, sleep_seconds=1,
+                        min_height=None, max_height=None):
+    """ min_height/max_height: accepted for same interface as api_lcd_v2 (counts are not limited by height) """
     api = LcdAPI_v1(node)
     events_types = events_types if events_types else EVENTS_TYPE_LIST_DEFAULT
 
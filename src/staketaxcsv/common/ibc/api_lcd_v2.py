@@ -2,13 +2,14 @@ import logging
 import math
 import time
 
-from staketaxcsv.common.ibc.api_lcd_v1 import LcdAPI_v1
-from staketaxcsv.settings_csv import REPORTS_DIR
-from staketaxcsv.common.debug_util import debug_cache
+from staketaxcsv.common.ibc.api_lcd_v1 import LcdAPI_v1, _ttl_txs
+from staketaxcsv.settings_csv import LCD_MAX_WORKERS
+from staketaxcsv.common.response_cache import response_cache
 from staketaxcsv.common.ibc.constants import (
     EVENTS_TYPE_SENDER, EVENTS_TYPE_RECIPIENT, EVENTS_TYPE_SIGNER, EVENTS_TYPE_LIST_DEFAULT)
-from staketaxcsv.common.ibc.util_ibc import remove_duplicates
+from staketaxcsv.common.ibc.util_ibc import remove_duplicates, reached_height, filter_newer, filter_older
 from staketaxcsv.common.query import version_ge
+from staketaxcsv.common.concurrent_util import run_concurrent
 
 TXS_LIMIT_PER_QUERY = 100
 LCD_V2_MIN_VERSION_QUERY_PARAM = "0.50.1"
@@ -17,8 +18,12 @@ LCD_V2_MIN_VERSION_QUERY_PARAM = "0.50.1"
 class LcdAPI_v2(LcdAPI_v1):
     """ >= v0.46.x (cosmos sdk version), around 2023-01 """
 
-    @debug_cache(REPORTS_DIR)
-    def _get_txs(self, wallet_address, events_type, page, limit, sleep_seconds):
+    def supports_height_query(self):
+        """ True if tx search uses query param (which can include tx.height range) """
+        return version_ge(self.cosmos_sdk_version(), LCD_V2_MIN_VERSION_QUERY_PARAM)
+
+    @response_cache(ttl=_ttl_txs, instance_key=lambda api: api.node)
+    def _get_txs(self, wallet_address, events_type, page, limit, sleep_seconds, heights=None):
         uri_path = "/cosmos/tx/v1beta1/txs"
         query_params = {
             "page": page,
@@ -26,7 +31,7 @@ class LcdAPI_v2(LcdAPI_v1):
             "order_by": 2,
         }
 
-        if version_ge(self.cosmos_sdk_version(), LCD_V2_MIN_VERSION_QUERY_PARAM):
+        if self.supports_height_query():
             PARAM_NAME = "query"
         else:
             PARAM_NAME = "events"
@@ -40,12 +45,22 @@ class LcdAPI_v2(LcdAPI_v1):
         else:
             raise Exception("Add case for events_type: {}".format(events_type))
 
+        # heights: (min height, max height) inclusive, either can be None
+        if heights and PARAM_NAME == "query":
+            min_height, max_height = heights
+            if min_height:
+                query_params[PARAM_NAME] += f" AND tx.height>={min_height}"
+            if max_height:
+                query_params[PARAM_NAME] += f" AND tx.height<={max_height}"
+
         data = self._query(uri_path, query_params, sleep_seconds)
 
         return data
 
-    def get_txs(self, wallet_address, events_type, page=1, limit=TXS_LIMIT_PER_QUERY, sleep_seconds=1):
-        data = self._get_txs(wallet_address, events_type, page, limit, sleep_seconds)
+    def get_txs(self, wallet_address, events_type, page=1, limit=TXS_LIMIT_PER_QUERY, sleep_seconds=1,
+                heights=None):
+        """ heights: (min height, max height) inclusive, only applied if supports_height_query() """
+        data = self._get_txs(wallet_address, events_type, page, limit, sleep_seconds, heights)
 
         # No results or error
         if data.get("code") == 3:
@@ -54,7 +69,7 @@ class LcdAPI_v2(LcdAPI_v1):
         if data.get("code") == 8 and "grpc: received message larger than max" in data.get("message", ""):
             logging.warning("Received grpc message too large.  "
                             "Will retry by getting one tx at a time...")
-            return self._get_txs_one_by_one(wallet_address, events_type, page, limit, sleep_seconds)
+            return self._get_txs_one_by_one(wallet_address, events_type, page, limit, sleep_seconds, heights)
 
         # Special case just for STARS, to get around non-deterministic bad results sometimes.
         if wallet_address.startswith("stars") and data.get("code") == 2:
@@ -62,7 +77,7 @@ class LcdAPI_v2(LcdAPI_v1):
                 seconds_sleep = 2**i
                 logging.info("STARS: Sleeping for %s seconds ... Then retrying attempt i=%s ...", seconds_sleep, i)
                 time.sleep(seconds_sleep)
-                data = self._get_txs(wallet_address, events_type, page, limit, sleep_seconds)
+                data = self._get_txs(wallet_address, events_type, page, limit, sleep_seconds, heights)
                 if data.get("code") == 2:
                     pass
                 else:
@@ -74,7 +89,7 @@ class LcdAPI_v2(LcdAPI_v1):
 
         return elems, total_count_txs, is_last_page
 
-    def _get_txs_one_by_one(self, wallet_address, events_type, page, limit, sleep_seconds):
+    def _get_txs_one_by_one(self, wallet_address, events_type, page, limit, sleep_seconds, heights=None):
         """ Rewrites original query by retrieving set of txs one-by-one. """
         p_start = (page - 1) * limit + 1
         p_end = page * limit
@@ -82,7 +97,7 @@ class LcdAPI_v2(LcdAPI_v1):
         elems = []
         for p in range(p_start, p_end + 1):
             logging.info("Fetching p=%s ...", p)
-            data = self._get_txs(wallet_address, events_type, p, 1, sleep_seconds)
+            data = self._get_txs(wallet_address, events_type, p, 1, sleep_seconds, heights)
             total_count_txs = int(data["total"])
             elems.extend(data["tx_responses"])
 
@@ -94,46 +109,94 @@ class LcdAPI_v2(LcdAPI_v1):
 
 
 def get_txs_all(node, address, max_txs, progress=None, limit=TXS_LIMIT_PER_QUERY, sleep_seconds=1,
-                debug=False, stage_name="default", events_types=None):
+                debug=False, stage_name="default", events_types=None, max_workers=LCD_MAX_WORKERS, min_height=None,
+                max_height=None):
+    """
+    Fetches all txs for address.  The first page of each events_type gives the total count, after which
+    the remaining pages are fetched concurrently (up to max_workers), throttled by the node's RateLimiter.
+    max_workers=1 keeps the original one-page-at-a-time behavior (with sleep_seconds between pages).
+
+    min_height: if set, only returns txs with height > min_height.
+    max_height: if set, only returns txs with height <= max_height.
+    Both are pushed into the tx query if node supports it.  Otherwise, txs are paged (newest first) only until
+    min_height is reached, and filtered by max_height after fetch.
+    """
     LcdAPI_v2.debug = debug
     api = LcdAPI_v2(node)
     events_types = events_types if events_types else EVENTS_TYPE_LIST_DEFAULT
     max_pages = math.ceil(max_txs / limit)
+    page_sleep_seconds = sleep_seconds if max_workers <= 1 else 0
+
+    heights = None
+    if (min_height or max_height) and api.supports_height_query():
+        heights = (min_height + 1 if min_height else None, max_height)
+        min_height, max_height = None, None
 
     out = []
     pages_total = 0
     for events_type in events_types:
-        page = 1
         if progress:
             progress.report_message(f"Starting fetch for event_type={events_type}")
 
-        for _ in range(max_pages):
-            elems, _, is_last_page = api.get_txs(address, events_type, page, limit, sleep_seconds)
-            out.extend(elems)
+        elems, total_count_txs, is_last_page = api.get_txs(
+            address, events_type, 1, limit, page_sleep_seconds, heights)
+        out.extend(elems)
+        pages_total += 1
+        if progress:
+            message = f"Fetched page 1 for {events_type} stage..."
+            progress.report(pages_total, message, stage_name)
+
+        if is_last_page or reached_height(elems, min_height):
+            continue
+
+        num_pages = min(max_pages, math.ceil(total_count_txs / limit))
+        if min_height:
+            # Walk remaining pages one at a time, until reaching min_height (older pages not needed)
+            for page in range(2, num_pages + 1):
+                elems, _, is_last_page = api.get_txs(address, events_type, page, limit, sleep_seconds)
+                out.extend(elems)
 
-            if progress:
                 pages_total += 1
-                message = f"Fetched page {page} for {events_type} stage..."
-                progress.report(pages_total, message, stage_name)
+                if progress:
+                    message = f"Fetched page {page} for {events_type} stage..."
+                    progress.report(pages_total, message, stage_name)
+
+                if is_last_page or reached_height(elems, min_height):
+                    break
+            continue
 
-            page += 1
+        list_args = [(address, events_type, page, limit, page_sleep_seconds, heights)
+                     for page in range(2, num_pages + 1)]
 
-            if is_last_page:
-                break
+        pages = [None] * len(list_args)
+        for i, (elems, _, _) in run_concurrent(api.get_txs, list_args, max_workers):
+            pages[i] = elems
+            pages_total += 1
+            if progress:
+                message = f"Fetched page {i+2} for {events_type} stage..."
+                progress.report(pages_total, message, stage_name)
+        for elems in pages:
+            out.extend(elems)
 
+    out = filter_newer(out, min_height)
+    out = filter_older(out, max_height)
     out = remove_duplicates(out)
     return out
 
 
 def get_txs_pages_count(node, address, max_txs, limit=TXS_LIMIT_PER_QUERY,
-                        events_types=None, sleep_seconds=1):
+                        events_types=None, sleep_seconds=1, min_height=None, max_height=None):
     api = LcdAPI_v2(node)
     events_types = events_types if events_types else EVENTS_TYPE_LIST_DEFAULT
+    heights = None
+    if (min_height or max_height) and api.supports_height_query():
+        heights = (min_height + 1 if min_height else None, max_height)
 
     total_pages = 0
     for event_type in events_types:
         # Number of queries for events message.sender
-        _, num_txs, _ = api.get_txs(address, event_type, page=1, limit=limit, sleep_seconds=sleep_seconds)
+        _, num_txs, _ = api.get_txs(
+            address, event_type, page=1, limit=limit, sleep_seconds=sleep_seconds, heights=heights)
         num_txs = min(num_txs, max_txs)
         num_pages = math.ceil(num_txs / limit) if num_txs else 1
 
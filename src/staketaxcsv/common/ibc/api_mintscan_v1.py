@@ -2,22 +2,52 @@
 For list of supported networks for mintscan api, see https://docs.cosmostation.io/apis#supported-chain-list .
 """
 
+from datetime import datetime, timedelta
 from urllib.parse import urlencode
+from dateutil import parser
 import logging
 import math
 import pprint
 import requests
 import time
 
+from staketaxcsv.common.concurrent_util import run_concurrent
 from staketaxcsv.common.query import get_with_retries
-from staketaxcsv.settings_csv import MINTSCAN_KEY
-from staketaxcsv.common.ibc.util_ibc import remove_duplicates
+from staketaxcsv.common.rate_limiter import RateLimiter
+from staketaxcsv.settings_csv import MINTSCAN_KEY, MINTSCAN_MAX_WORKERS
+from staketaxcsv.common.ibc.util_ibc import remove_duplicates, reached_height, filter_newer
 from staketaxcsv.common.ibc.constants import MINTSCAN_LABELS
-from staketaxcsv.common.debug_util import debug_cache
-from staketaxcsv.settings_csv import REPORTS_DIR
+from staketaxcsv.common.response_cache import response_cache, TTL_FOREVER
 from urllib.parse import quote
 
 TXS_LIMIT_PER_QUERY = 20
+MINTSCAN_REQUESTS_PER_SECOND = 10  # shared by all threads
+
+# Sharded fetch (see _get_all_sharded())
+SHARD_MIN_TXS = 500            # fewer txs than this: fetch pages one at a time
+SHARD_WINDOWS_PER_WORKER = 2   # max date windows = max_workers * this
+SHARD_MIN_WINDOW = timedelta(hours=1)
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _ttl_pages(call_args, data):
+    """ Pages behind a searchAfter cursor never change (results are newest first); first page is the head. """
+    if not isinstance(data, dict) or "pagination" not in data:
+        return 0
+    if call_args["search_after"]:
+        return TTL_FOREVER
+    return None
+
+
+def _date_times(from_date, to_date):
+    """ Returns (fromDateTime, toDateTime) query params for inclusive date range (YYYY-MM-DD, UTC) """
+    # api truncates data to only one month if no fromDateTime.  So this is used to avoid this.
+    if from_date is None:
+        from_date = "2016-01-01"
+
+    from_date_ts = from_date + " 00:00:00"
+    to_date_ts = to_date + " 23:59:59" if to_date else None
+    return from_date_ts, to_date_ts
 
 
 class MintscanAPI:
@@ -41,6 +71,7 @@ class MintscanAPI:
             raise Exception("Missing STAKETAX_MINTSCAN_KEY environment variable")
 
         url = self.base_url + uri_path
+        RateLimiter.for_node("https://apis.mintscan.io", MINTSCAN_REQUESTS_PER_SECOND).wait()
         encoded_query = "&".join(f"{quote(str(k))}={quote(str(v))}" for k, v in query_params.items())
         logging.info("Requesting url %s?%s ...", url, encoded_query)
         data = get_with_retries(self.session, url, query_params, headers=self.headers)
@@ -74,7 +105,7 @@ class MintscanAPI:
 
         return elem
 
-    @debug_cache(REPORTS_DIR)
+    @response_cache(ttl=_ttl_pages, instance_key=lambda api: api.network)
     def _get_txs(self, address, search_after=None, limit=TXS_LIMIT_PER_QUERY, from_date_time=None, to_date_time=None):
         uri_path = f"/accounts/{address}/transactions"
         params = {
@@ -95,14 +126,16 @@ class MintscanAPI:
         from_date: YYYY-MM-DD (inclusive, UTC)
         to_date: YYYY-MM-DD (inclusive, UTC)
         """
-        # api truncates data to only one month if no fromDateTime.  So this is used to avoid this.
-        if from_date is None:
-            from_date = "2016-01-01"
+        from_date_ts, to_date_ts = _date_times(from_date, to_date)
 
-        from_date_ts = from_date + " 00:00:00"
-        to_date_ts = to_date + " 23:59:59" if to_date else None
+        return self.get_txs_window(address, search_after, limit, from_date_ts, to_date_ts)
 
-        data = self._get_txs(address, search_after, limit, from_date_ts, to_date_ts)
+    def get_txs_window(self, address, search_after, limit, from_date_time, to_date_time):
+        """
+        from_date_time: YYYY-MM-DD HH:MM:SS (inclusive, UTC)
+        to_date_time: YYYY-MM-DD HH:MM:SS (inclusive, UTC) or None
+        """
+        data = self._get_txs(address, search_after, limit, from_date_time, to_date_time)
         transactions = data.get("transactions", [])
         next_search_after = data.get("pagination", {}).get("searchAfter")
         total_txs = data.get("pagination", {}).get("totalCount")
@@ -142,7 +175,7 @@ class MintscanAPI:
                 x.update(value)
                 del x[field_tx_type]
 
-    @debug_cache(REPORTS_DIR)
+    @response_cache(ttl=_ttl_pages, instance_key=lambda api: api.network)
     def _get_balances(self, address, search_after=None, limit=TXS_LIMIT_PER_QUERY, from_date_time=None, to_date_time=None):
         uri_path = f"/accounts/{address}/balances"
         params = {
@@ -163,20 +196,25 @@ class MintscanAPI:
         from_date: YYYY-MM-DD (inclusive, UTC)
         to_date: YYYY-MM-DD (inclusive, UTC)
         """
-        # api truncates data to only one month if no fromDateTime.  So this is used to avoid this.
-        if from_date is None:
-            from_date = "2016-01-01"
+        from_date_ts, to_date_ts = _date_times(from_date, to_date)
 
-        from_date_ts = from_date + " 00:00:00"
-        to_date_ts = to_date + " 23:59:59" if to_date else None
+        balances, next_search_after, is_last_page, _ = self.get_balances_window(
+            address, search_after, limit, from_date_ts, to_date_ts)
+        return balances, next_search_after, is_last_page
 
-        data = self._get_balances(address, search_after, limit, from_date_ts, to_date_ts)
+    def get_balances_window(self, address, search_after, limit, from_date_time, to_date_time):
+        """
+        from_date_time: YYYY-MM-DD HH:MM:SS (inclusive, UTC)
+        to_date_time: YYYY-MM-DD HH:MM:SS (inclusive, UTC) or None
+        """
+        data = self._get_balances(address, search_after, limit, from_date_time, to_date_time)
 
         balances = data.get("balances", [])
         next_search_after = data.get("pagination", {}).get("searchAfter")
+        total_count = data.get("pagination", {}).get("totalCount")
         is_last_page = next_search_after is None
 
-        return balances, next_search_after, is_last_page
+        return balances, next_search_after, is_last_page, total_count
 
 
 def get_txs_page_count(ticker, address, max_txs, start_date=None, end_date=None):
@@ -189,16 +227,35 @@ def get_txs_page_count(ticker, address, max_txs, start_date=None, end_date=None)
     return num_pages
 
 
-def get_txs_all(ticker, address, max_txs, progress=None, start_date=None, end_date=None):
+def get_txs_all(ticker, address, max_txs, progress=None, start_date=None, end_date=None, min_height=None,
+                max_workers=MINTSCAN_MAX_WORKERS):
+    """
+    min_height: if set, only returns txs with height > min_height (stops paging once it is reached)
+    max_workers: max date windows fetched concurrently, for wallets with many txs (1: one page at a time)
+    """
     api = MintscanAPI(ticker)
     max_pages = math.ceil(max_txs / TXS_LIMIT_PER_QUERY)
 
-    out = []
-    search_after = None
-
     if progress:
         progress.report_message(f"Starting fetch stage ...")
-    for i in range(max_pages):
+
+    # First page gives total count of txs
+    elems, search_after, is_last_page, total_txs = api.get_txs(
+        address, None, limit=TXS_LIMIT_PER_QUERY, from_date=start_date, to_date=end_date)
+    if progress:
+        progress.report(1, "Fetched page 1 ...")
+
+    if (max_workers > 1 and not min_height and not is_last_page and total_txs
+            and min(total_txs, max_txs) >= SHARD_MIN_TXS):
+        out = _get_all_sharded(api.get_txs_window, address, max_txs, progress, start_date, max_workers, elems)
+        out = remove_duplicates(out)
+        return out[-max_pages * TXS_LIMIT_PER_QUERY:]
+
+    out = list(elems)
+    for i in range(1, max_pages):
+        if is_last_page or reached_height(elems, min_height):
+            break
+
         elems, search_after, is_last_page, _ = api.get_txs(
             address, search_after, limit=TXS_LIMIT_PER_QUERY, from_date=start_date, to_date=end_date)
         out.extend(elems)
@@ -206,33 +263,135 @@ def get_txs_all(ticker, address, max_txs, progress=None, start_date=None, end_da
         if progress:
             progress.report(i + 1, f"Fetched page {i + 1} ...")
 
-        if is_last_page:
+    out = filter_newer(out, min_height)
+    out = remove_duplicates(out)
+    return out
+
+
+class _Window:
+    """ Date range of elems (txs or balances), with its first page (newest elems) """
+
+    def __init__(self, get_window, address, from_dt, to_dt):
+        self.from_dt = from_dt
+        self.to_dt = to_dt
+        self.elems, self.search_after, self.is_last_page, total_count = get_window(
+            address, None, TXS_LIMIT_PER_QUERY, from_dt.strftime(DATETIME_FORMAT), to_dt.strftime(DATETIME_FORMAT))
+        self.total_count = total_count if total_count else len(self.elems)
+
+
+def _get_all_sharded(get_window, address, max_txs, progress, start_date, max_workers, first_page):
+    """
+    get_window: api.get_txs_window or api.get_balances_window
+
+    Splits date range into windows of similar elem counts (from totalCount of each window's first page), then
+    walks each window's searchAfter cursor chain concurrently.  Returns elems newest first.
+
+    Extra api credits spent (vs. one page at a time) are the first pages of windows that get bisected, which is
+    a few percent for large wallets.  At most max_workers * SHARD_WINDOWS_PER_WORKER windows are walked.
+    """
+    from_dt = datetime.strptime(start_date if start_date else "2016-01-01", "%Y-%m-%d")
+    # Range ends at newest tx (from first page of whole range)
+    to_dt = _timestamp_dt(first_page[0]["timestamp"])
+    max_windows = max_workers * SHARD_WINDOWS_PER_WORKER
+
+    windows = [_Window(get_window, address, from_dt, to_dt)]
+    target_count = math.ceil(min(windows[0].total_count, max_txs) / max_workers)
+
+    # Bisect dense windows (concurrently) until each has about target_count elems
+    while len(windows) < max_windows:
+        to_split = [w for w in windows if w.total_count > target_count and w.to_dt - w.from_dt > SHARD_MIN_WINDOW]
+        to_split = sorted(to_split, key=lambda w: w.total_count, reverse=True)[:max_windows - len(windows)]
+        if not to_split:
             break
 
-    out = remove_duplicates(out)
+        list_args = []
+        for w in to_split:
+            mid_dt = w.from_dt + (w.to_dt - w.from_dt) / 2
+            mid_dt = mid_dt.replace(microsecond=0)
+            list_args.append((get_window, address, w.from_dt, mid_dt))
+            list_args.append((get_window, address, mid_dt + timedelta(seconds=1), w.to_dt))
+        halves = [None] * len(list_args)
+        for i, window in run_concurrent(_Window, list_args, max_workers):
+            halves[i] = window
+
+        windows = [w for w in windows if w not in to_split] + [w for w in halves if w.total_count]
+        windows.sort(key=lambda w: w.from_dt, reverse=True)
+
+    # Keep newest windows needed for max_txs
+    kept, count = [], 0
+    for w in windows:
+        if count >= max_txs:
+            break
+        kept.append(w)
+        count += w.total_count
+    logging.info("Fetching %s elems in %s date windows: %s", count, len(kept), [w.total_count for w in kept])
+
+    pages_done = 0
+    results = [None] * len(kept)
+    list_args = [(get_window, address, w, max_txs) for w in kept]
+    for i, elems in run_concurrent(_walk_window, list_args, max_workers):
+        results[i] = elems
+        pages_done += math.ceil(len(elems) / TXS_LIMIT_PER_QUERY)
+        if progress:
+            progress.report(pages_done, f"Fetched {pages_done} pages ({i + 1} of {len(kept)} date windows) ...")
+
+    out = []
+    for elems in results:
+        out.extend(elems)
     return out
 
 
-def get_balances_all(ticker, address, max_txs, start_date=None, end_date=None):
+def _walk_window(get_window, address, window, max_txs):
+    out = list(window.elems)
+    search_after, is_last_page = window.search_after, window.is_last_page
+    from_ts, to_ts = window.from_dt.strftime(DATETIME_FORMAT), window.to_dt.strftime(DATETIME_FORMAT)
+
+    # (stops at window's total count, to skip the trailing empty page)
+    while not is_last_page and len(out) < min(window.total_count, max_txs):
+        elems, search_after, is_last_page, _ = get_window(address, search_after, TXS_LIMIT_PER_QUERY, from_ts, to_ts)
+        out.extend(elems)
+    return out
+
+
+def get_balances_all(ticker, address, max_txs, start_date=None, end_date=None, max_workers=MINTSCAN_MAX_WORKERS):
+    """
+    max_workers: max date windows fetched concurrently, for wallets with many balance snapshots
+                 (1: one page at a time)
+    """
     api = MintscanAPI(ticker)
     max_pages = math.ceil(max_txs / TXS_LIMIT_PER_QUERY)
 
-    out = []
-    search_after = None
+    from_date_ts, to_date_ts = _date_times(start_date, end_date)
 
-    for i in range(max_pages):
-        balances, search_after, is_last_page = api.get_balances(
-            address, search_after, limit=TXS_LIMIT_PER_QUERY, from_date=start_date, to_date=end_date)
-        out.extend(balances)
+    # First page gives total count of balance snapshots
+    balances, search_after, is_last_page, total_count = api.get_balances_window(
+        address, None, TXS_LIMIT_PER_QUERY, from_date_ts, to_date_ts)
+
+    if (max_workers > 1 and not is_last_page and total_count
+            and min(total_count, max_txs) >= SHARD_MIN_TXS):
+        out = _get_all_sharded(api.get_balances_window, address, max_txs, None, start_date, max_workers, balances)
+        out.sort(key=lambda b: _timestamp_dt(b["timestamp"]), reverse=True)
+        return out[:max_pages * TXS_LIMIT_PER_QUERY]
 
+    out = list(balances)
+    for i in range(1, max_pages):
         if is_last_page:
             break
 
-    out.sort(key=lambda b: b["timestamp"], reverse=True)
+        balances, search_after, is_last_page, _ = api.get_balances_window(
+            address, search_after, TXS_LIMIT_PER_QUERY, from_date_ts, to_date_ts)
+        out.extend(balances)
+
+    out.sort(key=lambda b: _timestamp_dt(b["timestamp"]), reverse=True)
 
     return out
 
 
+def _timestamp_dt(timestamp):
+    """ Naive utc datetime of mintscan timestamp ("2024-01-10T18:35:55Z" or "2024-01-10 18:35:55") """
+    return parser.parse(timestamp).replace(tzinfo=None)
+
+
 def main():
     logging.basicConfig(level=logging.INFO)
 
@@ -1,24 +1,44 @@
 import ast
 import base64
 import binascii
-import functools
+import json
 import logging
 import math
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from urllib.parse import urlencode
 import requests
 from dateutil import parser
 
+import staketaxcsv.settings_csv
 from staketaxcsv.common.query import get_with_retries
+from staketaxcsv.common.rate_limiter import RateLimiter
+from staketaxcsv.common.response_cache import response_cache, TTL_FOREVER
 from staketaxcsv.common.ibc.constants import (
     EVENTS_TYPE_SENDER, EVENTS_TYPE_RECIPIENT, EVENTS_TYPE_SIGNER, EVENTS_TYPE_LIST_DEFAULT)
-from staketaxcsv.common.ibc.util_ibc import remove_duplicates
-from staketaxcsv.common.ibc.protobuf_decoder import (
-    CosmosTransactionFeeExtractor,
-    ProtobufParser,
-    ProtobufParserCallback,
-)
+from staketaxcsv.common.ibc.protobuf_decoder import decode_fees
 TXS_LIMIT_PER_QUERY = 50
+BLOCKCHAIN_LIMIT_PER_QUERY = 20  # max block headers returned by /blockchain
+
+
+def _ttl_block(call_args, data):
+    # Blocks never change.  Errors (i.e. pruned block) not cached.
+    if "result" not in data:
+        return 0
+
+    # /blockchain window reaching past chain tip is missing headers: not cached, so they are fetched later
+    if "min_height" in call_args:
+        heights = {int(block_meta["header"]["height"]) for block_meta in data["result"].get("block_metas", [])}
+        if heights != set(range(int(call_args["min_height"]), int(call_args["max_height"]) + 1)):
+            return 0
+    return TTL_FOREVER
+
+
+class BlockTimes:
+
+    # node -> {height (int) -> block time}
+    times = {}
 
 
 class RpcAPI:
@@ -31,12 +51,14 @@ class RpcAPI:
     def _query(self, uri_path, query_params, sleep_seconds=0.0):
         url = f"{self.node}{uri_path}"
         logging.info("Requesting url %s?%s ...", url, urlencode(query_params))
+        RateLimiter.for_node(self.node).wait()
         json_response = get_with_retries(self.session, url, query_params, {})
 
         if sleep_seconds:
             time.sleep(sleep_seconds)
         return json_response
 
+    @response_cache(ttl=_ttl_block, instance_key=lambda api: api.node)
     def _block(self, height):
         uri_path = "/block"
         query_params = {"height": height}
@@ -45,18 +67,40 @@ class RpcAPI:
 
         return data
 
-    def _txs_search(self, wallet_address, events_type, page, per_page):
+    @response_cache(ttl=_ttl_block, instance_key=lambda api: api.node)
+    def _blockchain(self, min_height, max_height):
+        uri_path = "/blockchain"
+        query_params = {"minHeight": min_height, "maxHeight": max_height}
+
+        data = self._query(uri_path, query_params, sleep_seconds=0.2)
+
+        return data
+
+    def latest_height(self):
+        data = self._query("/status", {})
+        return int(data["result"]["sync_info"]["latest_block_height"])
+
+    def _txs_search(self, wallet_address, events_type, page, per_page, heights=None):
+        """ heights: (min height, max height) inclusive, either can be None """
         uri_path = "/tx_search"
         query_params = {"page": page, "per_page": per_page}
         if events_type == EVENTS_TYPE_SENDER:
-            query_params["query"] = "\"message.sender='{}'\"".format(wallet_address)
+            query = "message.sender='{}'".format(wallet_address)
         elif events_type == EVENTS_TYPE_RECIPIENT:
-            query_params["query"] = "\"transfer.recipient='{}'\"".format(wallet_address)
+            query = "transfer.recipient='{}'".format(wallet_address)
         elif events_type == EVENTS_TYPE_SIGNER:
-            query_params["query"] = "\"message.signer='{}'\"".format(wallet_address)
+            query = "message.signer='{}'".format(wallet_address)
         else:
             raise Exception("Add case for events_type: {}".format(events_type))
 
+        if heights:
+            min_height, max_height = heights
+            if min_height:
+                query += " AND tx.height>={}".format(min_height)
+            if max_height:
+                query += " AND tx.height<={}".format(max_height)
+        query_params["query"] = "\"{}\"".format(query)
+
         # Retry up to 5 times, in case of unstable server
         for i in range(5):
             data = self._query(uri_path, query_params, sleep_seconds=1)
@@ -79,8 +123,8 @@ class RpcAPI:
         data = self._query(uri_path, query_params, sleep_seconds=1)
         return data.get("result", None)
 
-    def txs_search(self, wallet_address, events_type, page, per_page):
-        data = self._txs_search(wallet_address, events_type, page, per_page)
+    def txs_search(self, wallet_address, events_type, page, per_page, heights=None):
+        data = self._txs_search(wallet_address, events_type, page, per_page, heights)
 
         elems = data["result"]["txs"]
         total_count_txs = int(data["result"]["total_count"])
@@ -92,10 +136,31 @@ class RpcAPI:
 
         return elems, next_page, total_count_pages, total_count_txs
 
-    @functools.lru_cache
     def block_time(self, height):
-        data = self._block(height)
-        return data["result"]["block"]["header"]["time"]
+        height = int(height)
+        times = BlockTimes.times.setdefault(self.node, {})
+        if height not in times:
+            data = self._block(height)
+            times[height] = data["result"]["block"]["header"]["time"]
+        return times[height]
+
+    def load_block_times(self, heights):
+        """ Fetches times of all heights into node's index, using /blockchain (many headers per request). """
+        times = BlockTimes.times.setdefault(self.node, {})
+        missing = sorted(set(int(h) for h in heights) - set(times))
+
+        i = 0
+        while i < len(missing):
+            min_height = missing[i]
+            max_height = min_height + BLOCKCHAIN_LIMIT_PER_QUERY - 1
+            data = self._blockchain(min_height, max_height)
+
+            for block_meta in data.get("result", {}).get("block_metas", []):
+                header = block_meta["header"]
+                times[int(header["height"])] = header["time"]
+
+            while i < len(missing) and missing[i] <= max_height:
+                i += 1
 
 
 def get_tx(node, txid, normalize=True):
@@ -107,13 +172,19 @@ def get_tx(node, txid, normalize=True):
 
 
 def get_txs_all(node, wallet_address, max_txs, progress=None, limit=TXS_LIMIT_PER_QUERY, debug=False,
-                stage_name="default", events_types=None):
+                stage_name="default", events_types=None, heights=None, on_page=None):
+    """
+    heights: (min height, max height) inclusive, either can be None
+    on_page: if given, called with the new (not yet seen) elems of each page as soon as it's fetched
+             (i.e. RpcNormalizer.submit, so that pages are normalized while later pages are fetched)
+    """
     api = RpcAPI(node)
     api.debug = debug
     events_types = events_types if events_types else EVENTS_TYPE_LIST_DEFAULT
     max_pages = math.ceil(max_txs / limit)
 
     out = []
+    txids = set()
     page_for_progress = 1
     for events_type in events_types:
         for page in range(1, max_pages + 1):
@@ -122,19 +193,23 @@ def get_txs_all(node, wallet_address, max_txs, progress=None, limit=TXS_LIMIT_PE
                 progress.report(page_for_progress, message, stage_name)
                 page_for_progress += 1
 
-            elems, next_page, _, _ = api.txs_search(wallet_address, events_type, page, limit)
+            elems, next_page, _, _ = api.txs_search(wallet_address, events_type, page, limit, heights)
+
+            # same tx can be in results of more than one events_type
+            new_elems = [elem for elem in elems if elem["hash"] not in txids]
+            txids.update(elem["hash"] for elem in new_elems)
+            out.extend(new_elems)
+            if on_page and new_elems:
+                on_page(new_elems)
 
-            out.extend(elems)
             if next_page is None:
                 break
 
-    out = remove_duplicates(out, tx_hash_key="hash", timestamp_sort=False)
-
     return out
 
 
 def get_txs_pages_count(node, address, max_txs, limit=TXS_LIMIT_PER_QUERY, debug=False,
-                        events_types=None):
+                        events_types=None, heights=None):
     api = RpcAPI(node)
     api.debug = debug
     events_types = events_types if events_types else EVENTS_TYPE_LIST_DEFAULT
@@ -142,7 +217,7 @@ def get_txs_pages_count(node, address, max_txs, limit=TXS_LIMIT_PER_QUERY, debug
     total_pages = 0
     total_txs = 0
     for event_type in events_types:
-        _, _, num_pages, num_txs = api.txs_search(address, event_type, 1, limit)
+        _, _, num_pages, num_txs = api.txs_search(address, event_type, 1, limit, heights)
         num_txs = min(num_txs, max_txs)
         num_pages = math.ceil(num_txs / limit) if num_txs else 1
 
@@ -153,13 +228,116 @@ def get_txs_pages_count(node, address, max_txs, limit=TXS_LIMIT_PER_QUERY, debug
     return total_pages, total_txs
 
 
-def normalize_rpc_txns(node, elems, progress_rpc=None, stage_name=""):
+def normalize_rpc_txns(node, elems, progress_rpc=None, stage_name="", max_workers=None):
     """
     Normalize the RPC transaction element to have fields a LCD transaction element
     would have.
     Decodes base64 encoded fields as needed.
     """
-    for i, elem in enumerate(elems):
+    if len(elems) < TXS_LIMIT_PER_QUERY:
+        # Less than a page (i.e. single tx): decoded in this process
+        max_workers = 1
+
+    with RpcNormalizer(node, progress_rpc, stage_name, max_workers) as normalizer:
+        for i in range(0, len(elems), TXS_LIMIT_PER_QUERY):
+            normalizer.submit(elems[i:i + TXS_LIMIT_PER_QUERY])
+
+
+class NormalizePool:
+    """ Process pool shared by all RpcNormalizers (RPC_NORMALIZE_MAX_WORKERS > 1) for the life of the process.
+
+    Call start() from the main thread before starting threads that normalize (i.e. one per archive node), so that
+    worker processes are not forked from a multithreaded process.
+    """
+
+    executor = None
+    lock = threading.Lock()
+
+    @classmethod
+    def start(cls, max_workers=None):
+        if max_workers is None:
+            max_workers = staketaxcsv.settings_csv.RPC_NORMALIZE_MAX_WORKERS
+        if max_workers <= 1:
+            return None
+
+        with cls.lock:
+            if cls.executor is None:
+                cls.executor = ProcessPoolExecutor(max_workers=max_workers)
+                # With fork start method, all worker processes are launched by the first submit
+                cls.executor.submit(int).result()
+            return cls.executor
+
+
+class RpcNormalizer:
+    """
+    Normalizes pages of RPC transaction elements (in place), as a pipeline stage:
+
+        with RpcNormalizer(node, progress_rpc, stage_name) as normalizer:
+            elems = get_txs_all(node, ..., on_page=normalizer.submit)
+
+    Decoding is pure cpu work, so with max_workers > 1 it runs in the shared NormalizePool while this process
+    goes on fetching pages and block times.  All elems are normalized when the with block exits.
+    """
+
+    def __init__(self, node, progress_rpc=None, stage_name="", max_workers=None):
+        self.node = node
+        self.progress_rpc = progress_rpc
+        self.stage_name = stage_name
+        self.executor = NormalizePool.start(max_workers)
+
+        # list of (elems, future of decoded elems (None if decoded in this process))
+        self.pending = []
+        self.num_submitted = 0
+        self.num_done = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.finish()
+        else:
+            # pool is shared: only drop this normalizer's work
+            for _, future in self.pending:
+                if future:
+                    future.cancel()
+            self.pending = []
+
+    def submit(self, elems):
+        self.num_submitted += len(elems)
+        if self.executor:
+            future = self.executor.submit(_decode_page, elems)
+            self.pending.append((elems, future))
+        else:
+            _decode_page(elems)
+            self.pending.append((elems, None))
+
+        # block times are i/o: fetched here, overlapping with decoding in worker processes
+        RpcAPI(self.node).load_block_times([elem["height"] for elem in elems])
+
+    def finish(self):
+        for elems, future in self.pending:
+            if future:
+                for elem, decoded_elem in zip(elems, future.result()):
+                    # update in place, as callers hold references to elems
+                    elem.update(decoded_elem)
+
+            for elem in elems:
+                _add_timestamp_from_block_time(elem, self.node)
+
+            self.num_done += len(elems)
+            if self.progress_rpc and self.stage_name:
+                self.progress_rpc.report(
+                    self.num_done, "Normalized {} of {} elements...".format(self.num_done, self.num_submitted),
+                    self.stage_name)
+        self.pending = []
+
+
+def _decode_page(elems):
+    """ Normalizes elems in place, except for timestamp (needs block time).  Returns elems (for worker process). """
+    fees = decode_fees([base64.b64decode(elem["tx"]) for elem in elems])
+
+    for elem, fee in zip(elems, fees):
         elem = _decode(elem)
 
         # add the txhash field
@@ -169,31 +347,24 @@ def normalize_rpc_txns(node, elems, progress_rpc=None, stage_name=""):
         if "code" in elem["tx_result"]:
             elem["code"] = elem["tx_result"]["code"]
 
-        # add the timestamp field
-        _add_timestamp_from_block_time(elem, node)
-
         # add the fee
-        _add_fee_from_cosmos_transaction_authinfo(elem)
+        _add_fee_from_cosmos_transaction_authinfo(elem, fee)
 
         # add transaction messages
         _add_messages_from_logs(elem)
 
-        if progress_rpc and stage_name and i % 10 == 0:
-            progress_rpc.report(i, "Normalized {} of {} elements...".format(i, len(elems)), stage_name)
-
-    if progress_rpc and stage_name:
-        progress_rpc.report(len(elems), "Normalized {} of {} elements...".format(len(elems), len(elems)), stage_name)
+    return elems
 
 
 def _decode(elem):
     """ Modifies transaction data with decoded version """
-    try:
-        elem["tx_result"]["log"] = ast.literal_eval(elem["tx_result"]["log"])
-    except SyntaxError as e:
+    log = _parse_log(elem["tx_result"]["log"])
+    if log is None:
         # Occurs with failed transactions.
         # Sample log element: "failed to execute message; message index: 0: ..."
         elem["tx_result"]["log_original"] = elem["tx_result"]["log"]
-        elem["tx_result"]["log"] = []
+        log = []
+    elem["tx_result"]["log"] = log
 
     events = elem["tx_result"]["events"]
     for event in events:
@@ -208,11 +379,22 @@ def _decode(elem):
             except UnicodeDecodeError as e:
                 pass
 
-    elem["tx"] = base64.b64decode(elem["tx"])
-
     return elem
 
 
+def _parse_log(log):
+    """ Returns parsed log, or None if log is not json (or python literal, as fallback). """
+    try:
+        return json.loads(log)
+    except ValueError:
+        pass
+
+    try:
+        return ast.literal_eval(log)
+    except (SyntaxError, ValueError) as e:
+        return None
+
+
 def _add_timestamp_from_block_time(elem, node):
     """
     Add a timestamp field to an RPC element.
@@ -238,22 +420,19 @@ def _add_timestamp_from_block_time(elem, node):
     elem["timestamp"] = block_timestamp
 
 
-def _add_fee_from_cosmos_transaction_authinfo(elem):
+def _add_fee_from_cosmos_transaction_authinfo(elem, fee):
     """
-    Extracts the fee denom and amount from the protobuf encoded cosmos transaction data and
-    adds it to the RPC element.
+    Adds the fee (denom, amount), decoded from the protobuf encoded cosmos transaction data, to the RPC element.
     """
-    fee_extractor_callback = CosmosTransactionFeeExtractor()
-    protobuf_parser = ProtobufParser(elem["tx"], fee_extractor_callback)
-    protobuf_parser.parse()
+    fee_denom, fee_amount = fee
 
     elem["tx"] = {
         "auth_info": {
             "fee": {
                 "amount": [
                     {
-                        "denom": fee_extractor_callback.fee_denom,
-                        "amount": fee_extractor_callback.fee_amount
+                        "denom": fee_denom,
+                        "amount": fee_amount
                     }
                 ]
             }
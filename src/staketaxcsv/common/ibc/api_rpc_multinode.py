@@ -1,6 +1,12 @@
 import staketaxcsv.common.ibc.api_rpc
+from staketaxcsv.common.concurrent_util import run_concurrent
+from staketaxcsv.common.ibc.block_heights import height_range
 from staketaxcsv.common.ibc.util_ibc import remove_duplicates
-from staketaxcsv.common.ibc.api_rpc import TXS_LIMIT_PER_QUERY
+from staketaxcsv.common.ibc.api_rpc import TXS_LIMIT_PER_QUERY, NormalizePool, RpcAPI, RpcNormalizer
+
+# Archive nodes serve disjoint height ranges, so they are fetched concurrently (one thread per node; requests
+# to each node are still throttled by its RateLimiter).
+MAX_NODE_WORKERS = 4
 
 
 def get_tx(nodes, txid):
@@ -12,11 +18,22 @@ def get_tx(nodes, txid):
     return elem
 
 
-def get_txs_pages_count(nodes, wallet_address, max_txs, progress_rpc=None, limit=TXS_LIMIT_PER_QUERY):
+def _heights(node, start_date, end_date):
+    if not start_date and not end_date:
+        return None
+    return height_range(RpcAPI(node), start_date, end_date)
+
+
+def get_txs_pages_count(nodes, wallet_address, max_txs, progress_rpc=None, limit=TXS_LIMIT_PER_QUERY,
+                        start_date=None, end_date=None):
+    list_args = [(node, wallet_address, max_txs, limit, start_date, end_date) for node in nodes]
+    counts = [None] * len(nodes)
+    for i, result in run_concurrent(_get_txs_pages_count_node, list_args, MAX_NODE_WORKERS):
+        counts[i] = result
+
     pages_total = 0
     txs_total = 0
-    for node in nodes:
-        num_pages, num_txs = staketaxcsv.common.ibc.api_rpc.get_txs_pages_count(node, wallet_address, max_txs, limit)
+    for node, (num_pages, num_txs) in zip(nodes, counts):
         pages_total += num_pages
         txs_total += num_txs
 
@@ -26,24 +43,42 @@ def get_txs_pages_count(nodes, wallet_address, max_txs, progress_rpc=None, limit
     return pages_total, txs_total
 
 
-def get_txs_all(nodes, wallet_address, max_txs, progress_rpc=None, limit=TXS_LIMIT_PER_QUERY):
-    elems = []
-    for node in nodes:
-        stage_name_fetch = node + "_fetch"
-        stage_name_normalize = node + "_normalize"
+def _get_txs_pages_count_node(node, wallet_address, max_txs, limit, start_date, end_date):
+    return staketaxcsv.common.ibc.api_rpc.get_txs_pages_count(
+        node, wallet_address, max_txs, limit, heights=_heights(node, start_date, end_date))
 
-        # fetch
-        cur_elems = staketaxcsv.common.ibc.api_rpc.get_txs_all(
-            node, wallet_address, max_txs, progress=progress_rpc, limit=limit, stage_name=stage_name_fetch)
 
-        if progress_rpc:
-            progress_rpc.update_estimate_node(node, len(cur_elems))
+def get_txs_all(nodes, wallet_address, max_txs, progress_rpc=None, limit=TXS_LIMIT_PER_QUERY,
+                start_date=None, end_date=None):
+    list_args = [(node, wallet_address, max_txs, progress_rpc, limit, start_date, end_date) for node in nodes]
 
-        # normalize data into lcd data processor
-        staketaxcsv.common.ibc.api_rpc.normalize_rpc_txns(
-            node, cur_elems, progress_rpc, stage_name=stage_name_normalize)
+    # (process pool for normalizing, started before node threads)
+    NormalizePool.start()
 
+    elems_by_node = [None] * len(nodes)
+    for i, cur_elems in run_concurrent(_get_txs_all_node, list_args, MAX_NODE_WORKERS):
+        elems_by_node[i] = cur_elems
+
+    # combine in node order (not completion order), so output is same as a sequential run
+    elems = []
+    for cur_elems in elems_by_node:
         elems.extend(cur_elems)
 
     elems = remove_duplicates(elems)
     return elems
+
+
+def _get_txs_all_node(node, wallet_address, max_txs, progress_rpc, limit, start_date, end_date):
+    stage_name_fetch = node + "_fetch"
+    stage_name_normalize = node + "_normalize"
+
+    # fetch, normalizing each page (into lcd data format) while later pages are fetched
+    with RpcNormalizer(node, progress_rpc, stage_name_normalize) as normalizer:
+        cur_elems = staketaxcsv.common.ibc.api_rpc.get_txs_all(
+            node, wallet_address, max_txs, progress=progress_rpc, limit=limit, stage_name=stage_name_fetch,
+            heights=_heights(node, start_date, end_date), on_page=normalizer.submit)
+
+        if progress_rpc:
+            progress_rpc.update_estimate_node(node, len(cur_elems))
+
+    return cur_elems
@@ -0,0 +1,70 @@
+"""
+Translates report start_date/end_date (YYYY-MM-DD, UTC) to block heights, so that tx queries to lcd/rpc nodes
+only cover those dates.
+
+Heights are found by binary search over block header times (blocks are cached, since they never change).
+Works with any api object having node, block_time(height), and latest_height() (i.e. LcdAPI_v1, RpcAPI).
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+
+class BlockHeights:
+
+    # (node, "YYYY-MM-DD") -> first height with block time on or after that date
+    first_heights = {}
+
+
+def height_range(api, start_date=None, end_date=None):
+    """ Returns (min_height, max_height) (inclusive; None means no bound) of blocks in start_date..end_date """
+    min_height, max_height = None, None
+
+    if start_date:
+        min_height = _first_height_on_or_after(api, start_date)
+    if end_date:
+        day_after = (datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        height = _first_height_on_or_after(api, day_after)
+        if height is not None:
+            max_height = height - 1
+
+    if start_date and min_height is None:
+        # start_date is after latest block: empty range
+        min_height = api.latest_height() + 1
+
+    logging.info("Height range for dates %s to %s on %s: %s to %s",
+                 start_date, end_date, api.node, min_height, max_height)
+    return min_height, max_height
+
+
+def _first_height_on_or_after(api, date):
+    """ Returns first height with block time >= date, or None if no such block yet. """
+    key = (api.node, date)
+    if key in BlockHeights.first_heights:
+        return BlockHeights.first_heights[key]
+
+    target = date + "T00:00:00"
+    lo, hi = 1, api.latest_height()
+    if (_block_time(api, hi) or "") < target:
+        return None
+
+    while lo < hi:
+        mid = (lo + hi) // 2
+        block_time = _block_time(api, mid)
+
+        # Pruned (unavailable) blocks are older than any available block
+        if block_time is None or block_time < target:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    BlockHeights.first_heights[key] = lo
+    return lo
+
+
+def _block_time(api, height):
+    """ Returns "YYYY-MM-DDTHH:MM:SS" time of block, or None if node doesn't have block """
+    try:
+        return api.block_time(height)[:19]
+    except (KeyError, TypeError):
+        return None
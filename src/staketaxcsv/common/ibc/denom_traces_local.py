@@ -0,0 +1,37 @@
+"""
+Local sqlite store of ibc denom traces for each chain (STAKETAX_IBC_DENOM_TRACES_DB), so that each run only
+fetches denom traces added since the last run.
+
+"""
+
+import logging
+import sqlite3
+
+from staketaxcsv.settings_csv import IBC_DENOM_TRACES_DB
+
+
+class DenomTracesLocalDB:
+
+    def __init__(self, path=None):
+        self.path = path if path else IBC_DENOM_TRACES_DB
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS denom_traces ("
+            "  node TEXT, ibc_address TEXT, base_denom TEXT, PRIMARY KEY (node, ibc_address)) WITHOUT ROWID")
+        self.conn.commit()
+
+    def get_traces(self, node):
+        """ Returns {ibc_address: base_denom} stored for node """
+        rows = self.conn.execute(
+            "SELECT ibc_address, base_denom FROM denom_traces WHERE node = ?", (node,)).fetchall()
+        return dict(rows)
+
+    def add_traces(self, node, traces):
+        logging.info("Adding %s denom traces for node=%s to %s ...", len(traces), node, self.path)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO denom_traces (node, ibc_address, base_denom) VALUES (?, ?, ?)",
+                ((node, ibc_address, base_denom) for ibc_address, base_denom in traces.items()))
+
+    def close(self):
+        self.conn.close()
@@ -1,14 +1,22 @@
 import json
 import logging
 import os
+import re
+import threading
 from staketaxcsv.common.ibc.api_lcd_v1 import LcdAPI_v1
 import staketaxcsv.common.ibc.constants as co
 from staketaxcsv.common.Cache import Cache
+from staketaxcsv.common.concurrent_util import run_concurrent
+from staketaxcsv.common.ibc.denom_traces_local import DenomTracesLocalDB
 from staketaxcsv import settings_csv
 
 # downloaded from https://raw.githubusercontent.com/PulsarDefi/IBC-Token-Data-Cosmos/main/native_token_data.json
 PULSAR_DATA = os.path.dirname(os.path.realpath(__file__)) + "/pulsar_data.json"
 
+IBC_ADDRESS_REGEX = re.compile(r"ibc/[0-9A-F]{64}")
+# Min unknown ibc addresses in txs to bulk load chain's denom traces (fewer: one lookup per address)
+DENOM_TRACES_BULK_MIN = 10
+
 
 class IBCAddrs:
 
@@ -30,7 +38,9 @@ class IBCAddrs:
         if not node:
             return None
 
-        denom = LcdAPI_v1(node).ibc_address_to_denom(ibc_address)
+        denom = DenomTraces.lookup(node, ibc_address)
+        if denom is None:
+            denom = LcdAPI_v1(node).ibc_address_to_denom(ibc_address)
 
         IBCAddrs.addrs[ibc_address] = denom
         return denom
@@ -57,6 +67,136 @@ class IBCAddrs:
             logging.info("Set cache using IBCAddrs.addrs ...")
 
 
+class DenomTraces:
+    """ Per-chain index of all denom traces (<ibc_address> -> <base_denom>), bulk loaded from lcd node. """
+
+    # <lcd_node> -> {<ibc_address>: <base_denom>}
+    index = {}
+    lock = threading.Lock()
+
+    @classmethod
+    def lookup(cls, node, ibc_address):
+        traces = cls.index.get(node)
+        return traces.get(ibc_address) if traces else None
+
+    @classmethod
+    def load(cls, node):
+        """ Loads index for node: traces in local store (if any), plus traces added on chain since. """
+        with cls.lock:
+            if node in cls.index:
+                return
+
+            db = DenomTracesLocalDB() if settings_csv.IBC_DENOM_TRACES_DB else None
+            traces = db.get_traces(node) if db else {}
+
+            try:
+                new_traces = cls._fetch_new(node, traces)
+            except Exception as e:
+                logging.warning("Unable to load denom traces for node=%s, exception=%s", node, str(e))
+                new_traces = {}
+
+            if db:
+                if new_traces:
+                    db.add_traces(node, new_traces)
+                db.close()
+
+            traces.update(new_traces)
+            cls.index[node] = traces
+            logging.info("Loaded %s denom traces for node=%s (%s new)", len(traces), node, len(new_traces))
+
+    @classmethod
+    def _fetch_new(cls, node, stored):
+        """ Returns traces on chain not in stored.
+
+        Listing is ordered by ibc address (hash), not by creation, so new traces may be on any page: paging stops
+        once all (total - len(stored)) new traces are found, since denom traces are never removed.
+        """
+        api = LcdAPI_v1(node)
+
+        page_traces, next_key, total = api.denom_traces()
+        num_new = total - len(stored) if total else None
+
+        new_traces = {}
+        while True:
+            new_traces.update({k: v for k, v in page_traces.items() if stored.get(k) != v})
+            if not next_key or (num_new is not None and len(new_traces) >= num_new):
+                return new_traces
+            page_traces, next_key, _ = api.denom_traces(next_key)
+
+
+def prefetch_ibc_addresses(lcd_node, elems):
+    """ Resolves all ibc addresses appearing in elems before processing, so that amount_currency_from_raw() for each
+    tx is only a dict lookup. """
+    if not lcd_node:
+        return
+
+    ibc_addresses = set()
+    for elem in elems:
+        _collect_ibc_addresses(elem, ibc_addresses)
+    prefetch_ibc_denoms(lcd_node, ibc_addresses)
+
+
+def prefetch_ibc_denoms(lcd_node, ibc_addresses):
+    """ Resolves given ibc addresses (i.e. "ibc/27394FB0...") """
+    if not lcd_node:
+        return
+    IBCAddrs._load_cache()
+
+    unknown = sorted(addr for addr in ibc_addresses if addr not in IBCAddrs.addrs)
+    if not unknown:
+        return
+
+    if settings_csv.IBC_DENOM_TRACES_DB or len(unknown) >= DENOM_TRACES_BULK_MIN:
+        DenomTraces.load(lcd_node)
+
+    # Remaining addresses (i.e. not in bulk load) looked up individually
+    list_args = [(lcd_node, addr) for addr in unknown]
+    for _ in run_concurrent(_prefetch_ibc_address, list_args, settings_csv.LCD_MAX_WORKERS):
+        pass
+
+
+def _collect_ibc_addresses(elem, out):
+    """ Adds ibc addresses in tx's denom fields (messages, fee) and event attribute values to set out """
+    tx = elem.get("tx")
+    if isinstance(tx, dict):
+        _collect_ibc_denoms(tx.get("body", {}).get("messages", []), out)
+        _collect_ibc_denoms(tx.get("auth_info", {}).get("fee", {}), out)
+
+    events = list(elem.get("events") or [])
+    for log in elem.get("logs") or []:
+        events.extend(log.get("events", []))
+    for event in events:
+        for attribute in event.get("attributes", []):
+            value = attribute.get("value")
+            # i.e. "100ibc/27394FB0...,5uatom"
+            if isinstance(value, str) and "ibc/" in value:
+                out.update(IBC_ADDRESS_REGEX.findall(value))
+
+
+def _collect_ibc_denoms(data, out):
+    """ Adds ibc address values of denom fields (i.e. {"denom": .., "amount": ..}, "token_out_denom") in data """
+    if isinstance(data, dict):
+        for k, v in data.items():
+            if isinstance(v, str):
+                if "denom" in k and v.startswith("ibc/"):
+                    out.add(v)
+            else:
+                _collect_ibc_denoms(v, out)
+    elif isinstance(data, list):
+        for item in data:
+            _collect_ibc_denoms(item, out)
+
+
+def _prefetch_ibc_address(lcd_node, ibc_address):
+    try:
+        IBCAddrs.ibc_address_to_denom(lcd_node, ibc_address)
+    except Exception as e:
+        logging.warning("Unable to prefetch denom for ibc address %s, exception=%s", ibc_address, str(e))
+        # Remembered as unresolved (address itself, as not saved by Cache.set_ibc_addresses()), so that
+        # amount_currency_from_raw() does not repeat the failing lookup: it reports "unknown_<ibc address>".
+        IBCAddrs.addrs[ibc_address] = ibc_address
+
+
 class PulsarData:
 
     loaded = False
@@ -1,7 +1,7 @@
 from staketaxcsv.common.ibc.api_mintscan_v1 import get_balances_all
 from staketaxcsv.common.BalExporter import BalExporter
-from collections import defaultdict
 from dateutil import parser
+import math
 from staketaxcsv.common.ibc import denoms
 from staketaxcsv.osmo import denoms as denoms_osmo
 from staketaxcsv.settings_csv import TICKER_OSMO
@@ -16,55 +16,109 @@ def via_mintscan(lcd_node, ticker, address, max_txs, start_date=None, end_date=N
     bond_denom = make_lcd_api(lcd_node).get_bond_denom()
 
     entries = get_balances_all(ticker, address, max_txs, start_date, end_date)
-    for entry in entries:
-        timestamp = parser.parse(entry["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
-        balance = defaultdict(int)
+    timestamps = [parser.parse(entry["timestamp"]).strftime("%Y-%m-%d %H:%M:%S") for entry in entries]
+    table = _flatten(entries, bond_denom)
 
+    for timestamp, balance in zip(timestamps, _balances(table, len(entries), lcd_node, ticker)):
+        # Ingest the summed balances into the exporter
+        exporter.ingest_row(timestamp, balance)
+
+    return exporter
+
+
+class _ItemsTable:
+    """ All items (bank, delegation, unbonding, reward) of all entries, as columns """
+
+    def __init__(self):
+        self.denoms = []       # distinct denoms
+        self.entry_index = []  # entry of each item
+        self.denom_index = []  # denom of each item (index into self.denoms)
+        self.amount_raw = []   # amount of each item
+
+        self._denom_indices = {}
+
+    def add(self, i, denom, amount_raw):
+        if denom not in self._denom_indices:
+            self._denom_indices[denom] = len(self.denoms)
+            self.denoms.append(denom)
+        self.entry_index.append(i)
+        self.denom_index.append(self._denom_indices[denom])
+        self.amount_raw.append(float(amount_raw))
+
+
+def _flatten(entries, bond_denom):
+    table = _ItemsTable()
+
+    for i, entry in enumerate(entries):
         # Process "bank" section
         for item in entry["bank"]:
-            denom = item["denom"]
-            amount_raw = int(item["amount"])
-            amount, currency = _amount_currency(amount_raw, denom, lcd_node, ticker)
-
-            balance[currency] += amount
+            table.add(i, item["denom"], int(item["amount"]))
 
         # Process "delegation" section
         for item in entry["delegation"]:
-            denom = item["balance"]["denom"]
-            amount_raw = int(item["balance"]["amount"])
-            amount, currency = _amount_currency(amount_raw, denom, lcd_node, ticker)
-
-            balance[currency] += amount
+            table.add(i, item["balance"]["denom"], int(item["balance"]["amount"]))
 
         # Process "unbonding" section
         for item in entry["unbonding"]:
             for subitem in item["entries"]:
-                denom = bond_denom
-                amount_raw = int(subitem["balance"])
-                amount, currency = _amount_currency(amount_raw, denom, lcd_node, ticker)
-
-                balance[currency] += amount
+                table.add(i, bond_denom, int(subitem["balance"]))
 
         # Process "reward" section
         for item in entry["reward"]:
             for subitem in item["reward"]:
-                denom = subitem["denom"]
-                amount_raw = float(subitem["amount"])
-                amount, currency = _amount_currency(amount_raw, denom, lcd_node, ticker)
-
-                balance[currency] += amount
-
-        # omit currencies with super tiny amounts
-        balance_edited = {}
-        for currency, amount in balance.items():
-            if amount < TINY_AMOUNT:
-                continue
-            balance_edited[currency] = amount
-
-        # Ingest the summed balances into the exporter
-        exporter.ingest_row(timestamp, balance_edited)
-
-    return exporter
+                table.add(i, subitem["denom"], float(subitem["amount"]))
+
+    return table
+
+
+def _balances(table, num_entries, lcd_node, ticker):
+    """ Returns dict of <currency> -> <amount> for each entry (omitting super tiny amounts) """
+    import numpy as np  # deferred (only needed for historical balances)
+
+    # Resolve all ibc addresses up front, instead of one lcd query at a time
+    if ticker != TICKER_OSMO:
+        denoms.prefetch_ibc_denoms(lcd_node, [denom for denom in table.denoms if denom.startswith("ibc/")])
+
+    # Each denom resolved once
+    currencies, currency_indices = [], {}
+    denom_currency, denom_divisor = [], []
+    for denom in table.denoms:
+        currency, divisor = _currency_divisor(denom, lcd_node, ticker)
+        if currency not in currency_indices:
+            currency_indices[currency] = len(currencies)
+            currencies.append(currency)
+        denom_currency.append(currency_indices[currency])
+        denom_divisor.append(divisor if divisor else np.nan)
+
+    entry_index = np.array(table.entry_index, dtype=np.int64)
+    denom_index = np.array(table.denom_index, dtype=np.int64)
+    amount_raw = np.array(table.amount_raw, dtype=np.float64)
+
+    amounts = amount_raw / np.array(denom_divisor, dtype=np.float64)[denom_index]
+    for k in np.flatnonzero(np.isnan(amounts)).tolist():
+        # denom not converted by a power of ten
+        amounts[k], _ = _amount_currency(table.amount_raw[k], table.denoms[table.denom_index[k]], lcd_node, ticker)
+
+    # Sum of each currency in each entry (np.add.at adds in item order, same as summing one item at a time)
+    sums = np.zeros((num_entries, len(currencies)), dtype=np.float64)
+    np.add.at(sums, (entry_index, np.array(denom_currency, dtype=np.int64)[denom_index]), amounts)
+
+    # omit currencies with super tiny amounts
+    out = [{} for _ in range(num_entries)]
+    rows, cols = np.nonzero(sums >= TINY_AMOUNT)
+    for i, j, amount in zip(rows.tolist(), cols.tolist(), sums[rows, cols].tolist()):
+        out[i][currencies[j]] = amount
+    return out
+
+
+def _currency_divisor(denom, lcd_node, ticker):
+    """ Returns (currency, divisor) such that amount = amount_raw / divisor (divisor None if not a power of ten) """
+    amount, currency = _amount_currency(1.0, denom, lcd_node, ticker)
+    if amount > 0:
+        exponent = round(-math.log10(amount))
+        if exponent >= 0 and 1.0 / float(10 ** exponent) == amount:
+            return currency, float(10 ** exponent)
+    return currency, None
 
 
 def _amount_currency(amount_raw, denom, lcd_node, ticker):
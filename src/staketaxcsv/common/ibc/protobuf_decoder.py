@@ -283,3 +283,110 @@ class ProtobufParser:
             raise EOFError("unexpected end of byte sequence while reading protobuf")
 
         return bytes_read
+
+
+# Field numbers on the path TxRaw.auth_info_bytes -> AuthInfo.fee -> Fee.amount (repeated Coin) -> Coin.denom/amount.
+# Same path as CosmosTransactionFeeExtractor.coin_message_base_path.
+_FEE_PATH = (2, 2, 1)
+_COIN_DENOM = 1
+_COIN_AMOUNT = 2
+
+
+def _read_varint(buf: memoryview, pos: int, end: int) -> Tuple[int, int]:
+    """ Returns (value, offset after varint) for the varint at <pos>. """
+    if pos >= end:
+        raise EOFError("unexpected end of byte sequence while parsing varint")
+    byte = buf[pos]
+    pos += 1
+    if byte < 0x80:
+        return byte, pos
+
+    value = byte & 0x7f
+    shift = 7
+    while True:
+        if pos >= end:
+            raise EOFError("unexpected end of byte sequence while parsing varint")
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _skip_field(buf: memoryview, pos: int, end: int, wire_type: int) -> int:
+    """ Returns offset after the value of a field that isn't needed, without decoding it. """
+    if wire_type == 0:
+        _, pos = _read_varint(buf, pos, end)
+    elif wire_type == 2:
+        length, pos = _read_varint(buf, pos, end)
+        pos += length
+    elif wire_type == 1:
+        pos += 8
+    elif wire_type == 5:
+        pos += 4
+    elif wire_type in (3, 4):
+        raise NotImplementedError("The start and end group wire types are deprecated and not supported")
+    else:
+        raise RuntimeError(f"Unknown wire type found [{wire_type}]")
+
+    if pos > end:
+        raise EOFError("unexpected end of byte sequence while reading protobuf")
+    return pos
+
+
+def _find_messages(buf: memoryview, pos: int, end: int, field_number: int):
+    """ Yields (start, end) offsets of each length delimited <field_number> in buf[pos:end]. """
+    while pos < end:
+        key, pos = _read_varint(buf, pos, end)
+        wire_type = key & 0x07
+        if wire_type == 2 and key >> 3 == field_number:
+            length, pos = _read_varint(buf, pos, end)
+            if pos + length > end:
+                raise EOFError("unexpected end of byte sequence while reading protobuf")
+            yield pos, pos + length
+            pos += length
+        else:
+            pos = _skip_field(buf, pos, end, wire_type)
+
+
+def decode_fee(tx_bytes) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Returns (fee denom, fee amount) of a protobuf encoded cosmos TxRaw (bytes, bytearray, or memoryview).
+
+    Same result as ProtobufParser with CosmosTransactionFeeExtractor (i.e. last coin if fee has several, (None, None)
+    if no fee), but works on offsets into a memoryview and skips other fields (body, signatures, signer infos)
+    by length instead of walking them.
+    """
+    buf = memoryview(tx_bytes)
+    fee_denom = None
+    fee_amount = None
+
+    auth_info_field, fee_field, coin_field = _FEE_PATH
+    for auth_info_start, auth_info_end in _find_messages(buf, 0, len(buf), auth_info_field):
+        for fee_start, fee_end in _find_messages(buf, auth_info_start, auth_info_end, fee_field):
+            for coin_start, coin_end in _find_messages(buf, fee_start, fee_end, coin_field):
+                pos = coin_start
+                while pos < coin_end:
+                    key, pos = _read_varint(buf, pos, coin_end)
+                    wire_type = key & 0x07
+                    field_number = key >> 3
+                    if wire_type == 2 and field_number in (_COIN_DENOM, _COIN_AMOUNT):
+                        length, pos = _read_varint(buf, pos, coin_end)
+                        if pos + length > coin_end:
+                            raise EOFError("unexpected end of byte sequence while reading protobuf")
+                        value = str(buf[pos:pos + length], "utf-8")
+                        pos += length
+                        if field_number == _COIN_DENOM:
+                            fee_denom = value
+                        else:
+                            fee_amount = value
+                    else:
+                        pos = _skip_field(buf, pos, coin_end, wire_type)
+
+    return fee_denom, fee_amount
+
+
+def decode_fees(list_tx_bytes) -> List[Tuple[Optional[str], Optional[str]]]:
+    """ Batch version of decode_fee(), i.e. for a page of rpc transactions. """
+    return [decode_fee(tx_bytes) for tx_bytes in list_tx_bytes]
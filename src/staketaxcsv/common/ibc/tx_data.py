@@ -8,6 +8,7 @@ import logging
 
 from staketaxcsv.common.ibc import api_mintscan_v1, api_lcd, api_rpc, api_rpc_multinode
 from staketaxcsv.common.ibc.api_mintscan_v1 import MintscanAPI
+from staketaxcsv.common.ibc.block_heights import height_range
 
 
 class TxDataLcd:
@@ -21,22 +22,35 @@ class TxDataLcd:
     def get_tx(self, txid):
         return self.api.get_tx(txid)
 
-    def get_txs_all(self, address, progress, start_date=None, end_date=None):
-        # only include optional parameter limit if defined
-        kwargs = {}
+    def get_txs_all(self, address, progress, start_date=None, end_date=None, min_height=None):
+        # only include optional parameters if defined
+        kwargs = self._height_kwargs(start_date, end_date, min_height)
         if self.limit_per_query:
             kwargs["limit"] = self.limit_per_query
 
         return api_lcd.get_txs_all(self.lcd_node, address, self.max_txs, progress=progress, **kwargs)
 
     def get_txs_pages_count(self, address, start_date=None, end_date=None):
-        # only include optional parameter limit if defined
-        kwargs = {}
+        # only include optional parameters if defined
+        kwargs = self._height_kwargs(start_date, end_date)
         if self.limit_per_query:
             kwargs["limit"] = self.limit_per_query
 
         return api_lcd.get_txs_pages_count(self.lcd_node, address, self.max_txs, **kwargs)
 
+    def _height_kwargs(self, start_date, end_date, min_height=None):
+        """ Returns min_height (exclusive) / max_height (inclusive) kwargs for dates and/or min_height """
+        kwargs = {}
+        if start_date or end_date:
+            start_height, end_height = height_range(self.api, start_date, end_date)
+            if start_height:
+                min_height = max(min_height or 0, start_height - 1)
+            if end_height:
+                kwargs["max_height"] = end_height
+        if min_height:
+            kwargs["min_height"] = min_height
+        return kwargs
+
 
 class TxDataMintscan:
 
@@ -48,9 +62,10 @@ class TxDataMintscan:
     def get_tx(self, txid):
         return self.api.get_tx(txid)
 
-    def get_txs_all(self, address, progress, start_date=None, end_date=None):
+    def get_txs_all(self, address, progress, start_date=None, end_date=None, min_height=None):
         return api_mintscan_v1.get_txs_all(
-            self.ticker, address, self.max_txs, progress=progress, start_date=start_date, end_date=end_date)
+            self.ticker, address, self.max_txs, progress=progress, start_date=start_date, end_date=end_date,
+            min_height=min_height)
 
     def get_txs_pages_count(self, address, start_date=None, end_date=None):
         return api_mintscan_v1.get_txs_page_count(
@@ -66,10 +81,13 @@ class TxDataRpc:
     def get_tx(self, txid):
         return api_rpc_multinode.get_tx(self.rpc_nodes, txid)
 
-    def get_txs_all(self, address, progress_rpc, limit=api_rpc.TXS_LIMIT_PER_QUERY):
+    def get_txs_all(self, address, progress_rpc, limit=api_rpc.TXS_LIMIT_PER_QUERY, start_date=None, end_date=None):
         return api_rpc_multinode.get_txs_all(
-            self.rpc_nodes, address, self.max_txs, progress_rpc=progress_rpc, limit=limit)
+            self.rpc_nodes, address, self.max_txs, progress_rpc=progress_rpc, limit=limit,
+            start_date=start_date, end_date=end_date)
 
-    def get_txs_pages_count(self, address, progress_rpc=None, limit=api_rpc.TXS_LIMIT_PER_QUERY):
+    def get_txs_pages_count(self, address, progress_rpc=None, limit=api_rpc.TXS_LIMIT_PER_QUERY,
+                            start_date=None, end_date=None):
         return api_rpc_multinode.get_txs_pages_count(
-            self.rpc_nodes, address, self.max_txs, progress_rpc=progress_rpc, limit=limit)
+            self.rpc_nodes, address, self.max_txs, progress_rpc=progress_rpc, limit=limit,
+            start_date=start_date, end_date=end_date)
@@ -34,6 +34,27 @@ def remove_duplicates(elems, tx_hash_key="txhash", timestamp_sort=True):
     return out
 
 
+def reached_height(elems, min_height):
+    """ True if page of txs (newest first) reaches back to min_height (i.e. remaining pages already seen). """
+    if not min_height:
+        return False
+    return any(int(elem["height"]) <= min_height for elem in elems)
+
+
+def filter_newer(elems, min_height):
+    """ Returns txs with height > min_height """
+    if not min_height:
+        return elems
+    return [elem for elem in elems if int(elem["height"]) > min_height]
+
+
+def filter_older(elems, max_height):
+    """ Returns txs with height <= max_height """
+    if not max_height:
+        return elems
+    return [elem for elem in elems if int(elem["height"]) <= max_height]
+
+
 def aggregate_transfers(transfers_list):
     sums_by_currency = defaultdict(float)
 
@@ -1,4 +1,5 @@
 import logging
+import threading
 import time
 
 
@@ -21,9 +22,11 @@ class Progress:
         self.time_start = time.time()
         self.stages = {}
         self.localconfig = localconfig
+        self.lock = threading.Lock()  # stages may be reported from several threads (i.e. one per rpc node)
 
     def add_stage(self, stage_name, num_tasks, seconds_per_task):
-        self.stages[stage_name] = Stage(num_tasks, seconds_per_task)
+        with self.lock:
+            self.stages[stage_name] = Stage(num_tasks, seconds_per_task)
 
     def report_message(self, message):
         if self.localconfig.job:
@@ -31,14 +34,15 @@ class Progress:
         logging.info({"message": message})
 
     def report(self, num, message, stage_name="default"):
-        if stage_name in self.stages:
-            stage = self.stages[stage_name]
-            stage.update_task_number(num)
-        else:
-            logging.critical(f"Bad stage={stage_name} in {type(self).__name__}.report()")
-            return
-
-        seconds_left = sum(stage.seconds_remaining() for stage in self.stages.values())
+        with self.lock:
+            if stage_name in self.stages:
+                stage = self.stages[stage_name]
+                stage.update_task_number(num)
+            else:
+                logging.critical(f"Bad stage={stage_name} in {type(self).__name__}.report()")
+                return
+
+            seconds_left = sum(stage.seconds_remaining() for stage in self.stages.values())
 
         # Write to db
         if self.localconfig.job:
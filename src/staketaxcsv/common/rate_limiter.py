@@ -0,0 +1,71 @@
+"""
+Thread-safe request rate limiting, shared by all api objects talking to the same node.
+
+usage:
+    RateLimiter.for_node(node).wait()   # call before each request to node
+
+Token bucket: on average <requests_per_second>, with up to <burst> requests allowed back to back.
+
+Limits are per process, unless share_across_processes() is called in each process (i.e. batch.py worker processes),
+in which case node limits are shared by all those processes.
+
+"""
+
+import threading
+import time
+
+from staketaxcsv.settings_csv import NODE_REQUESTS_PER_SECOND
+
+
+class RateLimiter:
+
+    # node url -> RateLimiter
+    _limiters = {}
+    _limiters_lock = threading.Lock()
+
+    # node url -> next request time, shared with other processes (multiprocessing.Manager dict and lock)
+    _shared_next_times = None
+    _shared_lock = None
+
+    def __init__(self, requests_per_second, burst=1, key=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.tolerance = (max(burst, 1) - 1) * self.interval
+        self.key = key
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def share_across_processes(cls, next_times, lock):
+        """ Use next_times (Manager().dict()) and lock (Manager().Lock()) for node limiters in this process. """
+        cls._shared_next_times = next_times
+        cls._shared_lock = lock
+
+    @classmethod
+    def for_node(cls, node, requests_per_second=None, burst=1):
+        """ Returns the RateLimiter shared by all callers of <node> (created on first use). """
+        with cls._limiters_lock:
+            if node not in cls._limiters:
+                rps = requests_per_second if requests_per_second is not None else NODE_REQUESTS_PER_SECOND
+                cls._limiters[node] = RateLimiter(rps, burst, key=node)
+            return cls._limiters[node]
+
+    def wait(self):
+        """ Blocks until the next request slot is available. """
+        if not self.interval:
+            return
+
+        with self._lock:
+            if self.key and RateLimiter._shared_next_times is not None:
+                # time.monotonic() is system-wide, so comparable across processes
+                with RateLimiter._shared_lock:
+                    now = time.monotonic()
+                    slot = max(now, RateLimiter._shared_next_times.get(self.key, 0.0))
+                    RateLimiter._shared_next_times[self.key] = slot + self.interval
+            else:
+                now = time.monotonic()
+                slot = max(now, self._next_time)
+                self._next_time = slot + self.interval
+            delay = slot - self.tolerance - now
+
+        if delay > 0:
+            time.sleep(delay)
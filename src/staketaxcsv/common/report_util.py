@@ -1,19 +1,22 @@
 import argparse
 import datetime
 import logging
-import os
 
 import staketaxcsv.api
 from staketaxcsv.common.ExporterTypes import (
-    FORMAT_DEFAULT, FORMATS, LP_TREATMENT_CHOICES, LP_TREATMENT_TRANSFERS)
+    FORMAT_DEFAULT, FORMATS, FORMATS_OPTIONAL, LP_TREATMENT_CHOICES, LP_TREATMENT_TRANSFERS)
 from staketaxcsv.common.BalExporter import BALANCES_HISTORICAL
 from staketaxcsv.settings_csv import (
-    REPORTS_DIR, TICKER_AKT, TICKER_ALGO, TICKER_ARCH, TICKER_ATOM, TICKER_COSMOSPLUS,
-    TICKER_EVMOS, TICKER_JUNO, TICKER_LUNA1, TICKER_LUNA2, TICKER_OSMO, TICKER_SAGA, TICKER_SOL, TICKER_STRD, TICKER_TIA)
+    REPORTS_DIR, TICKER_AKT, TICKER_ALGO, TICKER_ARCH, TICKER_ATOM, TICKER_BLD, TICKER_COSMOSPLUS, TICKER_DYDX,
+    TICKER_EVMOS, TICKER_GRAV, TICKER_INJ, TICKER_JUNO, TICKER_LUNA1, TICKER_LUNA2, TICKER_NTRN, TICKER_OSMO,
+    TICKER_SAGA, TICKER_SOL, TICKER_STARS, TICKER_STRD, TICKER_TIA)
 from staketaxcsv import settings_csv
 
+# reports supporting --incremental (see common/checkpoint.py)
+TICKERS_INCREMENTAL = [TICKER_AKT, TICKER_ARCH, TICKER_ATOM, TICKER_DYDX, TICKER_EVMOS, TICKER_INJ,
+                       TICKER_JUNO, TICKER_NTRN, TICKER_OSMO, TICKER_STRD]
+
 ALL = "all"
-STAKETAX_DEBUG_CACHE = "STAKETAX_DEBUG_CACHE"
 STAKETAX_CACHE = "STAKETAX_CACHE"
 
 
@@ -48,7 +51,7 @@ def parse_args(ticker):
         "--format",
         type=str,
         default=FORMAT_DEFAULT,
-        choices=[ALL] + FORMATS,
+        choices=[ALL] + FORMATS + FORMATS_OPTIONAL,
     )
     parser.add_argument(
         "--txid",
@@ -68,15 +71,18 @@ def parse_args(ticker):
         default=False,
     )
     parser.add_argument(
+        "--response_cache",
         "--debug_cache",
+        dest="response_cache",
         action="store_true",
         default=False,
+        help="Use persistent http response cache (overrides environment RESPONSE_CACHE)",
     )
     parser.add_argument(
         "--dbcache",
         action="store_true",
         default=False,
-        help="Force use db Cache class (requires dynamodb and overrides environment DB_CACHE)",
+        help="Force use db Cache class (backend STAKETAX_DB_CACHE_BACKEND; overrides environment DB_CACHE)",
     )
     parser.add_argument(
         "--no_dbcache",
@@ -94,8 +100,8 @@ def parse_args(ticker):
         type=str,
         help="Path to the Koinly NullMap json file",
     )
-    if ticker in [TICKER_AKT, TICKER_ALGO, TICKER_ARCH, TICKER_ATOM, TICKER_EVMOS,
-                  TICKER_JUNO, TICKER_SAGA, TICKER_STRD, TICKER_SOL, TICKER_TIA]:
+    if ticker in [TICKER_AKT, TICKER_ALGO, TICKER_ARCH, TICKER_ATOM, TICKER_BLD, TICKER_EVMOS, TICKER_GRAV,
+                  TICKER_JUNO, TICKER_SAGA, TICKER_STARS, TICKER_STRD, TICKER_SOL, TICKER_TIA]:
         parser.add_argument(
             "--start_date",
             type=str,
@@ -114,6 +120,13 @@ def parse_args(ticker):
             help="Treat LP deposits/withdrawals as transfers(default), omit, or trades. "
                  "Not applicable to CSV formats with native LP transactions.",
         )
+    if ticker in TICKERS_INCREMENTAL:
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            default=False,
+            help="Only fetch/process transactions newer than previous --incremental run (stored checkpoint)",
+        )
     if ticker in [TICKER_ALGO]:
         parser.add_argument(
             "--exclude_asas",
@@ -179,8 +192,8 @@ def parse_args(ticker):
     if args.debug:
         options["debug"] = True
         logging.basicConfig(level=logging.DEBUG)
-    if args.debug_cache:
-        os.environ[STAKETAX_DEBUG_CACHE] = "1"
+    if args.response_cache:
+        settings_csv.RESPONSE_CACHE = True
     if args.dbcache:
         settings_csv.DB_CACHE = True
     if args.no_dbcache:
@@ -199,6 +212,8 @@ def parse_args(ticker):
         options["lp_treatment"] = args.lp_treatment
     if "exclude_asas" in args and args.exclude_asas:
         options["exclude_asas"] = args.exclude_asas
+    if "incremental" in args and args.incremental:
+        options["incremental"] = True
     if "track_block" in args and args.track_block:
         options["track_block"] = True
     if "cosmosplus_node" in args:
@@ -222,3 +237,4 @@ def read_common_options(localconfig, options):
     localconfig.debug = options.get("debug", False)
     localconfig.limit = options.get("limit", localconfig.limit)
     localconfig.koinlynullmap = options.get("koinlynullmap", localconfig.koinlynullmap)
+    localconfig.incremental = options.get("incremental", False)
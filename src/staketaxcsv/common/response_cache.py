@@ -0,0 +1,174 @@
+"""
+Persistent http response cache (sqlite), shared by all api classes.
+
+  * Enabled when STAKETAX_RESPONSE_CACHE=1 in environment (or --response_cache).
+  * Each response is stored under sha256(function name, node/instance key, call arguments).
+  * Immutable responses (i.e. finalized txs, pages behind a pagination cursor) are kept forever.
+    Mutable responses (i.e. pagination heads, account state) expire after RESPONSE_CACHE_TTL_SECONDS.
+
+usage:
+    @response_cache(ttl=_ttl_txs, instance_key=lambda api: api.node)
+    def _get_txs(self, wallet_address, ...):
+        ...
+
+  where ttl is seconds, TTL_FOREVER, or function (call_args, result) -> seconds | TTL_FOREVER | None (default ttl)
+  | 0 (do not store, i.e. error responses).
+
+  Batched requests can share the cache of the single request function via _get_txs.lookup(...) and
+  _get_txs.store(result, ...).
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from staketaxcsv import settings_csv
+
+TTL_FOREVER = -1
+FIRST_ARG_NAMES = ("self", "cls")
+
+
+def response_cache(ttl=None, instance_key=None):
+
+    def inner(func):
+        signature = inspect.signature(func)
+        func_name = func.__qualname__
+
+        def _call_key(args, kwargs):
+            call_args = _call_args(signature, args, kwargs)
+            key_args = dict(call_args)
+            first = next(iter(signature.parameters), None)
+            if first in FIRST_ARG_NAMES:
+                key_args[first] = instance_key(args[0]) if instance_key else None
+            return call_args, _key(func_name, key_args)
+
+        def lookup(*args, **kwargs):
+            """ Returns (found, result) of cached call, without calling func (i.e. for batched requests) """
+            if not settings_csv.RESPONSE_CACHE:
+                return False, None
+            _, key = _call_key(args, kwargs)
+            return ResponseCache.instance().get(key)
+
+        def store(result, *args, **kwargs):
+            """ Stores result of func(*args, **kwargs) obtained some other way (i.e. from batched request) """
+            if not settings_csv.RESPONSE_CACHE:
+                return
+            call_args, key = _call_key(args, kwargs)
+            _store(ResponseCache.instance(), key, call_args, result)
+
+        def _store(cache, key, call_args, result):
+            seconds = ttl(call_args, result) if callable(ttl) else ttl
+            if seconds is None:
+                seconds = settings_csv.RESPONSE_CACHE_TTL_SECONDS
+            if result is not None and seconds:
+                cache.set(key, func_name, result, seconds)
+
+        # Note: inner function name "wrapper" is relied upon by mock data filenames in tests.
+        def wrapper(*args, **kwargs):
+            if not settings_csv.RESPONSE_CACHE:
+                return func(*args, **kwargs)
+
+            call_args, key = _call_key(args, kwargs)
+            cache = ResponseCache.instance()
+            found, result = cache.get(key)
+            if found:
+                logging.info("Loaded cached response for %s", func_name)
+                return result
+
+            result = func(*args, **kwargs)
+            _store(cache, key, call_args, result)
+            return result
+
+        wrapper.lookup = lookup
+        wrapper.store = store
+        return wrapper
+
+    return inner
+
+
+def _call_args(signature, args, kwargs):
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    call_args = dict(bound.arguments)
+
+    first = next(iter(signature.parameters), None)
+    if first in FIRST_ARG_NAMES:
+        del call_args[first]
+    return call_args
+
+
+def _key(func_name, key_args):
+    s = json.dumps([func_name, key_args], sort_keys=True, default=str)
+    return hashlib.sha256(s.encode()).hexdigest()
+
+
+class ResponseCache:
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "  key TEXT PRIMARY KEY, func TEXT, created_at REAL, expires_at REAL, data BLOB)")
+        conn.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+        conn.commit()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            path = settings_csv.RESPONSE_CACHE_PATH or os.path.join(settings_csv.REPORTS_DIR, "response_cache.db")
+            if cls._instance is None or cls._instance.path != path:
+                cls._instance = ResponseCache(path)
+            return cls._instance
+
+    def _conn(self):
+        # sqlite connections can't be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            dirname = os.path.dirname(self.path)
+            if dirname and not os.path.exists(dirname):
+                os.makedirs(dirname, exist_ok=True)
+
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """ Returns (found, result) """
+        row = self._conn().execute(
+            "SELECT expires_at, data FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False, None
+
+        expires_at, data = row
+        if expires_at is not None and expires_at < time.time():
+            return False, None
+        return True, json.loads(zlib.decompress(data))
+
+    def set(self, key, func_name, result, ttl):
+        now = time.time()
+        expires_at = None if ttl == TTL_FOREVER else now + ttl
+        data = zlib.compress(json.dumps(result).encode())
+
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, func, created_at, expires_at, data) VALUES (?, ?, ?, ?, ?)",
+            (key, func_name, now, expires_at, data))
+        conn.commit()
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM responses")
+        conn.commit()
@@ -1,11 +1,14 @@
 import logging
 
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 from staketaxcsv.cosmosplus.config_cosmosplus import localconfig
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(localconfig.node, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
@@ -1,3 +1,4 @@
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 import staketaxcsv.dvpn.constants as co
@@ -28,6 +29,8 @@ def process_usage_payments(wallet_address, exporter):
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(DVPN_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
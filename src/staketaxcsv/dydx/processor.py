@@ -1,6 +1,7 @@
 import logging
 
 import staketaxcsv.dydx.constants as co
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 from staketaxcsv.dydx.config_dydx import localconfig
@@ -9,6 +10,8 @@ from staketaxcsv.dydx import handle
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(DYDX_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
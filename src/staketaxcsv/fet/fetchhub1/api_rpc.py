@@ -7,15 +7,19 @@ from urllib.parse import urlencode
 
 import requests
 from dateutil import parser
-from staketaxcsv.common.debug_util import debug_cache
+from staketaxcsv.common.response_cache import response_cache, TTL_FOREVER
 from staketaxcsv.common.ibc.constants import (
     EVENTS_TYPE_SENDER, EVENTS_TYPE_RECIPIENT, EVENTS_TYPE_SIGNER, EVENTS_TYPE_LIST_DEFAULT)
 from staketaxcsv.fet.config_fet import localconfig
-from staketaxcsv.settings_csv import REPORTS_DIR
 
 TXS_LIMIT_PER_QUERY = 50
 
 
+def _ttl_archive(call_args, data):
+    # fetchhub-1 is a halted chain, so its data never changes
+    return TTL_FOREVER if "result" in data else 0
+
+
 class FetRpcAPI:
     session = requests.Session()
 
@@ -31,9 +35,9 @@ class FetRpcAPI:
             time.sleep(sleep_seconds)
         return response.json()
 
-    @debug_cache(REPORTS_DIR)
+    @response_cache(ttl=_ttl_archive)
     def _txs_search(self, wallet_address, events_type, page, per_page, node):
-        # Note unused node variable just a hack to make @use_debug_file work without modifications
+        # Note unused node variable is part of the response cache key
         uri_path = "/tx_search"
         query_params = {"page": page, "per_page": per_page}
         if events_type == EVENTS_TYPE_SENDER:
@@ -75,7 +79,7 @@ class FetRpcAPI:
         elem = data.get("result", None)
         return elem
 
-    @debug_cache(REPORTS_DIR)
+    @response_cache(ttl=_ttl_archive, instance_key=lambda api: api.node)
     def _block(self, height):
         uri_path = "/block"
         query_params = {"height": height}
@@ -1,6 +1,7 @@
 import logging
 
 import staketaxcsv.common.ibc.constants
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 import staketaxcsv.fet.constants as co
@@ -13,6 +14,8 @@ from staketaxcsv.settings_csv import FET_NODE
 
 
 def process_txs(wallet_address, elems, exporter, node, progress=None):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(FET_NODE, elems)
+
     for i, elem in enumerate(elems):
         process_tx(wallet_address, elem, exporter, node)
 
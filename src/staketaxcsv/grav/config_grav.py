@@ -3,4 +3,5 @@ from staketaxcsv.common.config import config
 
 class localconfig(config):
 
-    pass
+    start_date = None
+    end_date = None
@@ -1,5 +1,6 @@
 import logging
 
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 import staketaxcsv.huahua.constants as co
@@ -8,6 +9,8 @@ from staketaxcsv.settings_csv import HUAHUA_NODE
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(HUAHUA_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
@@ -1,6 +1,7 @@
 import logging
 
 import staketaxcsv.inj.constants as co
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 from staketaxcsv.inj.config_inj import localconfig
@@ -9,6 +10,8 @@ from staketaxcsv.inj import handle_deposit_claim, handle_send_to_eth
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(INJ_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
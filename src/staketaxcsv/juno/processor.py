@@ -1,5 +1,6 @@
 import logging
 
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 import staketaxcsv.juno.constants as co
@@ -11,6 +12,8 @@ CONTRACT_TRANSFER = ""
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(JUNO_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
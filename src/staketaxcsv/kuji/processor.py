@@ -1,5 +1,6 @@
 import logging
 
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 import staketaxcsv.kuji.constants as co
@@ -13,6 +14,8 @@ from staketaxcsv.settings_csv import KUJI_NODE
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(KUJI_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
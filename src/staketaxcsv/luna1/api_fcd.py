@@ -2,14 +2,20 @@ import logging
 import time
 
 import requests
-from staketaxcsv.common.debug_util import debug_cache
+from staketaxcsv.common.response_cache import response_cache, TTL_FOREVER
 from staketaxcsv.luna1.config_luna1 import localconfig
-from staketaxcsv.settings_csv import REPORTS_DIR
 
 FCD_URL = "https://terra-classic-fcd.publicnode.com"
 LIMIT_FCD = 100
 
 
+def _ttl_txs(call_args, data):
+    # offset is a cursor into older txs, so only the first page changes
+    if "txs" not in data:
+        return 0
+    return TTL_FOREVER if call_args["offset"] else None
+
+
 class FcdAPI:
     session = requests.Session()
 
@@ -22,7 +28,7 @@ class FcdAPI:
         return data
 
     @classmethod
-    @debug_cache(REPORTS_DIR)
+    @response_cache(ttl=_ttl_txs)
     def get_txs(cls, address, offset=None):
         url = "{}/v1/txs?account={}&limit={}".format(FCD_URL, address, LIMIT_FCD)
         if offset:
@@ -1,6 +1,7 @@
 import logging
 
 from staketaxcsv.settings_csv import TICKER_LUNA2
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 import staketaxcsv.common.make_tx
@@ -24,6 +25,8 @@ CONTRACTS_USE_SECOND_MESSAGE = set([
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(LUNA2_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
@@ -1,6 +1,7 @@
 import logging
 
 import staketaxcsv.ntrn.constants as co
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 from staketaxcsv.ntrn.config_ntrn import localconfig
@@ -11,6 +12,8 @@ import staketaxcsv.ntrn.vote
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(NTRN_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
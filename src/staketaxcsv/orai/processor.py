@@ -2,6 +2,7 @@ import logging
 import pprint
 
 import staketaxcsv.orai.constants as co
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 from staketaxcsv.orai.config_orai import localconfig
@@ -37,6 +38,8 @@ def calculate_amount(amount_raw, denom):
         return 0
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(ORAI_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
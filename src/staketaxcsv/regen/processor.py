@@ -1,4 +1,5 @@
 import logging
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.processor
 import staketaxcsv.regen.constants as co
 import staketaxcsv.common.ibc.processor
@@ -8,6 +9,8 @@ from staketaxcsv.settings_csv import REGEN_NODE
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(REGEN_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
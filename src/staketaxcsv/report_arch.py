@@ -10,6 +10,7 @@ import staketaxcsv.arch.processor
 from staketaxcsv.common.ibc import api_lcd, historical_balances
 from staketaxcsv.arch.config_arch import localconfig
 from staketaxcsv.common import report_util
+from staketaxcsv.common.checkpoint import Checkpoint
 from staketaxcsv.common.Cache import Cache
 from staketaxcsv.common.Exporter import Exporter
 from staketaxcsv.settings_csv import ARCH_NODE, TICKER_ARCH, MINTSCAN_ON
@@ -59,16 +60,19 @@ def txhistory(wallet_address):
     progress = ProgressMintScan(localconfig)
     exporter = Exporter(wallet_address, localconfig, TICKER_ARCH)
     txdata = _txdata()
+    checkpoint = Checkpoint(localconfig, TICKER_ARCH, wallet_address)
+    checkpoint.restore(exporter)
 
     # Fetch count of transactions to estimate progress more accurately
     count_pages = txdata.get_txs_pages_count(wallet_address, start_date, end_date)
     progress.set_estimate(count_pages)
 
     # Fetch transactions
-    elems = txdata.get_txs_all(wallet_address, progress, start_date, end_date)
+    elems = txdata.get_txs_all(wallet_address, progress, start_date, end_date, min_height=checkpoint.height)
 
     progress.report_message(f"Processing {len(elems)} transactions... ")
     staketaxcsv.arch.processor.process_txs(wallet_address, elems, exporter)
+    checkpoint.save(exporter, elems)
 
     return exporter
 
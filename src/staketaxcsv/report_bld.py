@@ -26,6 +26,8 @@ def main():
 
 def read_options(options):
     report_util.read_common_options(localconfig, options)
+    localconfig.start_date = options.get("start_date", None)
+    localconfig.end_date = options.get("end_date", None)
     logging.info("localconfig: %s", localconfig.__dict__)
 
 
@@ -48,7 +50,9 @@ def txone(wallet_address, txid):
 
 
 def estimate_duration(wallet_address):
-    num_pages, num_txs = _txdata().get_txs_pages_count(wallet_address, progress_rpc=None, limit=LIMIT_TXS_PER_QUERY)
+    start_date, end_date = localconfig.start_date, localconfig.end_date
+    num_pages, num_txs = _txdata().get_txs_pages_count(
+        wallet_address, progress_rpc=None, limit=LIMIT_TXS_PER_QUERY, start_date=start_date, end_date=end_date)
     return SECONDS_PER_PAGE * num_pages + SECONDS_PER_TX * num_txs
 
 
@@ -58,12 +62,15 @@ def txhistory(wallet_address):
     progress = ProgressBld()
     exporter = Exporter(wallet_address, localconfig, TICKER_BLD)
     txdata = _txdata()
+    start_date, end_date = localconfig.start_date, localconfig.end_date
 
     # Fetch count of transactions to estimate progress more accurately
-    txdata.get_txs_pages_count(wallet_address, progress_rpc=progress, limit=LIMIT_TXS_PER_QUERY)
+    txdata.get_txs_pages_count(
+        wallet_address, progress_rpc=progress, limit=LIMIT_TXS_PER_QUERY, start_date=start_date, end_date=end_date)
 
     # Fetch transactions
-    elems = txdata.get_txs_all(wallet_address, progress_rpc=progress, limit=LIMIT_TXS_PER_QUERY)
+    elems = txdata.get_txs_all(
+        wallet_address, progress_rpc=progress, limit=LIMIT_TXS_PER_QUERY, start_date=start_date, end_date=end_date)
 
     progress.report_message(f"Processing {len(elems)} transactions... ")
     staketaxcsv.bld.processor.process_txs(wallet_address, elems, exporter)
@@ -14,6 +14,7 @@ import staketaxcsv.evmos.processor
 from staketaxcsv.common.address import evmo_addrs
 from staketaxcsv.common.ibc import api_lcd, historical_balances
 from staketaxcsv.common import report_util
+from staketaxcsv.common.checkpoint import Checkpoint
 from staketaxcsv.common.Exporter import Exporter
 from staketaxcsv.evmos.config_evmos import localconfig
 from staketaxcsv.settings_csv import EVMOS_NODE, TICKER_EVMOS, MINTSCAN_ON
@@ -74,16 +75,19 @@ def txhistory(wallet_address):
     progress = ProgressMintScan(localconfig)
     exporter = Exporter(wallet_address, localconfig, TICKER_EVMOS)
     txdata = _txdata()
+    checkpoint = Checkpoint(localconfig, TICKER_EVMOS, wallet_address)
+    checkpoint.restore(exporter)
 
     # Fetch count of transactions to estimate progress more accurately
     count_pages = txdata.get_txs_pages_count(wallet_address, start_date, end_date)
     progress.set_estimate(count_pages)
 
     # Fetch transactions
-    elems = txdata.get_txs_all(wallet_address, progress, start_date, end_date)
+    elems = txdata.get_txs_all(wallet_address, progress, start_date, end_date, min_height=checkpoint.height)
 
     progress.report_message(f"Processing {len(elems)} transactions... ")
     staketaxcsv.evmos.processor.process_txs(wallet_address, elems, exporter)
+    checkpoint.save(exporter, elems)
 
     return exporter
 
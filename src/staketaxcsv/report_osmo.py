@@ -11,6 +11,7 @@ import pprint
 import staketaxcsv.osmo.api_data
 import staketaxcsv.osmo.processor
 from staketaxcsv.common import report_util
+from staketaxcsv.common.checkpoint import Checkpoint
 from staketaxcsv.common.Cache import Cache
 from staketaxcsv.common.ErrorCounter import ErrorCounter
 from staketaxcsv.common.Exporter import Exporter
@@ -82,6 +83,8 @@ def txhistory(wallet_address):
     progress = ProgressOsmo(localconfig)
     exporter = Exporter(wallet_address, localconfig, TICKER_OSMO)
     txdata = _txdata()
+    checkpoint = Checkpoint(localconfig, TICKER_OSMO, wallet_address)
+    checkpoint.restore(exporter)
 
     # Set time estimates for progress indicator
     count_pages = txdata.get_txs_pages_count(wallet_address, start_date, end_date)
@@ -92,7 +95,7 @@ def txhistory(wallet_address):
     logging.info("pages: %s, reward_tokens: %s", count_pages, reward_tokens)
 
     # Fetch transactions
-    elems = txdata.get_txs_all(wallet_address, progress, start_date, end_date)
+    elems = txdata.get_txs_all(wallet_address, progress, start_date, end_date, min_height=checkpoint.height)
 
     # Update time estimate after getting exact number of transactions
     progress.set_estimate_process_transactions_stage(len(elems))
@@ -100,6 +103,7 @@ def txhistory(wallet_address):
     # Process transactions
     progress.report_message(f"Processing {len(elems)} transactions... ")
     staketaxcsv.osmo.processor.process_txs(wallet_address, elems, exporter, progress=progress)
+    checkpoint.save(exporter, elems)
 
     # Fetch & process LP rewards data
     lp_rewards(wallet_address, exporter, progress)
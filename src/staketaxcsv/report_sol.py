@@ -6,14 +6,16 @@ Prints transactions and writes CSV(s) to _reports/SOL*.csv
 
 import logging
 import pprint
-import time
 
 
 import staketaxcsv.sol.processor
 from staketaxcsv.common import report_util
+from staketaxcsv.common.concurrent_util import run_pipelined
 from staketaxcsv.common.ErrorCounter import ErrorCounter
 from staketaxcsv.common.Exporter import Exporter
-from staketaxcsv.settings_csv import MESSAGE_ADDRESS_NOT_FOUND, MESSAGE_STAKING_ADDRESS_FOUND, SOL_NODE, TICKER_SOL
+from staketaxcsv.settings_csv import (
+    MESSAGE_ADDRESS_NOT_FOUND, MESSAGE_STAKING_ADDRESS_FOUND, SOL_NODE, SOL_RPC_BATCH_SIZE, SOL_RPC_MAX_WORKERS,
+    TICKER_SOL)
 from staketaxcsv.sol import staking_rewards
 from staketaxcsv.sol.api_rpc import RpcAPI
 from staketaxcsv.sol.config_sol import localconfig
@@ -113,7 +115,7 @@ def txhistory(wallet_address):
     ########################################################################
 
     # Transactions data
-    _fetch_and_process_txs(txids, wallet_info, exporter, progress, sleep_seconds=SECONDS_PER_TX)
+    _fetch_and_process_txs(txids, wallet_info, exporter, progress)
 
     # Update progress indicator
     progress.update_estimate(len(wallet_info.get_staking_addresses()))
@@ -135,20 +137,23 @@ def txhistory(wallet_address):
     return exporter
 
 
-def _fetch_and_process_txs(txids, wallet_info, exporter, progress=None, sleep_seconds=5):
+def _fetch_and_process_txs(txids, wallet_info, exporter, progress=None):
     total_count = len(txids)
 
-    for i, txid in enumerate(txids):
-        elem = RpcAPI.fetch_tx(txid)
-        staketaxcsv.sol.processor.process_tx(wallet_info, exporter, txid, elem)
-
-        if progress and i % 10 == 0:
-            # Update progress to db every so often for user
-            message = f"Fetched {i + 1} of {total_count} transactions"
-            progress.report(i, message, "txs")
-        
-        if sleep_seconds:
-            time.sleep(sleep_seconds)
+    # Batches of txs are fetched concurrently (rate limited in RpcAPI), while fetched txs are processed in order.
+    batches = [txids[i:i + SOL_RPC_BATCH_SIZE] for i in range(0, total_count, SOL_RPC_BATCH_SIZE)]
+    results = run_pipelined(RpcAPI.fetch_txs, [(batch,) for batch in batches], SOL_RPC_MAX_WORKERS)
+
+    i = 0
+    for batch, elems in zip(batches, results):
+        for txid, elem in zip(batch, elems):
+            staketaxcsv.sol.processor.process_tx(wallet_info, exporter, txid, elem)
+
+            if progress and i % 10 == 0:
+                # Update progress to db every so often for user
+                message = f"Fetched {i + 1} of {total_count} transactions"
+                progress.report(i, message, "txs")
+            i += 1
 
     if progress:
         message = f"Finished fetching {total_count} transactions"
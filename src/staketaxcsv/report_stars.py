@@ -31,6 +31,8 @@ def main():
 def read_options(options):
     """ Configure localconfig based on options dictionary. """
     report_util.read_common_options(localconfig, options)
+    localconfig.start_date = options.get("start_date", None)
+    localconfig.end_date = options.get("end_date", None)
     logging.info("localconfig: %s", localconfig.__dict__)
 
 
@@ -53,7 +55,8 @@ def txone(wallet_address, txid):
 
 
 def estimate_duration(wallet_address):
-    num_pages, num_txs = _txdata().get_txs_pages_count(wallet_address)
+    start_date, end_date = localconfig.start_date, localconfig.end_date
+    num_pages, num_txs = _txdata().get_txs_pages_count(wallet_address, start_date=start_date, end_date=end_date)
     return SECONDS_PER_PAGE * num_pages + SECONDS_PER_TX * num_txs
 
 
@@ -62,12 +65,13 @@ def txhistory(wallet_address):
     progress = ProgressStars()
     exporter = Exporter(wallet_address, localconfig, TICKER_STARS)
     txdata = _txdata()
+    start_date, end_date = localconfig.start_date, localconfig.end_date
 
     # Fetch count of transactions to estimate progress beforehand
-    txdata.get_txs_pages_count(wallet_address, progress_rpc=progress)
+    txdata.get_txs_pages_count(wallet_address, progress_rpc=progress, start_date=start_date, end_date=end_date)
 
     # Fetch transactions
-    elems = txdata.get_txs_all(wallet_address, progress)
+    elems = txdata.get_txs_all(wallet_address, progress, start_date=start_date, end_date=end_date)
 
     progress.report_message(f"Processing {len(elems)} transactions... ")
     staketaxcsv.stars.processor.process_txs(wallet_address, elems, exporter)
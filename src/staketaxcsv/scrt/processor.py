@@ -1,5 +1,6 @@
 import logging
 
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 import staketaxcsv.scrt.constants as co
@@ -8,6 +9,8 @@ from staketaxcsv.scrt.config_scrt import localconfig
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(SCRT_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
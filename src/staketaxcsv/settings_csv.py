@@ -53,6 +53,37 @@ TORI_NODE = os.environ.get("STAKETAX_TORI_NODE", "")
 
 # ########## Optional environment variables ########################################################
 DB_CACHE = os.environ.get("STAKETAX_DB_CACHE", False)
+# Storage for DB_CACHE: dynamodb | sqlite | memory.  sqlite file default: <REPORTS_DIR>/cache.db
+DB_CACHE_BACKEND = os.environ.get("STAKETAX_DB_CACHE_BACKEND", "dynamodb")
+DB_CACHE_PATH = os.environ.get("STAKETAX_DB_CACHE_PATH", "")
+
+# Persistent http response cache (sqlite file), so that re-runs don't refetch history already seen.
+RESPONSE_CACHE = os.environ.get("STAKETAX_RESPONSE_CACHE", False)
+RESPONSE_CACHE_PATH = os.environ.get("STAKETAX_RESPONSE_CACHE_PATH", "")  # default: <REPORTS_DIR>/response_cache.db
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("STAKETAX_RESPONSE_CACHE_TTL_SECONDS", 3600))  # for mutable responses
+
+# Directory for checkpoints of incremental re-runs (--incremental).  Default: <REPORTS_DIR>/checkpoints
+CHECKPOINT_DIR = os.environ.get("STAKETAX_CHECKPOINT_DIR", "")
+
+# Max requests per second sent to any one node (shared by all threads in process)
+NODE_REQUESTS_PER_SECOND = float(os.environ.get("STAKETAX_NODE_REQUESTS_PER_SECOND", 4))
+# Max concurrent page requests when fetching transaction history from lcd node
+LCD_MAX_WORKERS = int(os.environ.get("STAKETAX_LCD_MAX_WORKERS", 4))
+# Max concurrent date windows when fetching transaction history from mintscan (1: one page at a time)
+MINTSCAN_MAX_WORKERS = int(os.environ.get("STAKETAX_MINTSCAN_MAX_WORKERS", 4))
+# Number of processes used to write CSV files when exporting all formats (1: write in this process)
+EXPORT_MAX_WORKERS = int(os.environ.get("STAKETAX_EXPORT_MAX_WORKERS", 1))
+# Number of processes used to decode rpc transactions while pages are still being fetched (1: decode in this process)
+RPC_NORMALIZE_MAX_WORKERS = int(os.environ.get("STAKETAX_RPC_NORMALIZE_MAX_WORKERS", 1))
+# Local sqlite store of each chain's ibc denom traces (file path), refreshed with new traces on each run
+IBC_DENOM_TRACES_DB = os.environ.get("STAKETAX_IBC_DENOM_TRACES_DB", "")
+
+# Solana rpc: max requests per second to SOL_NODE, txs per json-rpc batch request, and batch requests in flight.
+# Defaults are conservative for the public node; a private rpc node can use much higher values.
+_SOL_PUBLIC_NODE = "api.mainnet-beta.solana.com" in SOL_NODE
+SOL_REQUESTS_PER_SECOND = float(os.environ.get("STAKETAX_SOL_REQUESTS_PER_SECOND", 3 if _SOL_PUBLIC_NODE else 10))
+SOL_RPC_BATCH_SIZE = int(os.environ.get("STAKETAX_SOL_RPC_BATCH_SIZE", 1 if _SOL_PUBLIC_NODE else 20))
+SOL_RPC_MAX_WORKERS = int(os.environ.get("STAKETAX_SOL_RPC_MAX_WORKERS", 1 if _SOL_PUBLIC_NODE else 4))
 
 # ### One of below required for faster solana staking rewards history
 # (flipside free tier is sufficient; solscan api costs money; db method has issues after 12/2024)
@@ -60,6 +91,10 @@ DB_CACHE = os.environ.get("STAKETAX_DB_CACHE", False)
 SOL_REWARDS_SOLSCAN_API_TOKEN = os.environ.get("STAKETAX_SOL_REWARDS_SOLSCAN_API_TOKEN", "")
 SOL_REWARDS_FLIPSIDE_API_KEY = os.environ.get("STAKETAX_SOL_REWARDS_FLIPSIDE_API_KEY", "")
 SOL_REWARDS_USE_DB = os.environ.get("STAKETAX_SOL_REWARDS_USE_DB", False)
+# Local sqlite rewards store (file path), filled by "python3 staketaxcsv/sol/staking_rewards_local.py"
+SOL_REWARDS_LOCAL_DB = os.environ.get("STAKETAX_SOL_REWARDS_LOCAL_DB", "")
+# Solana epoch table (epoch, reward slot, timestamp) of epochs looked up via rpc.  Default: <REPORTS_DIR>/sol_epochs.csv
+SOL_EPOCHS_PATH = os.environ.get("STAKETAX_SOL_EPOCHS_PATH", "")
 
 # ###
 
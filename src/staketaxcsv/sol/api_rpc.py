@@ -4,11 +4,30 @@ from datetime import datetime, timezone
 import requests
 
 from staketaxcsv.common.query import post_with_retries
-from staketaxcsv.common.debug_util import debug_cache
-from staketaxcsv.settings_csv import REPORTS_DIR, SOL_NODE
+from staketaxcsv.common.rate_limiter import RateLimiter
+from staketaxcsv.common.response_cache import response_cache, TTL_FOREVER
+from staketaxcsv.settings_csv import SOL_NODE, SOL_REQUESTS_PER_SECOND, SOL_RPC_MAX_WORKERS
 from staketaxcsv.sol.config_sol import localconfig
 from staketaxcsv.sol.constants import BILLION, PROGRAMID_STAKE, PROGRAMID_TOKEN_ACCOUNTS, PROGRAMID_TOKEN_2022
 TOKEN_ACCOUNTS = {}
+TX_CONFIG = {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}
+INFLATION_REWARD_MAX_ADDRESSES = 100  # addresses per getInflationReward request
+
+
+def _ttl_finalized(call_args, data):
+    """ Finalized results (txs, rewards of completed epochs) never change.  Errors/missing results not cached. """
+    return TTL_FOREVER if data.get("result") is not None else 0
+
+
+def _ttl_result(call_args, data):
+    return None if data.get("result") is not None else 0
+
+
+def _ttl_txids(call_args, data):
+    # Signatures before a given signature never change; the first page is the head.
+    if data.get("result") is None:
+        return 0
+    return TTL_FOREVER if call_args["before"] else None
 
 
 class RpcAPI(object):
@@ -24,14 +43,41 @@ class RpcAPI(object):
             "id": myid
         }
 
+        cls._rate_limiter().wait()
         result = post_with_retries(cls.session, SOL_NODE, data, {}, retries=5, backoff_factor=5)
+        return result
 
-        if "api.mainnet-beta.solana.com" in SOL_NODE:
-            time.sleep(0.3)
-        else:
-            time.sleep(0.1)
+    @classmethod
+    def _fetch_batch(cls, method, list_params):
+        """ Sends one json-rpc batch request.  Returns responses in list_params order (None if missing). """
+        data = [
+            {
+                "method": method,
+                "jsonrpc": "2.0",
+                "params": params_list,
+                "id": i
+            }
+            for i, params_list in enumerate(list_params)
+        ]
 
-        return result
+        cls._rate_limiter().wait()
+        result = post_with_retries(cls.session, SOL_NODE, data, {}, retries=5, backoff_factor=5)
+
+        out = [None] * len(list_params)
+        if not isinstance(result, list):
+            # i.e. node does not support batch requests
+            logging.info("Unexpected result for batch request method=%s: %s", method, result)
+            return out
+
+        for elem in result:
+            i = elem.get("id")
+            if isinstance(i, int) and 0 <= i < len(out):
+                out[i] = elem
+        return out
+
+    @classmethod
+    def _rate_limiter(cls):
+        return RateLimiter.for_node(SOL_NODE, SOL_REQUESTS_PER_SECOND, burst=SOL_RPC_MAX_WORKERS)
 
     @classmethod
     def _fetch_with_retries(cls, method, params_list, retries=10, backoff_factor=0.2):
@@ -62,6 +108,56 @@ class RpcAPI(object):
         date_string = datetime.utcfromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
         return date_string
 
+    @classmethod
+    def get_slot(cls):
+        """ Returns latest finalized slot (None if unavailable) """
+        data = cls._fetch("getSlot", [{"commitment": "finalized"}])
+        return data.get("result")
+
+    @classmethod
+    def get_first_available_block(cls):
+        data = cls._fetch("getFirstAvailableBlock", [])
+        return data.get("result")
+
+    @classmethod
+    def get_block_at_or_after(cls, slot):
+        """ Returns first confirmed block (slot number) at or after slot, or None if none yet """
+        data = cls._get_blocks_with_limit(slot, 1)
+        result = data.get("result")
+        return result[0] if result else None
+
+    @classmethod
+    @response_cache(ttl=_ttl_result)
+    def _get_blocks_with_limit(cls, slot, limit):
+        return cls._fetch("getBlocksWithLimit", [int(slot), limit, {"commitment": "finalized"}])
+
+    @classmethod
+    def get_block_unix_time(cls, block):
+        """ Returns unix timestamp of block (None if not available) """
+        data = cls._get_block_time(block)
+        return data.get("result")
+
+    @classmethod
+    @response_cache(ttl=_ttl_finalized)
+    def _get_block_time(cls, block):
+        return cls._fetch("getBlockTime", [int(block)])
+
+    @classmethod
+    def get_block_first_signature(cls, block):
+        """ Returns signature of first transaction in block (None if not available) """
+        params_list = [
+            int(block),
+            {
+                "transactionDetails": "signatures",
+                "rewards": False,
+                "maxSupportedTransactionVersion": 0,
+            }
+        ]
+        data = cls._fetch("getBlock", params_list)
+        result = data.get("result") or {}
+        signatures = result.get("signatures")
+        return signatures[0] if signatures else None
+
     @classmethod
     def get_block_rewards(cls, slot):
         params_list = [
@@ -93,10 +189,10 @@ class RpcAPI(object):
         return out
 
     @classmethod
-    @debug_cache(REPORTS_DIR)
-    def _get_inflation_reward(cls, staking_address, epoch):
+    @response_cache(ttl=_ttl_finalized)
+    def _get_inflation_rewards(cls, staking_addresses, epoch):
         params_list = [
-            [staking_address],
+            staking_addresses,
             {
                 "epoch": epoch
             }
@@ -105,26 +201,26 @@ class RpcAPI(object):
         return data
 
     @classmethod
-    def get_inflation_reward(cls, staking_address, epoch):
-        data = cls._get_inflation_reward(staking_address, epoch)
-
-        logging.info("rpc get_inflation_reward for staking_address=%s, epoch=%s:", staking_address, epoch)
-        logging.info(data)
+    def get_inflation_rewards(cls, staking_addresses, epoch):
+        """
+        Returns dict of staking_address -> reward amount (None if no reward) in <epoch>, using one request per
+        INFLATION_REWARD_MAX_ADDRESSES addresses.
+        """
+        out = {}
+        for i in range(0, len(staking_addresses), INFLATION_REWARD_MAX_ADDRESSES):
+            addresses = list(staking_addresses[i:i + INFLATION_REWARD_MAX_ADDRESSES])
+            data = cls._get_inflation_rewards(addresses, epoch)
 
-        # Throttled at 1 req/sec, I think at rpc api level, but a tad unsure.
-        time.sleep(1)
+            logging.info("rpc get_inflation_rewards for %s staking addresses, epoch=%s:", len(addresses), epoch)
+            logging.info(data)
 
-        if not data or "result" not in data:
-            return None
+            result = data.get("result") if data else None
+            if result is None or len(result) != len(addresses):
+                result = [None] * len(addresses)
 
-        try:
-            val = data["result"][0]
-            if val:
-                amount = val["amount"] / BILLION
-                return amount
-        except KeyError:
-            pass
-        return None
+            for staking_address, val in zip(addresses, result):
+                out[staking_address] = val["amount"] / BILLION if val and "amount" in val else None
+        return out
 
     @classmethod
     def get_latest_epoch(cls):
@@ -144,7 +240,7 @@ class RpcAPI(object):
         return addresses
 
     @classmethod
-    @debug_cache(REPORTS_DIR)
+    @response_cache(ttl=_ttl_result)
     def _fetch_staking_addresses(cls, wallet_address):
         params_list = [
             PROGRAMID_STAKE,
@@ -163,11 +259,38 @@ class RpcAPI(object):
         return cls._fetch("getProgramAccounts", params_list)
 
     @classmethod
-    @debug_cache(REPORTS_DIR)
+    @response_cache(ttl=_ttl_finalized)
     def fetch_tx(cls, txid):
-        params_list = [txid, {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}]
+        params_list = [txid, TX_CONFIG]
         return cls._fetch("getTransaction", params_list)
 
+    @classmethod
+    def fetch_txs(cls, txids):
+        """ Returns fetch_tx() result for each txid.  Uncached txids are fetched in one json-rpc batch request. """
+        out = [None] * len(txids)
+        missing = []
+        for i, txid in enumerate(txids):
+            found, data = cls.fetch_tx.lookup(cls, txid)
+            if found:
+                out[i] = data
+            else:
+                missing.append(i)
+
+        if len(missing) > 1:
+            results = cls._fetch_batch("getTransaction", [[txids[i], TX_CONFIG] for i in missing])
+        else:
+            results = [None] * len(missing)
+
+        for i, data in zip(missing, results):
+            if data is None or "result" not in data:
+                # Missing from batch response or error (i.e. rate limited): retry as single request
+                data = cls.fetch_tx(txids[i])
+            else:
+                cls.fetch_tx.store(data, cls, txids[i])
+            out[i] = data
+
+        return out
+
     @classmethod
     def fetch_token_accounts(cls, wallet_address):
         if wallet_address in TOKEN_ACCOUNTS:
@@ -184,7 +307,7 @@ class RpcAPI(object):
         return result
 
     @classmethod
-    @debug_cache(REPORTS_DIR)
+    @response_cache(ttl=_ttl_result)
     def _fetch_token_accounts(cls, wallet_address, program_id):
         logging.info("Querying _fetch_token_accounts_()... wallet_address=%s, program_id=%s",
                      wallet_address, program_id)
@@ -279,7 +402,7 @@ class RpcAPI(object):
         return out, last_txid
 
     @classmethod
-    @debug_cache(REPORTS_DIR)
+    @response_cache(ttl=_ttl_txids)
     def _get_txids(cls, wallet_address, limit=None, before=None):
         config = {}
         if limit:
@@ -1,16 +1,19 @@
 import logging
 from datetime import datetime
 
+from staketaxcsv.common.concurrent_util import run_pipelined
 from staketaxcsv.sol.api_rpc import RpcAPI
 from staketaxcsv.sol.make_tx import make_sol_reward_tx
 from staketaxcsv.settings_csv import (
-    SOL_REWARDS_USE_DB, SOL_REWARDS_FLIPSIDE_API_KEY, SOL_REWARDS_SOLSCAN_API_TOKEN)
-from staketaxcsv.sol.staking_rewards_common import get_epochs_all, epoch_slot_and_time
+    SOL_REWARDS_USE_DB, SOL_REWARDS_FLIPSIDE_API_KEY, SOL_REWARDS_LOCAL_DB, SOL_REWARDS_SOLSCAN_API_TOKEN,
+    SOL_RPC_MAX_WORKERS)
+from staketaxcsv.sol.staking_rewards_common import get_epochs_all, epoch_time
 from staketaxcsv.sol.staking_rewards_db import StakingRewardsDB
+from staketaxcsv.sol.staking_rewards_local import StakingRewardsLocalDB
 from staketaxcsv.sol.api_marinade import MarinadeAPI
 from staketaxcsv.sol.constants import BILLION
-from staketaxcsv.sol.staking_rewards_flipside import fetch_rewards_flipside
-from staketaxcsv.sol.staking_rewards_solscan import fetch_rewards_solscan
+from staketaxcsv.sol.staking_rewards_flipside import fetch_rewards_flipside_addresses
+from staketaxcsv.sol.staking_rewards_solscan import fetch_rewards_solscan_addresses
 
 
 def reward_txs(wallet_info, exporter, progress, start_date=None, end_date=None):
@@ -18,11 +21,9 @@ def reward_txs(wallet_info, exporter, progress, start_date=None, end_date=None):
     staking_addresses = wallet_info.get_staking_addresses()
     wallet_address = wallet_info.wallet_address
 
-    for i, staking_address in enumerate(staking_addresses):
-        progress.report(i, f"Fetching rewards for {staking_address}...", "staking")
-        result = _rewards(staking_address, start_date, end_date)
-
-        for epoch, timestamp, reward in result:
+    rewards = _rewards_addresses(staking_addresses, progress, start_date, end_date)
+    for staking_address in staking_addresses:
+        for epoch, timestamp, reward in rewards[staking_address]:
             txid = f"{staking_address}.{epoch}"
             row = make_sol_reward_tx(timestamp, reward, wallet_address, txid)
             exporter.ingest_row(row)
@@ -31,66 +32,85 @@ def reward_txs(wallet_info, exporter, progress, start_date=None, end_date=None):
     _rewards_txs_marinade_native(wallet_info, exporter, start_date, end_date)
 
 
-def _rewards(staking_address, start_date=None, end_date=None):
-    list_rewards = _rewards_all_time(staking_address)
-    return _filter_date(list_rewards, start_date, end_date)
-
+def _rewards_addresses(staking_addresses, progress, start_date=None, end_date=None):
+    """ Returns dict of staking_address -> list of (epoch, timestamp, reward) """
+    staking_addresses = sorted(staking_addresses)
 
-def _rewards_all_time(staking_address):
-    """ Get reward transactions for this staking_address for all time"""
+    # Each source looks up all staking addresses together (i.e. rpc lookups are epoch-major: one
+    # getInflationReward request per epoch covers all staking addresses).
+    progress.report(0, f"Fetching rewards for {len(staking_addresses)} staking addresses...", "staking")
     if SOL_REWARDS_SOLSCAN_API_TOKEN:
-        return fetch_rewards_solscan(staking_address)
-    if SOL_REWARDS_FLIPSIDE_API_KEY:
-        return fetch_rewards_flipside(staking_address)
-    if SOL_REWARDS_USE_DB:
-        return _rewards_via_db(staking_address)
+        rewards = fetch_rewards_solscan_addresses(staking_addresses)
+    elif SOL_REWARDS_FLIPSIDE_API_KEY:
+        rewards = fetch_rewards_flipside_addresses(staking_addresses)
+    elif SOL_REWARDS_LOCAL_DB:
+        rewards = _rewards_via_db_addresses(staking_addresses, StakingRewardsLocalDB())
+    elif SOL_REWARDS_USE_DB:
+        rewards = _rewards_via_db_addresses(staking_addresses, StakingRewardsDB())
     else:
-        # No DB available.  Query RPC for all rewards info.
         logging.info("No db available.  Using Solana RPC only to get rewards.  This will take a while ...")
-        return _rewards_via_rpc(staking_address)
+        rewards = _rewards_via_rpc_addresses(staking_addresses)
+    progress.report(len(staking_addresses), "Fetched rewards for all staking addresses", "staking")
+
+    return {addr: _filter_date(rewards[addr], start_date, end_date) for addr in staking_addresses}
 
 
 def _date_to_dt(ymd):
     return datetime.strptime(ymd, "%Y-%m-%d")
 
 
-def _rewards_via_db(staking_address):
+def _rewards_via_db_addresses(staking_addresses, db):
+    """ Returns dict of staking_address -> list of (epoch, timestamp, reward), using rewards db (epochs not yet in
+    db are looked up via rpc) """
     epochs_all = get_epochs_all()
 
-    rewards_db = StakingRewardsDB().get_rewards_for_address(staking_address, epochs_all)
-    logging.info("Found rewards_db: %s", rewards_db)
+    out = {}
+    epochs_missing = {}  # epoch -> staking addresses to look up via rpc
+    for staking_address in staking_addresses:
+        rewards_db = db.get_rewards_for_address(staking_address, epochs_all)
+        logging.info("Found rewards_db: %s", rewards_db)
 
-    out = []
-    for epoch in epochs_all:
-        # Get reward for this epoch
-
-        if epoch in rewards_db:
-            # using db data
-            ts, amount = rewards_db[epoch]
-            if float(amount) > 0:
-                out.append((epoch, ts, amount))
-        else:
-            # using rpc call
-            ts, amount = _lookup_reward_via_rpc(staking_address, epoch)
-            if ts and amount:
-                out.append((epoch, ts, amount))
+        out[staking_address] = []
+        for epoch in epochs_all:
+            if epoch in rewards_db:
+                # using db data
+                ts, amount = rewards_db[epoch]
+                if float(amount) > 0:
+                    out[staking_address].append((epoch, ts, amount))
+            else:
+                epochs_missing.setdefault(epoch, []).append(staking_address)
+
+    # using rpc calls
+    rewards_rpc = _rewards_via_rpc_epochs(sorted(epochs_missing.items()))
+    for staking_address in staking_addresses:
+        if staking_address in rewards_rpc:
+            out[staking_address] = sorted(out[staking_address] + rewards_rpc[staking_address], key=lambda x: x[0])
 
     return out
 
 
-def _rewards_via_rpc(staking_address):
+def _rewards_via_rpc_addresses(staking_addresses):
     epochs_all = get_epochs_all()
 
-    if SOL_REWARDS_USE_DB is False:
-        # No DB available.  Query RPC for all rewards info.
-        logging.info("No db available.  Using Solana RPC only to get rewards.  This will take a while ...")
+    rewards = _rewards_via_rpc_epochs([(epoch, staking_addresses) for epoch in epochs_all])
+    return {staking_address: rewards.get(staking_address, []) for staking_address in staking_addresses}
 
-        out = []
-        for epoch in epochs_all:
-            ts, amount = _lookup_reward_via_rpc(staking_address, epoch)
-            if ts and amount:
-                out.append((epoch, ts, amount))
-        return out
+
+def _rewards_via_rpc_epochs(epochs_addresses):
+    """
+    epochs_addresses: list of (epoch, staking addresses to look up in epoch)
+    Returns dict of staking_address -> list of (epoch, timestamp, reward), in epochs_addresses order.
+
+    Epochs are looked up concurrently (SOL_RPC_MAX_WORKERS), each with one request for all of its addresses.
+    """
+    list_args = [(staking_addresses, epoch) for epoch, staking_addresses in epochs_addresses]
+
+    out = {}
+    results = run_pipelined(_lookup_rewards_via_rpc, list_args, SOL_RPC_MAX_WORKERS)
+    for (epoch, _), result in zip(epochs_addresses, results):
+        for staking_address, (ts, amount) in result.items():
+            out.setdefault(staking_address, []).append((epoch, ts, amount))
+    return out
 
 
 def _filter_date(rewards, start_date=None, end_date=None):
@@ -108,18 +128,20 @@ def _filter_date(rewards, start_date=None, end_date=None):
     return out
 
 
-def _lookup_reward_via_rpc(staking_address, epoch):
-    logging.info("Querying RPC for rewards epoch=%s staking_address=%s ...", epoch, staking_address)
+def _lookup_rewards_via_rpc(staking_addresses, epoch):
+    """ Returns dict of staking_address -> (timestamp, reward), for staking_addresses with reward in epoch """
+    logging.info("Querying RPC for rewards epoch=%s for %s staking addresses ...", epoch, len(staking_addresses))
 
-    amount = RpcAPI.get_inflation_reward(staking_address, epoch)
-    if not amount:
-        return None, None
+    amounts = RpcAPI.get_inflation_rewards(staking_addresses, epoch)
+    amounts = {addr: amount for addr, amount in amounts.items() if amount}
+    if not amounts:
+        return {}
 
-    _, ts = epoch_slot_and_time(epoch)
+    ts = epoch_time(epoch)
     if not ts:
-        return None, None
+        return {}
 
-    return ts, amount
+    return {addr: (ts, amount) for addr, amount in amounts.items()}
 
 
 def _rewards_txs_marinade_native(wallet_info, exporter, start_date, end_date):
@@ -1,13 +1,118 @@
+import csv
 import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from staketaxcsv import settings_csv
 from staketaxcsv.sol.api_rpc import RpcAPI
 START_EPOCH = 132  # epoch of first ever staking reward
 EPOCHS_ALL = []
 REFERENCE_ADDRESS_WITH_ALL_EPOCH_REWARDS = "8Vv2xVWSQtHji1Xf7Vj1vHKTa4em7zv7cAET96Vm2qt8"
 
+# Bootstrap snapshot of epoch table (slot blank if not recorded)
+EPOCHS_SNAPSHOT = os.path.dirname(os.path.realpath(__file__)) + "/epochs_snapshot.csv"
+EPOCHS_FIELDS = ["epoch", "slot", "timestamp"]
+MIN_EPOCH_SECONDS = 86400  # epoch (432000 slots) takes ~2 days; never less than 1 day
+
+
+class EpochTable:
+    """ epoch -> (reward slot, timestamp) for finalized epochs.
+
+    Loaded from bootstrap snapshot plus the append-only table file (SOL_EPOCHS_PATH), to which each epoch looked up
+    via rpc is added.  Later rows take precedence.
+    """
+
+    rows = {}
+    loaded = False
+    lock = threading.Lock()
+
+    @classmethod
+    def _path(cls):
+        return settings_csv.SOL_EPOCHS_PATH or os.path.join(settings_csv.REPORTS_DIR, "sol_epochs.csv")
+
+    @classmethod
+    def _load(cls):
+        if cls.loaded:
+            return
+
+        for path in (EPOCHS_SNAPSHOT, cls._path()):
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", newline="") as f:
+                for row in csv.DictReader(f):
+                    if not row["epoch"].isdigit():
+                        # i.e. duplicate header row (written by table files before exclusive create)
+                        continue
+                    slot = int(row["slot"]) if row["slot"] else None
+                    cls.rows[int(row["epoch"])] = (slot, row["timestamp"])
+        cls.loaded = True
+        logging.info("Loaded %s epochs into EpochTable", len(cls.rows))
+
+    @classmethod
+    def get(cls, epoch):
+        """ Returns (slot, timestamp) for epoch (slot None if not recorded), or None if epoch not in table """
+        with cls.lock:
+            cls._load()
+            return cls.rows.get(epoch)
+
+    @classmethod
+    def add(cls, epoch, slot, timestamp):
+        with cls.lock:
+            cls._load()
+            cls.rows[epoch] = (slot, timestamp)
+
+            path = cls._path()
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                try:
+                    # Exclusive create, so that only one process (i.e. batch worker) writes the header
+                    with open(path, "x", newline="") as f:
+                        csv.writer(f).writerow(EPOCHS_FIELDS)
+                except FileExistsError:
+                    pass
+            with open(path, "a", newline="") as f:
+                csv.writer(f).writerow([epoch, slot, timestamp])
+
+    @classmethod
+    def current_epoch(cls):
+        """ Returns current epoch if implied by table (latest epoch in table ended < 1 day ago), else None """
+        with cls.lock:
+            cls._load()
+            if not cls.rows:
+                return None
+            last_epoch = max(cls.rows.keys())
+            _, ts = cls.rows[last_epoch]
+
+        last_time = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+        if time.time() - last_time < MIN_EPOCH_SECONDS:
+            return last_epoch + 1
+        return None
+
 
 def epoch_slot_and_time(epoch):
     """ Returns reward slot and timestamp for specified epoch """
+    row = EpochTable.get(epoch)
+    if row and row[0] is not None:
+        return row
+
+    slot, timestamp = _lookup_epoch_slot_and_time(epoch)
+    EpochTable.add(epoch, slot, timestamp)
+    return slot, timestamp
+
+
+def epoch_time(epoch):
+    """ Returns reward timestamp for specified epoch (no rpc call if epoch in table) """
+    row = EpochTable.get(epoch)
+    if row:
+        return row[1]
+
+    _, timestamp = epoch_slot_and_time(epoch)
+    return timestamp
+
 
+def _lookup_epoch_slot_and_time(epoch):
     # (reward slot of first epoch with rewards) + num_epochs * slots_per_epoch
     slot = 57456000 + (epoch - START_EPOCH) * 432000
 
@@ -26,6 +131,8 @@ def epoch_slot_and_time(epoch):
 def get_epochs_all():
     global EPOCHS_ALL
     if not EPOCHS_ALL:
-        end_epoch = RpcAPI.get_latest_epoch()
+        end_epoch = EpochTable.current_epoch()
+        if end_epoch is None:
+            end_epoch = RpcAPI.get_latest_epoch()
         EPOCHS_ALL = list(range(START_EPOCH, end_epoch))
     return EPOCHS_ALL
@@ -5,12 +5,10 @@ usage: python3 staketaxcsv/sol/staking_rewards_db.py
 
 """
 
-import boto3
 import logging
 import random
 import time
 from concurrent.futures import as_completed, ThreadPoolExecutor
-from botocore.exceptions import ClientError
 
 from staketaxcsv.sol.staking_rewards_common import START_EPOCH, epoch_slot_and_time
 from staketaxcsv.sol.api_rpc import RpcAPI
@@ -25,9 +23,9 @@ MAX_WORKERS = 32
 N_BLOCKS = 10
 
 
-def rewards_all_users_write_db():
-    """ Write/ensure all rewards for all users for all time to db. """
-    db = StakingRewardsDB()
+def rewards_all_users_write_db(db=None):
+    """ Write/ensure all rewards for all users for all time to db (default: dynamodb StakingRewardsDB). """
+    db = db if db else StakingRewardsDB()
 
     # Find [start, end] epochs for rewards not in db yet.
     end_epoch = RpcAPI.get_latest_epoch()
@@ -72,6 +70,7 @@ class StakingRewardsDB:
 
     def __init__(self):
         if not StakingRewardsDB.dynamodb:
+            import boto3
             StakingRewardsDB.dynamodb = boto3.resource("dynamodb", region_name='us-east-1')
             StakingRewardsDB.table = StakingRewardsDB.dynamodb.Table(TABLE_STAKING_REWARDS)
 
@@ -176,6 +175,8 @@ class StakingRewardsDB:
         }
 
         # Run batch read
+        import boto3
+        from botocore.exceptions import ClientError
         dynamodb = boto3.resource("dynamodb", "us-east-1")
         NUM_RETRIES = 5
         for i in range(NUM_RETRIES + 1):
@@ -228,6 +229,7 @@ class StakingRewardsDB:
             logging.info("All tasks completed. ")
 
     def _batch_write(self, addrs, rewards_db):
+        import boto3
         table = boto3.resource("dynamodb", "us-east-1").Table(TABLE_STAKING_REWARDS)
 
         with table.batch_writer() as batch:
@@ -1,17 +1,40 @@
-from flipside import Flipside
 import logging
+import time
 from staketaxcsv.settings_csv import SOL_REWARDS_FLIPSIDE_API_KEY
 from datetime import datetime
-flipside = Flipside(SOL_REWARDS_FLIPSIDE_API_KEY, "https://api-v2.flipsidecrypto.xyz") if SOL_REWARDS_FLIPSIDE_API_KEY else None
+flipside = None  # client, created on first use (flipside sdk import is slow)
+FLIPSIDE_MAX_ADDRESSES = 500  # stake pubkeys per query
+FLIPSIDE_PAGE_SIZE = 10000  # result rows per page
+FLIPSIDE_RETRIES = 4  # attempts per query/page, before failing the run
+FLIPSIDE_BACKOFF_SECONDS = 2
 
 
-def fetch_rewards_flipside(staking_address):
+def _flipside():
+    global flipside
+    if flipside is None and SOL_REWARDS_FLIPSIDE_API_KEY:
+        from flipside import Flipside
+        flipside = Flipside(SOL_REWARDS_FLIPSIDE_API_KEY, "https://api-v2.flipsidecrypto.xyz")
+    return flipside
+
+
+def fetch_rewards_flipside_addresses(staking_addresses):
     """
-    Fetch staking rewards for a specific address using Flipside Crypto API.
+    Fetch staking rewards for all staking addresses using Flipside Crypto API (one query per
+    FLIPSIDE_MAX_ADDRESSES addresses).  Returns dict of staking_address -> list of (epoch, timestamp, reward).
     """
+    out = {staking_address: [] for staking_address in staking_addresses}
+    for i in range(0, len(staking_addresses), FLIPSIDE_MAX_ADDRESSES):
+        chunk = staking_addresses[i:i + FLIPSIDE_MAX_ADDRESSES]
+        out.update(_fetch_rewards_flipside_chunk(chunk))
+    return out
+
+
+def _fetch_rewards_flipside_chunk(staking_addresses):
     # Define SQL query
+    stake_pubkeys = ", ".join(f"'{staking_address}'" for staking_address in staking_addresses)
     sql = f"""
     SELECT
+        STAKE_PUBKEY,
         BLOCK_TIMESTAMP,
         EPOCH_EARNED,
         REWARD_AMOUNT_SOL,
@@ -19,30 +42,47 @@ def fetch_rewards_flipside(staking_address):
     FROM
         solana.gov.fact_rewards_staking
     WHERE
-        STAKE_PUBKEY = '{staking_address}'
+        STAKE_PUBKEY IN ({stake_pubkeys})
     ORDER BY
-        BLOCK_TIMESTAMP ASC
-    LIMIT 5000;
+        STAKE_PUBKEY ASC,
+        BLOCK_TIMESTAMP ASC;
     """
 
-    logging.info("Querying Flipside Crypto for staking rewards...")
-
-    try:
-        # Run the query
-        query_result_set = flipside.query(sql)
-        results = query_result_set.records
-
-        # Format results (ignore `__row_index`)
-        rewards = [
-            (
-                row["epoch_earned"],
-                datetime.strptime(row["block_timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ").strftime("%Y-%m-%d %H:%M:%S"),
-                row["reward_amount_sol"]
-            )
-            for row in results
-        ]
-        return rewards
-
-    except Exception as e:
-        logging.error(f"Failed to fetch rewards: {e}")
-        return []
+    logging.info("Querying Flipside Crypto for staking rewards of %s addresses...", len(staking_addresses))
+
+    # Run the query, then fetch remaining pages of result (each retried; raises if still failing, since
+    # returning no rows would silently drop staking income from the report)
+    query_result_set = _with_retries(_flipside().query, sql, page_size=FLIPSIDE_PAGE_SIZE)
+    results = list(query_result_set.records or [])
+
+    page_number = 1
+    total_pages = query_result_set.page.totalPages if query_result_set.page else 1
+    while page_number < total_pages:
+        page_number += 1
+        query_result_set = _with_retries(
+            _flipside().get_query_results, query_result_set.query_id, page_number=page_number,
+            page_size=FLIPSIDE_PAGE_SIZE)
+        results.extend(query_result_set.records or [])
+
+    # Format results (ignore `__row_index`)
+    out = {staking_address: [] for staking_address in staking_addresses}
+    for row in results:
+        out[row["stake_pubkey"]].append((
+            row["epoch_earned"],
+            datetime.strptime(row["block_timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ").strftime("%Y-%m-%d %H:%M:%S"),
+            row["reward_amount_sol"]
+        ))
+    return out
+
+
+def _with_retries(func, *args, **kwargs):
+    for attempt in range(FLIPSIDE_RETRIES):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == FLIPSIDE_RETRIES - 1:
+                logging.error("Failed to fetch rewards from Flipside after %s attempts: %s", FLIPSIDE_RETRIES, e)
+                raise
+            wait_time = FLIPSIDE_BACKOFF_SECONDS * (2 ** attempt)
+            logging.warning("Flipside error on attempt %s: %s.  Retrying in %s seconds ...", attempt + 1, e, wait_time)
+            time.sleep(wait_time)
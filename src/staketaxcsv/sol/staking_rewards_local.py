@@ -0,0 +1,79 @@
+"""
+usage: STAKETAX_SOL_REWARDS_LOCAL_DB=<path> python3 staketaxcsv/sol/staking_rewards_local.py
+
+  * Writes all staking rewards for all users for all time (that doesn't exist in db yet) to local sqlite file
+    STAKETAX_SOL_REWARDS_LOCAL_DB, using getBlock rewards of each epoch's reward slot.
+  * Reports then read rewards for a staking address with one query (instead of one rpc call per epoch).
+
+"""
+
+import logging
+import sqlite3
+
+from staketaxcsv.settings_csv import SOL_REWARDS_LOCAL_DB
+
+
+class StakingRewardsLocalDB:
+    """ Same interface as StakingRewardsDB (dynamodb), stored in local sqlite file """
+
+    def __init__(self, path=None):
+        self.path = path if path else SOL_REWARDS_LOCAL_DB
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS epochs (epoch INTEGER PRIMARY KEY, slot INTEGER, timestamp TEXT)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rewards ("
+            "  pubkey TEXT, epoch INTEGER, amount REAL, PRIMARY KEY (pubkey, epoch)) WITHOUT ROWID")
+        self.conn.commit()
+
+    def get_epoch_timestamps(self):
+        rows = self.conn.execute("SELECT epoch, timestamp FROM epochs").fetchall()
+        return {str(epoch): ts for epoch, ts in rows}
+
+    def set_multi_block_rewards(self, list_block_rewards):
+        """ list_block_rewards: list of (epoch, slot, timestamp, [(address, amount), ...]) """
+        logging.info("set_multi_block_rewards() for epochs %s...", [x[0] for x in list_block_rewards])
+
+        with self.conn:
+            for epoch, slot, ts, block_rewards in list_block_rewards:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO rewards (pubkey, epoch, amount) VALUES (?, ?, ?)",
+                    ((addr, epoch, amount) for addr, amount in block_rewards))
+
+                # Marks epoch as complete in db
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO epochs (epoch, slot, timestamp) VALUES (?, ?, ?)", (epoch, slot, ts))
+
+    def get_rewards_for_address(self, address, epochs_to_lookup):
+        """ Returns {epoch: (timestamp, amount)} for epochs in db (amount=0 if no reward) """
+        if not epochs_to_lookup:
+            return {}
+        min_epoch, max_epoch = min(epochs_to_lookup), max(epochs_to_lookup)
+
+        epoch_timestamps = {
+            epoch: ts for epoch, ts in self.conn.execute(
+                "SELECT epoch, timestamp FROM epochs WHERE epoch BETWEEN ? AND ?", (min_epoch, max_epoch))
+        }
+        addr_rewards = {
+            epoch: amount for epoch, amount in self.conn.execute(
+                "SELECT epoch, amount FROM rewards WHERE pubkey = ? AND epoch BETWEEN ? AND ?",
+                (address, min_epoch, max_epoch))
+        }
+
+        out = {}
+        for epoch in epochs_to_lookup:
+            if epoch in epoch_timestamps:
+                out[epoch] = (epoch_timestamps[epoch], float(addr_rewards.get(epoch, 0)))
+        return out
+
+
+if __name__ == "__main__":
+    from staketaxcsv.sol.staking_rewards_db import rewards_all_users_write_db
+
+    logging.basicConfig(format='%(asctime)s %(levelname)-8s %(message)s',
+                        level=logging.INFO,
+                        datefmt='%Y-%m-%d %H:%M:%S')
+    if not SOL_REWARDS_LOCAL_DB:
+        print("Set STAKETAX_SOL_REWARDS_LOCAL_DB environment variable to path of sqlite file.")
+    else:
+        rewards_all_users_write_db(StakingRewardsLocalDB())
@@ -3,7 +3,20 @@ import logging
 import csv
 from io import StringIO
 from datetime import datetime, timezone
+from staketaxcsv.common.concurrent_util import run_pipelined
 from staketaxcsv.settings_csv import SOL_REWARDS_SOLSCAN_API_TOKEN
+SOLSCAN_MAX_WORKERS = 4  # concurrent reward exports (export endpoint takes one address per request)
+session = requests.Session()
+
+
+def fetch_rewards_solscan_addresses(staking_addresses):
+    """
+    Fetch staking rewards for all staking addresses using Solscan Pro API, several addresses at a time.
+    Returns dict of staking_address -> list of (epoch, timestamp, reward).
+    """
+    list_args = [(staking_address,) for staking_address in staking_addresses]
+    results = run_pipelined(fetch_rewards_solscan, list_args, SOLSCAN_MAX_WORKERS)
+    return dict(zip(staking_addresses, results))
 
 
 def fetch_rewards_solscan(staking_address):
@@ -31,7 +44,7 @@ def fetch_rewards_solscan(staking_address):
 
     # Make the API request
     try:
-        response = requests.get(API_URL, headers=headers, params=params)
+        response = session.get(API_URL, headers=headers, params=params)
         # If a 400 error is returned (e.g., malformed/non-existent address),
         # we want to return an empty list instead of raising an exception.
         if response.status_code == 400:
@@ -1,10 +1,18 @@
 import logging
+import threading
 from datetime import datetime, timezone
 
+from staketaxcsv.common.concurrent_util import run_concurrent
+from staketaxcsv.settings_csv import SOL_RPC_MAX_WORKERS
 from staketaxcsv.sol.api_rpc import RpcAPI
 from staketaxcsv.sol.config_sol import localconfig
 ABSOLUTE_MAX_QUERIES = 200
 LIMIT_PER_QUERY = 1000
+SEEK_SLOT_TOLERANCE = 1000  # slot seek stops within this many slots (~7 minutes) of end_date
+
+# end timestamp -> signature to crawl backwards from (see _seek_before_txid())
+SEEK_TXIDS = {}
+SEEK_LOCK = threading.Lock()
 
 
 def get_txids(wallet_address, progress, start_date=None, end_date=None, before_txid=None):
@@ -16,7 +24,7 @@ def get_txids(wallet_address, progress, start_date=None, end_date=None, before_t
 
     if exclude_associated:
         # exclude_associated=True : do not use associated token accounts' transactions
-        # (useful if intractable # of associated accounts)
+        # (token accounts are crawled concurrently, so only needed for very large # of associated accounts)
         pass
     else:
         token_accounts = RpcAPI.fetch_token_accounts(wallet_address).keys()
@@ -27,35 +35,44 @@ def get_txids(wallet_address, progress, start_date=None, end_date=None, before_t
 
 
 def get_txids_for_accounts(addresses, progress, start_date=None, end_date=None, before_txid=None):
-    """ Returns transactions txids for all addresses in one list """
+    """
+    Returns transactions txids for all addresses in one list, oldest first (by blockTime).
+
+    Addresses are crawled concurrently (SOL_RPC_MAX_WORKERS; requests still limited by the SOL_NODE rate limiter),
+    sharing one set of txids seen so each txid is returned once.
+    """
     wallet_address = addresses[0]
 
-    out = []
     txids_seen = set()
-
-    for i, address in enumerate(addresses):
-        if progress and i % 10 == 0:
-            message = f"Fetched txids for {i} of {len(addresses)} addresses..."
-            progress.report_message(message)
-
+    lock = threading.Lock()
+    list_args = []
+    for address in addresses:
         if address == wallet_address:
             max_txs = localconfig.limit
         else:
             max_txs = int(localconfig.limit / 5)
+        list_args.append((address, start_date, end_date, max_txs, txids_seen, before_txid, lock))
 
-        # Get transaction txids for this token account
-        result = _txids_one_account(address, start_date, end_date, max_txs, txids_seen, before_txid)
-        out.extend(result)
+    results = [None] * len(addresses)
+    for i, (j, result) in enumerate(run_concurrent(_txids_one_account, list_args, SOL_RPC_MAX_WORKERS)):
+        results[j] = result
+
+        if progress and i % 10 == 0:
+            message = f"Fetched txids for {i + 1} of {len(addresses)} addresses..."
+            progress.report_message(message)
 
-    # Process oldest first
+    # Merge newest first lists by blockTime (stable, so order within same blockTime is kept), then oldest first
+    out = [elem for result in results for elem in result]
+    out.sort(key=lambda elem: elem[1], reverse=True)
     out.reverse()
-    return out
+    return [txid for txid, _ in out]
 
 
-def _txids_one_account(address, start_date, end_date, max_txs, txids_seen, _before_txid=None):
-    """ Returns txids for this token account as a list """
+def _txids_one_account(address, start_date, end_date, max_txs, txids_seen, _before_txid=None, lock=None):
+    """ Returns (txid, block_time) for this token account as a list, newest first """
     start_ts = _unix_timestamp(start_date + " 00:00:00") if start_date else None
     end_ts = _unix_timestamp(end_date + " 23:59:59") if end_date else None
+    lock = lock if lock else threading.Lock()
 
     out = []
     before_txid = _before_txid
@@ -71,9 +88,11 @@ def _txids_one_account(address, start_date, end_date, max_txs, txids_seen, _befo
             # Check if txid is within the time range
             if ((start_date is None or block_time >= start_ts)
                  and (end_date is None or block_time <= end_ts)):
-                if txid not in txids_seen:
-                    out.append(txid)
+                with lock:
+                    is_new = txid not in txids_seen
                     txids_seen.add(txid)
+                if is_new:
+                    out.append((txid, block_time))
 
             # Reached start_date case
             if start_date is not None and block_time < start_ts:
@@ -87,9 +106,66 @@ def _txids_one_account(address, start_date, end_date, max_txs, txids_seen, _befo
         if before_txid is None:
             return out
 
+        # First page is all after end_date: skip ahead to end_date, instead of paging back to it
+        if j == 0 and end_date is not None and _before_txid is None and txids and txids[-1][1] is not None \
+                and txids[-1][1] > end_ts:
+            seek_txid = _seek_before_txid(end_ts)
+            if seek_txid:
+                logging.info("Seeking to end_date=%s for address=%s: before_txid=%s", end_date, address, seek_txid)
+                before_txid = seek_txid
+
     return out
 
 
+def _seek_before_txid(end_ts):
+    """
+    Returns a signature in the first block after end_ts (within SEEK_SLOT_TOLERANCE slots), so that
+    getSignaturesForAddress(before=<signature>) starts at end_ts.  Returns None if not found.
+
+    Binary search over slots: getBlocksWithLimit finds the block at or after a slot (skipping empty slots), and
+    getBlockTime its timestamp.
+    """
+    with SEEK_LOCK:
+        if end_ts not in SEEK_TXIDS:
+            SEEK_TXIDS[end_ts] = _seek_block_signature(end_ts)
+        return SEEK_TXIDS[end_ts]
+
+
+def _seek_block_signature(end_ts):
+    latest_slot = RpcAPI.get_slot()
+    if latest_slot is None:
+        return None
+    lo = RpcAPI.get_first_available_block()
+    if lo is None:
+        return None
+    hi_block = RpcAPI.get_block_at_or_after(latest_slot)
+    if hi_block is None:
+        return None
+
+    # Invariant: block lo is at or before end_ts; hi_block is after end_ts; no blocks in (hi_slot, hi_block)
+    if not _block_after(hi_block, end_ts) or _block_after(lo, end_ts):
+        return None
+    hi_slot = hi_block
+
+    while hi_slot - lo > SEEK_SLOT_TOLERANCE:
+        mid = (lo + hi_slot) // 2
+        block = RpcAPI.get_block_at_or_after(mid)
+        if block is None or block >= hi_block:
+            hi_slot = mid
+        elif _block_after(block, end_ts):
+            hi_slot = hi_block = block
+        else:
+            lo = block
+
+    return RpcAPI.get_block_first_signature(hi_block)
+
+
+def _block_after(block, end_ts):
+    # No timestamp: old block from before block times were recorded
+    block_time = RpcAPI.get_block_unix_time(block)
+    return block_time is not None and block_time > end_ts
+
+
 def _unix_timestamp(dt_str):
     if dt_str:
         dt = datetime.strptime(dt_str, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
@@ -1,5 +1,6 @@
 import logging
 
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 import staketaxcsv.stars.constants as co
@@ -9,6 +10,8 @@ from staketaxcsv.stars.handle import handle_airdrop
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(STARS_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
@@ -1,6 +1,7 @@
 import logging
 
 import staketaxcsv.strd.constants as co
+import staketaxcsv.common.ibc.denoms
 import staketaxcsv.common.ibc.handle
 import staketaxcsv.common.ibc.processor
 from staketaxcsv.strd.config_strd import localconfig
@@ -9,6 +10,8 @@ from staketaxcsv.strd import handle
 
 
 def process_txs(wallet_address, elems, exporter):
+    staketaxcsv.common.ibc.denoms.prefetch_ibc_addresses(STRD_NODE, elems)
+
     for elem in elems:
         process_tx(wallet_address, elem, exporter)
 
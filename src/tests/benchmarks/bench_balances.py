@@ -0,0 +1,110 @@
+"""
+Benchmark of balances_calculated export: time and peak RSS for many rows x many currencies.
+
+usage (from src directory):
+    python -m tests.benchmarks.bench_balances [num_rows] [num_currencies] [--reference]
+
+  --reference: also time previous implementation (dense list of lists, one python float per currency per row).
+               Needs several GB of memory at default size.
+"""
+
+import csv
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from staketaxcsv.common import ExporterTypes as et
+from staketaxcsv.common.Exporter import Exporter, Row
+from staketaxcsv.common.exporter_koinly import LOCAL_MAP
+
+NUM_ROWS = 100000
+NUM_CURRENCIES = 500
+
+
+class BenchConfig:
+    koinlynullmap = LOCAL_MAP
+    lp_treatment = et.LP_TREATMENT_TRANSFERS
+
+
+def _max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _exporter(num_rows, num_currencies):
+    rng = random.Random(0)
+    currencies = ["ibc/{:064X}".format(i) for i in range(num_currencies)]
+    exporter = Exporter("osmo1benchmark", BenchConfig(), "OSMO")
+    for i in range(num_rows):
+        timestamp = "2022-{:02d}-{:02d} {:02d}:{:02d}:{:02d}".format(
+            i % 12 + 1, i % 28 + 1, i % 24, i % 60, (i // 60) % 60)
+        row = Row(timestamp, et.TX_TYPE_TRADE, rng.random() * 100, rng.choice(currencies), rng.random(),
+                  rng.choice(currencies), 0.0025, currencies[0], "osmo_blockchain", "osmo1benchmark",
+                  "TX{:064d}".format(i))
+        exporter.ingest_row(row)
+    return exporter
+
+
+def _export_reference(exporter, csvpath):
+    """ Previous implementation of Exporter.export_balances_csv() """
+    exporter.sort_rows(reverse=False)
+    currencies = set()
+    for row in exporter.rows:
+        for currency in (row.received_currency, row.sent_currency, row.fee_currency):
+            if currency:
+                currencies.add(currency)
+    balances = {currency: 0 for currency in currencies}
+    currencies_list = sorted(currencies)
+
+    table = []
+    for row in exporter.rows:
+        if row.received_currency and row.received_amount:
+            balances[row.received_currency] += float(row.received_amount)
+        if row.sent_currency and row.sent_amount:
+            balances[row.sent_currency] -= float(row.sent_amount)
+        if row.fee_currency and row.fee:
+            balances[row.fee_currency] -= float(row.fee)
+        table.append([row.timestamp, row.txid] + [balances[currency] for currency in currencies_list])
+    table.reverse()
+    table.insert(0, ["timestamp", "txid"] + currencies_list)
+
+    with open(csvpath, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(table)
+
+
+def _timed(label, func, *args):
+    rss_start = _max_rss_mb()
+    start = time.time()
+    func(*args)
+    print(f"{label}: {time.time() - start:.2f}s, peak rss increase: {_max_rss_mb() - rss_start:.1f} MB")
+
+
+def run(num_rows, num_currencies, reference=False):
+    logging.disable(logging.INFO)
+    exporter = _exporter(num_rows, num_currencies)
+    print(f"rows: {num_rows}, currencies: {num_currencies}")
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        path = os.path.join(dirpath, "balances.csv")
+        _timed("balances_calculated", exporter.export_balances_csv, path)
+        print(f"  file size: {os.path.getsize(path) / 1e6:.1f} MB")
+
+        path_sparse = os.path.join(dirpath, "balances_sparse.csv")
+        _timed("balances_calculated_sparse", exporter.export_balances_csv, path_sparse, None, True)
+        print(f"  file size: {os.path.getsize(path_sparse) / 1e6:.1f} MB")
+
+        if reference:
+            path_reference = os.path.join(dirpath, "balances_reference.csv")
+            _timed("reference", _export_reference, exporter, path_reference)
+            with open(path, "rb") as f1, open(path_reference, "rb") as f2:
+                print(f"  same output: {f1.read() == f2.read()}")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    run(int(args[0]) if len(args) > 0 else NUM_ROWS,
+        int(args[1]) if len(args) > 1 else NUM_CURRENCIES,
+        reference="--reference" in sys.argv)
@@ -0,0 +1,80 @@
+"""
+Benchmark of Exporter row storage: peak RSS and time to ingest/sort/export many rows.
+
+usage (from src directory):
+    python -m tests.benchmarks.bench_exporter [num_rows]
+"""
+
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from staketaxcsv.common import ExporterTypes as et
+from staketaxcsv.common.Exporter import Exporter, Row
+from staketaxcsv.common.exporter_koinly import LOCAL_MAP
+from staketaxcsv.luna1.constants import EXCHANGE_TERRA_CLASSIC_BLOCKCHAIN
+
+NUM_ROWS = 200000
+CURRENCIES = ["OSMO", "ATOM", "USDC", "GAMM-1", "GAMM-678", "ibc/27394FB092D2ECCD56123C74F36E4C1F926001CEADA9CA97EA622B25F41E5EB2"]
+TX_TYPES = [et.TX_TYPE_STAKING, et.TX_TYPE_TRADE, et.TX_TYPE_TRANSFER, et.TX_TYPE_LP_DEPOSIT,
+            et.TX_TYPE_LP_WITHDRAW, et.TX_TYPE_UNKNOWN]
+FORMATS = [et.FORMAT_DEFAULT, et.FORMAT_KOINLY, et.FORMAT_COINTRACKER, et.FORMAT_CRYPTOTAXCALCULATOR]
+
+
+class BenchConfig:
+    koinlynullmap = LOCAL_MAP
+    lp_treatment = et.LP_TREATMENT_TRANSFERS
+
+
+def _max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _elems(num_rows):
+    # Currency strings are decoded from json, as in api responses (i.e. one str object per row)
+    out = []
+    for i in range(num_rows):
+        elem = json.loads(json.dumps({
+            "currency": CURRENCIES[i % len(CURRENCIES)],
+            "fee_currency": CURRENCIES[0],
+            "amount": (i % 1000) / 997 + 0.0001,
+        }))
+        out.append(elem)
+    return out
+
+
+def run(num_rows):
+    logging.disable(logging.INFO)
+    elems = _elems(num_rows)
+    rss_start = _max_rss_mb()
+
+    start = time.time()
+    exporter = Exporter("osmo1benchmark", BenchConfig(), "OSMO")
+    for i, elem in enumerate(elems):
+        tx_type = TX_TYPES[i % len(TX_TYPES)]
+        exchange = EXCHANGE_TERRA_CLASSIC_BLOCKCHAIN if i % 10 == 0 else "osmo_blockchain"
+        timestamp = "2022-{:02d}-{:02d} {:02d}:{:02d}:{:02d}".format(
+            i % 12 + 1, i % 28 + 1, i % 24, i % 60, (i // 60) % 60)
+        row = Row(timestamp, tx_type, elem["amount"], elem["currency"], elem["amount"] / 3, elem["fee_currency"],
+                  0.0025, elem["fee_currency"], exchange, "osmo1benchmark", "TX{:064d}".format(i))
+        exporter.ingest_row(row)
+    ingest_seconds = time.time() - start
+    rss_ingest = _max_rss_mb()
+
+    start = time.time()
+    with tempfile.TemporaryDirectory() as dirpath:
+        exporter.export_formats({f: os.path.join(dirpath, f"{f}.csv") for f in FORMATS})
+    export_seconds = time.time() - start
+
+    print(f"rows: {num_rows}")
+    print(f"ingest: {ingest_seconds:.2f}s, rss increase: {rss_ingest - rss_start:.1f} MB")
+    print(f"export {len(FORMATS)} formats: {export_seconds:.2f}s")
+    print(f"peak rss: {_max_rss_mb():.1f} MB")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ROWS)
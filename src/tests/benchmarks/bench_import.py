@@ -0,0 +1,54 @@
+"""
+Benchmark of cold start: time to import staketaxcsv.api, and per ticker, time to first use its report module
+(import staketaxcsv.api + report module), each measured in a fresh python process.
+
+usage (from src directory):
+    python -m tests.benchmarks.bench_import [ticker ...]
+"""
+
+import statistics
+import subprocess
+import sys
+
+REPEATS = 5
+
+CODE_IMPORT_API = """
+import time
+start = time.perf_counter()
+import staketaxcsv.api
+print(time.perf_counter() - start)
+"""
+
+CODE_FIRST_REPORT = """
+import time
+start = time.perf_counter()
+import staketaxcsv.api
+staketaxcsv.api.REPORT_MODULES["{ticker}"]
+print(time.perf_counter() - start)
+"""
+
+
+def _seconds(code):
+    # Fresh interpreter each time, so no module is already imported
+    times = []
+    for _ in range(REPEATS):
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        times.append(float(out.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def run(tickers):
+    print(f"import staketaxcsv.api: {_seconds(CODE_IMPORT_API) * 1000:.0f} ms (median of {REPEATS})")
+
+    for ticker in tickers:
+        seconds = _seconds(CODE_FIRST_REPORT.format(ticker=ticker))
+        print(f"{ticker}: import api + report module: {seconds * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        tickers = sys.argv[1:]
+    else:
+        from staketaxcsv.api import tickers as all_tickers
+        tickers = all_tickers()
+    run(tickers)
@@ -0,0 +1,59 @@
+"""
+Benchmark of rpc fee extraction: ProtobufParser (byte stream + callbacks) vs decode_fees() (memoryview offsets),
+over protobuf TxRaw encodings of the lcd transactions in tests/data/load_tx.
+
+usage (from src directory):
+    python -m tests.benchmarks.bench_protobuf_decoder [repeats]
+"""
+
+import glob
+import json
+import sys
+import time
+
+from staketaxcsv.common.ibc.protobuf_decoder import CosmosTransactionFeeExtractor, ProtobufParser, decode_fees
+from tests.utils_ibc import TESTDATADIR, tx_raw_from_lcd
+
+REPEATS = 200
+
+
+def _txs():
+    out = []
+    for path in sorted(glob.glob(f"{TESTDATADIR}/*.json")):
+        with open(path, "r") as f:
+            out.append(tx_raw_from_lcd(json.load(f)))
+    return out
+
+
+def _parse_fees(txs):
+    out = []
+    for tx_bytes in txs:
+        callback = CosmosTransactionFeeExtractor()
+        ProtobufParser(tx_bytes, callback).parse()
+        out.append((callback.fee_denom, callback.fee_amount))
+    return out
+
+
+def _time(func, txs, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = func(txs)
+    return time.perf_counter() - start, result
+
+
+def run(repeats):
+    txs = _txs()
+    num_txs = len(txs) * repeats
+    print(f"txs: {len(txs)} x {repeats} repeats, avg size {sum(len(tx) for tx in txs) / len(txs):.0f} bytes")
+
+    seconds_parser, fees_parser = _time(_parse_fees, txs, repeats)
+    seconds_decoder, fees_decoder = _time(decode_fees, txs, repeats)
+    assert fees_parser == fees_decoder
+
+    print(f"ProtobufParser: {seconds_parser:.3f}s ({num_txs / seconds_parser:,.0f} txs/s)")
+    print(f"decode_fees:    {seconds_decoder:.3f}s ({num_txs / seconds_decoder:,.0f} txs/s)")
+    print(f"speedup: {seconds_parser / seconds_decoder:.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else REPEATS)
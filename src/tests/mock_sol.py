@@ -17,9 +17,16 @@ class MockRpcAPI(RpcAPI):
         return mock_query_one_arg(RpcAPI.fetch_tx, txid, TICKER_SOL + "/fetch_tx")
 
     @classmethod
-    def _get_inflation_reward(cls, staking_address, epoch):
-        return mock_query_two_args(
-            RpcAPI._get_inflation_reward, staking_address, epoch, TICKER_SOL + "/_get_inflation_reward")
+    def fetch_txs(cls, txids):
+        return [cls.fetch_tx(txid) for txid in txids]
+
+    @classmethod
+    def _get_inflation_rewards(cls, staking_addresses, epoch):
+        # Combines single address responses (fixtures are one request per staking address)
+        results = [mock_query_two_args(
+            _get_inflation_reward, staking_address, epoch, TICKER_SOL + "/_get_inflation_reward")["result"][0]
+            for staking_address in staking_addresses]
+        return {"jsonrpc": "2.0", "result": results}
 
     @classmethod
     def _get_txids(cls, wallet_address, limit=None, before=None):
@@ -36,6 +43,15 @@ class MockRpcAPI(RpcAPI):
         return mock_query_one_arg(
             RpcAPI.fetch_account, wallet_address, TICKER_SOL + "/fetch_account")
 
+    @classmethod
+    def get_slot(cls):
+        # No fixtures for slot seek (txids.py): crawl signatures from newest
+        return None
+
     @classmethod
     def get_block_time(cls, block):
         return mock_query_one_arg(RpcAPI.get_block_time, block, TICKER_SOL + "/get_block_time")
+
+
+def _get_inflation_reward(staking_address, epoch):
+    return RpcAPI._get_inflation_rewards([staking_address], epoch)
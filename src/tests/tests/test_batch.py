@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv import api, batch
+from staketaxcsv.atom.config_atom import localconfig
+from staketaxcsv.common.rate_limiter import RateLimiter
+
+ADDRESS = "cosmos1xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx"
+
+
+def _csv(ticker, wallet_address, csv_format, path=None, options=None, logs=True):
+    # Fake report: applies options like read_options() does
+    localconfig.start_date = options.get("start_date")
+    localconfig.job = "job"
+    if wallet_address == "bad":
+        raise Exception("Wallet address not found")
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_read_manifest(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "manifest.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps({"ticker": "ATOM", "wallet": ADDRESS}) + "\n\n")
+                f.write(json.dumps({"ticker": "SOL", "wallet": "abc", "format": "koinly"}) + "\n")
+
+            jobs = batch.read_manifest(path)
+        self.assertEqual([job["ticker"] for job in jobs], ["ATOM", "SOL"])
+
+    @patch("staketaxcsv.api.csv", side_effect=_csv)
+    def test_run_job_isolates_config(self, mock_csv):
+        job1 = {"ticker": "ATOM", "wallet": ADDRESS, "format": "koinly", "options": {"start_date": "2023-01-01"}}
+        job2 = {"ticker": "ATOM", "wallet": "bad", "format": "koinly"}
+
+        result1 = batch._run_job(job1, "/tmp")
+        self.assertEqual(localconfig.start_date, "2023-01-01")
+
+        result2 = batch._run_job(job2, "/tmp")
+        self.assertTrue(result1["ok"])
+        self.assertEqual(result1["paths"], ["/tmp/ATOM.{}.koinly.csv".format(ADDRESS)])
+        self.assertFalse(result2["ok"])
+        self.assertEqual(result2["error"], "Exception: Wallet address not found")
+
+        # job2 did not see job1's options
+        batch._reset_config(api.REPORT_MODULES["ATOM"])
+        self.assertIsNone(localconfig.start_date)
+        self.assertIsNone(localconfig.job)
+
+    def test_rate_limiter_shared(self):
+        next_times = {}
+        RateLimiter.share_across_processes(next_times, threading.Lock())
+        try:
+            limiter = RateLimiter(1000, key="https://node")
+            limiter.wait()
+            limiter.wait()
+            self.assertIn("https://node", next_times)
+        finally:
+            RateLimiter.share_across_processes(None, None)
+
@@ -0,0 +1,92 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import staketaxcsv.report_bld
+from staketaxcsv.common.ibc.api_lcd_v2 import LcdAPI_v2
+from staketaxcsv.common.ibc.api_rpc import RpcAPI
+from staketaxcsv.common.ibc.block_heights import BlockHeights, height_range
+from staketaxcsv.common.ibc.constants import EVENTS_TYPE_SENDER
+from staketaxcsv.common.ibc.tx_data import TxDataRpc
+
+NODE = "https://node.example.com"
+ADDRESS = "cosmos1qqp2aydslhpx4emvqdhsyn8ztrltd4zezcr22h"
+GENESIS = datetime(2019, 3, 13)
+LATEST_HEIGHT = 1000000
+EARLIEST_HEIGHT = 1000  # node pruned blocks before this
+
+
+class FakeApi:
+    """ One block every 6 minutes since genesis """
+
+    def __init__(self):
+        self.node = NODE
+        self.calls = 0
+
+    def block_time(self, height):
+        self.calls += 1
+        if height < EARLIEST_HEIGHT:
+            raise KeyError("block")
+        return (GENESIS + timedelta(minutes=6 * (height - 1))).strftime("%Y-%m-%dT%H:%M:%S.123456Z")
+
+    def latest_height(self):
+        return LATEST_HEIGHT
+
+
+class TestBlockHeights(unittest.TestCase):
+
+    def setUp(self):
+        BlockHeights.first_heights.clear()
+
+    def test_height_range(self):
+        api = FakeApi()
+        min_height, max_height = height_range(api, "2020-01-01", "2020-12-31")
+
+        # 240 blocks per day
+        self.assertEqual(min_height, 294 * 240 + 1)
+        self.assertEqual(max_height, (294 + 366) * 240)
+        self.assertEqual(api.block_time(min_height)[:10], "2020-01-01")
+        self.assertEqual(api.block_time(min_height - 1)[:10], "2019-12-31")
+        self.assertEqual(api.block_time(max_height)[:10], "2020-12-31")
+
+        # cached
+        api.calls = 0
+        height_range(api, "2020-01-01", "2020-12-31")
+        self.assertEqual(api.calls, 0)
+
+    def test_height_range_open_ends(self):
+        api = FakeApi()
+
+        # before earliest available block; after latest block
+        self.assertEqual(height_range(api, "2019-01-01", None), (EARLIEST_HEIGHT, None))
+        self.assertEqual(height_range(api, None, "2040-01-01"), (None, None))
+        self.assertEqual(height_range(api, "2040-01-01", None), (LATEST_HEIGHT + 1, None))
+
+    @patch.object(LcdAPI_v2, "cosmos_sdk_version", new=lambda self: "0.50.1")
+    @patch.object(LcdAPI_v2, "_query", return_value={"tx_responses": [], "total": "0"})
+    def test_lcd_query_heights(self, mock_query):
+        LcdAPI_v2(NODE).get_txs(ADDRESS, EVENTS_TYPE_SENDER, 1, 100, 0, heights=(70561, 158400))
+
+        query_params = mock_query.call_args[0][1]
+        self.assertEqual(query_params["query"],
+                         f"message.sender='{ADDRESS}' AND tx.height>=70561 AND tx.height<=158400")
+
+    @patch.object(RpcAPI, "_query", return_value={"result": {"txs": [], "total_count": "0"}})
+    def test_rpc_query_heights(self, mock_query):
+        RpcAPI(NODE).txs_search(ADDRESS, EVENTS_TYPE_SENDER, 1, 50, heights=(70561, None))
+
+        query_params = mock_query.call_args[0][1]
+        self.assertEqual(query_params["query"], f"\"message.sender='{ADDRESS}' AND tx.height>=70561\"")
+
+    @patch.object(TxDataRpc, "get_txs_all", return_value=[])
+    @patch.object(TxDataRpc, "get_txs_pages_count", return_value=(0, 0))
+    def test_rpc_report_passes_dates(self, mock_pages_count, mock_txs_all):
+        staketaxcsv.report_bld.read_options({"start_date": "2023-01-01", "end_date": "2023-12-31"})
+        try:
+            staketaxcsv.report_bld.txhistory(ADDRESS)
+        finally:
+            staketaxcsv.report_bld.read_options({})
+
+        for mock_call in (mock_pages_count, mock_txs_all):
+            self.assertEqual(mock_call.call_args.kwargs["start_date"], "2023-01-01")
+            self.assertEqual(mock_call.call_args.kwargs["end_date"], "2023-12-31")
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+from staketaxcsv.common.Cache import Cache
+from staketaxcsv.common.cache_backends import DynamoCacheBackend, MemoryCacheBackend, SqliteCacheBackend
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.sqlite_backend = SqliteCacheBackend(os.path.join(self.tmpdir.name, "cache.db"))
+        Cache.backend = self.sqlite_backend
+        Cache.clear_lru()
+
+    def tearDown(self):
+        self.sqlite_backend.conn.close()
+        Cache.backend = None
+        Cache.clear_lru()
+        self.tmpdir.cleanup()
+
+    def test_set_merge(self):
+        Cache().set_ibc_addresses({"ibc/AAA": "uatom", "ibc/BBB": "ibc/BBB"})
+        Cache().set_ibc_addresses({"ibc/CCC": "uosmo"})
+
+        # Read back from backend (not lru)
+        Cache.clear_lru()
+        self.assertEqual(Cache().get_ibc_addresses(), {"ibc/AAA": "uatom", "ibc/CCC": "uosmo"})
+        self.assertEqual(Cache().get_koinly_null_map(), [])
+
+        Cache().set_koinly_null_map(["NULL1", "NULL2"])
+        Cache.clear_lru()
+        self.assertEqual(Cache().get_koinly_null_map(), ["NULL1", "NULL2"])
+
+    def test_set_merge_writes_changed_keys_only(self):
+        Cache.backend = MemoryCacheBackend()
+        Cache().set_osmo_exponents({"uosmo": 6, "uion": 6})
+
+        addrs = Cache().get_osmo_exponents()
+        addrs["ibc/AAA"] = 18
+        with patch.object(MemoryCacheBackend, "upsert") as mock_upsert, \
+             patch.object(MemoryCacheBackend, "get") as mock_get:
+            Cache().set_osmo_exponents(addrs)
+            Cache().set_osmo_exponents(addrs)
+
+        mock_upsert.assert_called_once_with("osmo_exponents", {"ibc/AAA": 18})
+        mock_get.assert_not_called()
+        self.assertEqual(Cache().get_osmo_exponents(), {"uosmo": 6, "uion": 6, "ibc/AAA": 18})
+
+    def test_overwrite_field_not_in_lru(self):
+        # Another process updates koinly null map after this process read it
+        Cache().set_koinly_null_map(["NULL1"])
+        self.assertEqual(Cache().get_koinly_null_map(), ["NULL1"])
+        self.sqlite_backend.put("koinly_null_map", ["NULL1", "NULL2"])
+
+        self.assertEqual(Cache().get_koinly_null_map(), ["NULL1", "NULL2"])
+
+    def test_lru_ttl(self):
+        Cache().set_ibc_addresses({"ibc/AAA": "uatom"})
+        self.assertEqual(Cache().get_ibc_addresses(), {"ibc/AAA": "uatom"})
+
+        # Another process adds key: seen once lru entry expires
+        self.sqlite_backend.upsert("ibc_addresses", {"ibc/BBB": "uosmo"})
+        self.assertEqual(Cache().get_ibc_addresses(), {"ibc/AAA": "uatom"})
+        with patch("staketaxcsv.common.Cache.LRU_TTL_SECONDS", 0):
+            Cache().set_ibc_addresses({"ibc/CCC": "ujuno"})
+        self.assertEqual(Cache().get_ibc_addresses(), {"ibc/AAA": "uatom", "ibc/BBB": "uosmo", "ibc/CCC": "ujuno"})
+
+    def test_lru_stores_copy(self):
+        addrs = {"ibc/AAA": "uatom"}
+        Cache().set_ibc_addresses(addrs)
+        addrs["ibc/BBB"] = "uosmo"
+
+        self.assertEqual(Cache().get_ibc_addresses(), {"ibc/AAA": "uatom"})
+
+
+def _client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "op")
+
+
+class TestDynamoCacheBackend(unittest.TestCase):
+
+    def _backend(self):
+        backend = DynamoCacheBackend.__new__(DynamoCacheBackend)
+        backend.table = MagicMock()
+        return backend
+
+    def test_upsert_creates_missing_item(self):
+        backend = self._backend()
+        backend.table.update_item.side_effect = _client_error("ValidationException")
+
+        backend.upsert("ibc_addresses", {"ibc/AAA": "uatom"})
+
+        backend.table.put_item.assert_called_once()
+        kwargs = backend.table.put_item.call_args.kwargs
+        self.assertEqual(kwargs["Item"], {"field": "ibc_addresses", "data": {"ibc/AAA": "uatom"}})
+        self.assertEqual(kwargs["ConditionExpression"], "attribute_not_exists(#f)")
+
+    def test_upsert_existing_item_validation_error_raises(self):
+        # i.e. item exceeds 400KB: must not replace the stored map with only the new keys
+        backend = self._backend()
+        backend.table.update_item.side_effect = _client_error("ValidationException")
+        backend.table.put_item.side_effect = _client_error("ConditionalCheckFailedException")
+
+        with self.assertRaises(ClientError) as cm:
+            backend.upsert("ibc_addresses", {"ibc/AAA": "uatom"})
+
+        self.assertEqual(cm.exception.response["Error"]["Code"], "ValidationException")
+        backend.table.put_item.assert_called_once()
@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.common.checkpoint import Checkpoint
+from staketaxcsv.common.Exporter import Exporter, Row
+from staketaxcsv.common.ibc.util_ibc import filter_newer, reached_height
+
+WALLET_ADDRESS = "cosmos1abc"
+
+
+class FakeConfig:
+    incremental = True
+    start_date = None
+    end_date = None
+
+
+def _row(txid, amount):
+    return Row("2024-01-01 00:00:00", "STAKING", amount, "ATOM", "", "", 0, "", "", WALLET_ADDRESS, txid)
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.patch = patch("staketaxcsv.settings_csv.CHECKPOINT_DIR", self.tmpdir.name)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        self.tmpdir.cleanup()
+
+    def test_save_restore(self):
+        checkpoint = Checkpoint(FakeConfig(), "ATOM", WALLET_ADDRESS)
+        self.assertIsNone(checkpoint.height)
+
+        exporter = Exporter(WALLET_ADDRESS)
+        exporter.ingest_row(_row("tx1", 1.5))
+        checkpoint.save(exporter, [{"height": "100", "txhash": "tx1"}, {"height": "90", "txhash": "tx0"}])
+
+        checkpoint = Checkpoint(FakeConfig(), "ATOM", WALLET_ADDRESS)
+        self.assertEqual(checkpoint.height, 100)
+        self.assertEqual(checkpoint.txhash, "tx1")
+
+        exporter = Exporter(WALLET_ADDRESS)
+        checkpoint.restore(exporter)
+        self.assertEqual(len(exporter.rows), 1)
+        self.assertEqual(exporter.rows[0].as_array(), _row("tx1", 1.5).as_array())
+
+    def test_disabled_with_date_range(self):
+        config = FakeConfig()
+        config.start_date = "2024-01-01"
+        checkpoint = Checkpoint(config, "ATOM", WALLET_ADDRESS)
+
+        exporter = Exporter(WALLET_ADDRESS)
+        exporter.ingest_row(_row("tx1", 1.5))
+        checkpoint.save(exporter, [{"height": "100", "txhash": "tx1"}])
+
+        self.assertIsNone(Checkpoint(FakeConfig(), "ATOM", WALLET_ADDRESS).height)
+
+    def test_min_height_filter(self):
+        elems = [{"height": "103"}, {"height": "101"}, {"height": "100"}]
+
+        self.assertTrue(reached_height(elems, 100))
+        self.assertFalse(reached_height(elems, 99))
+        self.assertFalse(reached_height(elems, None))
+        self.assertEqual(filter_newer(elems, 100), elems[:2])
+        self.assertEqual(filter_newer(elems, None), elems)
@@ -0,0 +1,109 @@
+import csv
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.common import ExporterTypes as et
+from staketaxcsv.common import exporter_balances
+from staketaxcsv.common.Exporter import Exporter, Row
+from staketaxcsv.common.exporter_koinly import LOCAL_MAP
+
+WALLET_ADDRESS = "osmo1abc"
+CURRENCIES = ["OSMO", "ATOM", "USDC", "GAMM-1", "STARS", "JUNO", "ION"]
+
+
+class FakeConfig:
+    koinlynullmap = LOCAL_MAP
+    lp_treatment = et.LP_TREATMENT_TRANSFERS
+
+
+def _exporter(num_rows, seed=0):
+    rng = random.Random(seed)
+    exporter = Exporter(WALLET_ADDRESS, FakeConfig(), "OSMO")
+    for i in range(num_rows):
+        received = rng.choice(["", rng.random() * 100, rng.randint(1, 5)])
+        sent = rng.choice(["", rng.random() * 10])
+        fee = rng.choice([0, 0.0001 * rng.randint(1, 100)])
+        exporter.ingest_row(Row(
+            "2023-01-{:02d} {:02d}:{:02d}:00".format(1 + i // 1440, i // 60 % 24, i % 60), et.TX_TYPE_TRADE,
+            received, rng.choice(CURRENCIES) if received else "",
+            sent, rng.choice(CURRENCIES) if sent else "",
+            fee, "OSMO" if fee else "", "osmo_blockchain", WALLET_ADDRESS, f"tx{i}", z_index=i))
+    return exporter
+
+
+def _expected_dense(exporter, truncate=None):
+    """ Balances computed one row at a time, for comparison """
+    exporter.sort_rows(reverse=False)
+    currencies = sorted({cur for row in exporter.rows
+                         for cur in (row.received_currency, row.sent_currency, row.fee_currency) if cur})
+    balances = {currency: 0 for currency in currencies}
+
+    table = []
+    for row in exporter.rows:
+        if row.received_currency and row.received_amount:
+            balances[row.received_currency] += float(row.received_amount)
+        if row.sent_currency and row.sent_amount:
+            balances[row.sent_currency] -= float(row.sent_amount)
+        if row.fee_currency and row.fee:
+            balances[row.fee_currency] -= float(row.fee)
+        table.append([row.timestamp, row.txid] + [str(balances[currency]) for currency in currencies])
+    table.reverse()
+    if truncate:
+        table = table[:truncate]
+    return [["timestamp", "txid"] + currencies] + table
+
+
+class TestExportBalances(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "balances.csv")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _read(self):
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))
+
+    @patch.object(exporter_balances, "CHUNK_ROWS", 7)
+    def test_dense(self):
+        exporter = _exporter(100)
+        exporter.export_balances_csv(self.path)
+        self.assertEqual(self._read(), _expected_dense(exporter))
+
+        exporter.export_balances_csv(self.path, truncate=20)
+        self.assertEqual(self._read(), _expected_dense(exporter, truncate=20))
+
+    def test_empty(self):
+        _exporter(0).export_balances_csv(self.path)
+        self.assertEqual(self._read(), [["timestamp", "txid"]])
+
+    def test_sparse(self):
+        exporter = _exporter(50)
+        exporter.export_balances_csv(self.path, sparse=True)
+        lines = self._read()
+        self.assertEqual(lines[0], ["timestamp", "txid", "currency", "balance"])
+
+        # Same balances as dense rows, for currencies changed by each row
+        dense = _expected_dense(exporter)
+        header, dense = dense[0], {line[1]: line for line in dense[1:]}
+        changed = {}
+        for timestamp, txid, currency, balance in lines[1:]:
+            self.assertEqual(dense[txid][header.index(currency)], balance)
+            changed.setdefault(txid, []).append(currency)
+
+        rows = {row.txid: row for row in exporter.rows}
+        for txid, currencies in changed.items():
+            row = rows[txid]
+            expected = {cur for cur, amount in ((row.received_currency, row.received_amount),
+                                                (row.sent_currency, row.sent_amount),
+                                                (row.fee_currency, row.fee)) if cur and amount}
+            self.assertEqual(currencies, sorted(expected))
+
+        # newest row first
+        txids = list(dict.fromkeys(line[1] for line in lines[1:]))
+        self.assertEqual(txids, sorted(txids, key=lambda txid: -int(txid[2:])))
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from staketaxcsv.common import ExporterTypes as et
+from staketaxcsv.common.Exporter import Exporter, Row
+from staketaxcsv.common.exporter_koinly import LOCAL_MAP
+
+WALLET_ADDRESS = "osmo1abc"
+
+
+class FakeConfig:
+    koinlynullmap = LOCAL_MAP
+    lp_treatment = et.LP_TREATMENT_TRANSFERS
+
+
+def _exporter():
+    exporter = Exporter(WALLET_ADDRESS, FakeConfig(), "OSMO")
+    rows = [
+        ("2023-01-01 00:00:00", et.TX_TYPE_STAKING, 1.5, "OSMO", "", "", 0, "", "tx1"),
+        ("2023-01-02 00:00:00", et.TX_TYPE_TRADE, 10, "ATOM", 100, "OSMO", 0.01, "OSMO", "tx2"),
+        ("2023-01-03 00:00:00", et.TX_TYPE_LP_DEPOSIT, 1, "GAMM-1", 50, "OSMO", 0.01, "OSMO", "tx3"),
+        ("2023-01-03 00:00:00", et.TX_TYPE_LP_DEPOSIT, 1, "GAMM-1", 5, "ATOM", 0, "", "tx3"),
+        ("2023-01-04 00:00:00", et.TX_TYPE_LP_WITHDRAW, 48, "OSMO", 1, "GAMM-1", 0.01, "OSMO", "tx4"),
+        ("2023-01-05 00:00:00", et.TX_TYPE_TRANSFER, "", "", 20, "OSMO", 0.01, "OSMO", "tx5"),
+        ("2023-01-06 00:00:00", et.TX_TYPE_UNKNOWN, "", "", "", "", 0.01, "OSMO", "tx6"),
+    ]
+    for i, (ts, tx_type, r_amt, r_cur, s_amt, s_cur, fee, fee_cur, txid) in enumerate(rows):
+        exporter.ingest_row(Row(ts, tx_type, r_amt, r_cur, s_amt, s_cur, fee, fee_cur, "osmo_blockchain",
+                                WALLET_ADDRESS, txid, z_index=i))
+    exporter.sort_rows()
+    return exporter
+
+
+class TestExportFormats(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _formats_paths(self, name):
+        dirpath = os.path.join(self.tmpdir.name, name)
+        os.makedirs(dirpath)
+        return {csvformat: os.path.join(dirpath, f"{csvformat}.csv") for csvformat in et.FORMATS}
+
+    def _read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _assert_same_as_single(self, max_workers):
+        expected = {}
+        for csvformat, csvpath in self._formats_paths("single").items():
+            _exporter().export_format(csvformat, csvpath)
+            expected[csvformat] = csvpath
+
+        written = _exporter().export_formats(self._formats_paths("all"), max_workers=max_workers)
+
+        self.assertEqual(list(written.keys()), et.FORMATS)
+        for csvformat in et.FORMATS:
+            self.assertTrue(os.path.exists(written[csvformat]), csvformat)
+            self.assertEqual(self._read(expected[csvformat]),
+                             self._read(written[csvformat].replace(".xlsx", ".csv")), csvformat)
+
+    def test_export_formats(self):
+        self._assert_same_as_single(max_workers=1)
+
+    def test_export_formats_process_pool(self):
+        self._assert_same_as_single(max_workers=3)
@@ -0,0 +1,46 @@
+import unittest
+
+from staketaxcsv.common import ExporterTypes as et
+from staketaxcsv.common.exporter_currency import currency_map
+from staketaxcsv.common.exporter_koinly import NullMap, LOCAL_MAP
+from staketaxcsv.settings_csv import TICKER_ALGO, TICKER_ATOM, TICKER_LUNA1, TICKER_LUNA2
+
+
+class TestExporterCurrency(unittest.TestCase):
+
+    def test_koinly(self):
+        self.assertEqual(currency_map(et.FORMAT_KOINLY, TICKER_LUNA2).get("Luna"), "ID:6089")
+        self.assertEqual(currency_map(et.FORMAT_KOINLY, TICKER_LUNA1).get("LUNA"), "LUNA")
+        self.assertEqual(currency_map(et.FORMAT_KOINLY, TICKER_ALGO).get("BANK"), "ID:7452250")
+        self.assertEqual(currency_map(et.FORMAT_KOINLY, TICKER_ATOM).get("BANK"), "BANK")
+        self.assertEqual(currency_map(et.FORMAT_KOINLY, TICKER_ATOM).get("stars"), "ID:36899")
+        self.assertEqual(currency_map(et.FORMAT_KOINLY, TICKER_ATOM).get(""), "")
+
+    def test_cointracking(self):
+        self.assertEqual(currency_map(et.FORMAT_COINTRACKING, TICKER_LUNA1).get("LUNA"), "LUNA2")
+        self.assertEqual(currency_map(et.FORMAT_COINTRACKING, TICKER_LUNA2).get("LUNA"), "LUNA3")
+        self.assertEqual(currency_map(et.FORMAT_COINTRACKING, TICKER_ATOM).get("atom"), "ATOM2")
+        self.assertEqual(currency_map(et.FORMAT_COINTRACKING, TICKER_ATOM).get("OSMO"), "OSMO")
+
+    def test_memoized(self):
+        self.assertIs(currency_map(et.FORMAT_KOINLY, TICKER_ALGO), currency_map(et.FORMAT_KOINLY, TICKER_ALGO))
+
+        cmap = currency_map(et.FORMAT_COINTRACKING, TICKER_ALGO)
+        for _ in range(1000):
+            cmap.get("ATOM")
+            cmap.get("ALGO")
+        self.assertEqual(cmap.mapped["ATOM"], "ATOM2")
+        self.assertEqual(cmap.mapped["ALGO"], "ALGO")
+
+    def test_null_map(self):
+        null_map = NullMap(LOCAL_MAP)
+        null_map.load()
+        self.assertEqual(null_map.get_null_symbol("GAMM-1"), "NULL1")
+        self.assertEqual(null_map.get_null_symbol("GAMM-2"), "NULL2")
+        self.assertEqual(null_map.get_null_symbol("GAMM-1"), "NULL1")
+
+        # replaced map (i.e. loaded from cache)
+        null_map.null_map = ["LP_MIR_UST", "GAMM-2"]
+        self.assertEqual(null_map.get_null_symbol("GAMM-2"), "NULL2")
+        self.assertEqual(null_map.get_null_symbol("GAMM-1"), "NULL3")
+        self.assertEqual(null_map.null_map, ["LP_MIR_UST", "GAMM-2", "GAMM-1"])
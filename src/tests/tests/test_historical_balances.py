@@ -0,0 +1,113 @@
+import random
+import unittest
+from collections import defaultdict
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from dateutil import parser
+from staketaxcsv.common.ibc import api_mintscan_v1, denoms, historical_balances
+from staketaxcsv.common.ibc.api_lcd_v1 import LcdAPI_v1
+from staketaxcsv.settings_csv import TICKER_ATOM
+
+NODE = "https://lcd.example.com"
+ADDRESS = "cosmos1qqp2aydslhpx4emvqdhsyn8ztrltd4zezcr22h"
+IBC_OSMO = "ibc/ED07A3391A112B175915CD8FAF43A2DA8E4790EDE12566649D0C2F97716B8518"  # hard-coded in IBCAddrs
+IBC_TEST = "ibc/{}".format("A" * 64)
+DENOMS = ["uatom", "aevmos", "basecro", "gamm/pool/1", "stuatom", "weird", IBC_OSMO, IBC_TEST]
+
+NUM_ENTRIES = 600
+FIRST_TIME = datetime(2023, 1, 1)
+
+
+def _amount(rng):
+    return str(rng.choice([0, 1, rng.randint(1, 10 ** 8), rng.randint(10 ** 18, 10 ** 24)]))
+
+
+def _entry(rng, i):
+    # mintscan returns both timestamp formats (odd i, including newest entry, use "YYYY-MM-DD HH:MM:SS")
+    timestamp_format = "%Y-%m-%d %H:%M:%S" if i % 2 else "%Y-%m-%dT%H:%M:%SZ"
+    return {
+        "timestamp": (FIRST_TIME + timedelta(hours=i)).strftime(timestamp_format),
+        "bank": [{"denom": rng.choice(DENOMS), "amount": _amount(rng)} for _ in range(rng.randint(0, 4))],
+        "delegation": [{"balance": {"denom": "uatom", "amount": _amount(rng)}} for _ in range(rng.randint(0, 3))],
+        "unbonding": [{"entries": [{"balance": _amount(rng)}]} for _ in range(rng.randint(0, 2))],
+        "reward": [{"reward": [{"denom": rng.choice(DENOMS), "amount": "{:.18f}".format(rng.random() * 10 ** 6)}]}
+                   for _ in range(rng.randint(0, 2))],
+    }
+
+
+ENTRIES = [_entry(random.Random(i), i) for i in range(NUM_ENTRIES)][::-1]  # newest first
+
+
+def _expected(entries, bond_denom):
+    """ Balances summed one item at a time, for comparison """
+    out = []
+    for entry in entries:
+        balance = defaultdict(int)
+        items = [(item["denom"], int(item["amount"])) for item in entry["bank"]]
+        items += [(item["balance"]["denom"], int(item["balance"]["amount"])) for item in entry["delegation"]]
+        items += [(bond_denom, int(subitem["balance"])) for item in entry["unbonding"] for subitem in item["entries"]]
+        items += [(subitem["denom"], float(subitem["amount"])) for item in entry["reward"] for subitem in item["reward"]]
+        for denom, amount_raw in items:
+            amount, currency = denoms.amount_currency_from_raw(amount_raw, denom, NODE)
+            balance[currency] += amount
+        out.append({cur: amount for cur, amount in balance.items() if amount >= historical_balances.TINY_AMOUNT})
+    return out
+
+
+def mock_get_balances(self, address, search_after=None, limit=20, from_date_time=None, to_date_time=None):
+    from_dt = datetime.strptime(from_date_time, api_mintscan_v1.DATETIME_FORMAT)
+    to_dt = datetime.strptime(to_date_time, api_mintscan_v1.DATETIME_FORMAT) if to_date_time else datetime.max
+
+    # newest first
+    elems = [entry for entry in ENTRIES
+             if from_dt <= parser.parse(entry["timestamp"]).replace(tzinfo=None) <= to_dt]
+    start = int(search_after) if search_after else 0
+    page = elems[start:start + limit]
+
+    return {
+        "balances": page,
+        "pagination": {
+            "searchAfter": str(start + limit) if start < len(elems) else None,
+            "totalCount": len(elems),
+        }
+    }
+
+
+@patch("staketaxcsv.common.ibc.api_mintscan_v1.MINTSCAN_KEY", new="key")
+@patch("staketaxcsv.common.ibc.api_mintscan_v1.MintscanAPI._get_balances", new=mock_get_balances)
+class TestHistoricalBalances(unittest.TestCase):
+
+    def setUp(self):
+        denoms.IBCAddrs.addrs.pop(IBC_TEST, None)
+
+    def tearDown(self):
+        denoms.IBCAddrs.addrs.pop(IBC_TEST, None)
+
+    def test_get_balances_all_sharded(self):
+        sequential = api_mintscan_v1.get_balances_all(TICKER_ATOM, ADDRESS, 5000, max_workers=1)
+        sharded = api_mintscan_v1.get_balances_all(TICKER_ATOM, ADDRESS, 5000, max_workers=4)
+
+        self.assertEqual(len(sequential), NUM_ENTRIES)
+        self.assertEqual([e["timestamp"] for e in sharded], [e["timestamp"] for e in sequential])
+
+        # newest entries up to max_txs
+        sharded = api_mintscan_v1.get_balances_all(TICKER_ATOM, ADDRESS, 510, max_workers=4)
+        self.assertEqual([e["timestamp"] for e in sharded], [e["timestamp"] for e in ENTRIES[:520]])
+
+    @patch.object(LcdAPI_v1, "ibc_address_to_denom", return_value="ujuno")
+    @patch("staketaxcsv.common.ibc.historical_balances.make_lcd_api")
+    def test_via_mintscan(self, mock_make_lcd_api, mock_ibc_address_to_denom):
+        mock_make_lcd_api.return_value = MagicMock(get_bond_denom=MagicMock(return_value="uatom"))
+
+        exporter = historical_balances.via_mintscan(NODE, TICKER_ATOM, ADDRESS, 5000)
+
+        # one lcd query for the ibc address, for all entries
+        self.assertEqual(mock_ibc_address_to_denom.call_count, 1)
+
+        expected = _expected(ENTRIES, "uatom")
+        self.assertEqual([row["balances"] for row in exporter.rows], expected)
+        self.assertEqual([row["timestamp"] for row in exporter.rows],
+                         [entry["timestamp"].replace("T", " ").replace("Z", "") for entry in ENTRIES])
+        self.assertEqual(exporter.currencies_list(),
+                         sorted({currency for balance in expected for currency in balance}))
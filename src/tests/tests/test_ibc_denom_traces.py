@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.common.ibc.api_lcd_v1 import LcdAPI_v1
+from staketaxcsv.common.ibc.denoms import (
+    DenomTraces, IBCAddrs, amount_currency_from_raw, prefetch_ibc_addresses, DENOM_TRACES_BULK_MIN)
+
+NODE = "https://lcd.example.com"
+IBC_ATOM = "ibc/27394FB092D2ECCD56123C74F36E4C1F926001CEADA9CA97EA622B25F41E5EB2"
+TRACE_ATOM = {"path": "transfer/channel-0", "base_denom": "uatom"}
+
+
+def _fake_trace(i):
+    return {"path": "transfer/channel-{}".format(i + 1), "base_denom": "ufake{}".format(i)}
+
+
+def _ibc_address(trace):
+    with patch.object(LcdAPI_v1, "_denom_traces", mock_denom_traces_pages([trace], 1)):
+        return next(iter(LcdAPI_v1(NODE).denom_traces()[0]))
+
+
+def mock_denom_traces_pages(traces, page_size):
+    def _denom_traces(self, pagination_key=None):
+        start = int(pagination_key) if pagination_key else 0
+        end = start + page_size
+        return {
+            "denom_traces": traces[start:end],
+            "pagination": {
+                "next_key": str(end) if end < len(traces) else None,
+                "total": str(len(traces)) if not pagination_key else "0",
+            }
+        }
+    return _denom_traces
+
+
+class TestIbcDenomTraces(unittest.TestCase):
+
+    def setUp(self):
+        DenomTraces.index.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "denom_traces.db")
+
+    def tearDown(self):
+        DenomTraces.index.clear()
+        self.tmpdir.cleanup()
+
+    def test_denom_traces_page(self):
+        traces = [TRACE_ATOM, {"path": "", "base_denom": "uosmo"}]
+        with patch.object(LcdAPI_v1, "_denom_traces", mock_denom_traces_pages(traces, 10)):
+            page, next_key, total = LcdAPI_v1(NODE).denom_traces()
+
+        self.assertEqual(page, {IBC_ATOM: "uatom"})
+        self.assertEqual(next_key, None)
+        self.assertEqual(total, 2)
+
+    def test_load_incremental(self):
+        traces = [TRACE_ATOM] + [_fake_trace(i) for i in range(4)]
+
+        with patch("staketaxcsv.settings_csv.IBC_DENOM_TRACES_DB", self.db_path), \
+             patch("staketaxcsv.common.ibc.denom_traces_local.IBC_DENOM_TRACES_DB", self.db_path):
+            # first run: all pages fetched and stored
+            with patch.object(LcdAPI_v1, "_denom_traces", autospec=True,
+                              side_effect=mock_denom_traces_pages(traces, 2)) as mock_query:
+                DenomTraces.load(NODE)
+            self.assertEqual(mock_query.call_count, 3)
+            self.assertEqual(DenomTraces.lookup(NODE, IBC_ATOM), "uatom")
+            self.assertEqual(len(DenomTraces.index[NODE]), 5)
+
+            # next run: store up to date, so only first page queried
+            DenomTraces.index.clear()
+            with patch.object(LcdAPI_v1, "_denom_traces", autospec=True,
+                              side_effect=mock_denom_traces_pages(traces, 2)) as mock_query:
+                DenomTraces.load(NODE)
+            self.assertEqual(mock_query.call_count, 1)
+            self.assertEqual(len(DenomTraces.index[NODE]), 5)
+
+            # new trace on chain (listing is in hash order, so not necessarily last): paging stops once found
+            DenomTraces.index.clear()
+            traces.insert(3, _fake_trace(4))
+            with patch.object(LcdAPI_v1, "_denom_traces", autospec=True,
+                              side_effect=mock_denom_traces_pages(traces, 2)) as mock_query:
+                DenomTraces.load(NODE)
+            self.assertEqual(mock_query.call_count, 2)
+            self.assertEqual(len(DenomTraces.index[NODE]), 6)
+            self.assertEqual(DenomTraces.lookup(NODE, _ibc_address(_fake_trace(4))), "ufake4")
+
+    @patch("staketaxcsv.settings_csv.DB_CACHE", False)
+    @patch.object(LcdAPI_v1, "ibc_address_to_denom", return_value="uatom")
+    def test_prefetch_few_addresses(self, mock_lookup):
+        elems = [{"tx": {"body": {"messages": [{"token": {"denom": IBC_ATOM, "amount": "1"}}]}}}] * 3
+
+        with patch.dict(IBCAddrs.addrs), \
+             patch.object(LcdAPI_v1, "_denom_traces") as mock_query:
+            prefetch_ibc_addresses(NODE, elems)
+            self.assertEqual(IBCAddrs.addrs[IBC_ATOM], "uatom")
+
+        mock_query.assert_not_called()
+        self.assertEqual(mock_lookup.call_count, 1)
+
+    @patch("staketaxcsv.settings_csv.DB_CACHE", False)
+    @patch.object(LcdAPI_v1, "ibc_address_to_denom", return_value="unused")
+    def test_prefetch_bulk(self, mock_lookup):
+        traces = [_fake_trace(i) for i in range(DENOM_TRACES_BULK_MIN + 5)]
+        with patch.object(LcdAPI_v1, "_denom_traces", mock_denom_traces_pages(traces, 1000)):
+            addresses = list(LcdAPI_v1(NODE).denom_traces()[0].keys())
+        elems = [{"logs": [{"events": [{"attributes": [{"value": "1" + addr}]}]}]} for addr in addresses]
+
+        with patch.dict(IBCAddrs.addrs), \
+             patch.object(LcdAPI_v1, "_denom_traces", mock_denom_traces_pages(traces, 1000)):
+            prefetch_ibc_addresses(NODE, elems)
+            self.assertEqual(IBCAddrs.addrs[addresses[0]], "ufake0")
+
+        mock_lookup.assert_not_called()
+
+    @patch("staketaxcsv.settings_csv.DB_CACHE", False)
+    @patch.object(LcdAPI_v1, "ibc_address_to_denom", return_value="uatom")
+    def test_prefetch_collects_denom_fields_and_events(self, mock_lookup):
+        addrs = ["ibc/{}".format(c * 64) for c in "ABCDE"]
+        elems = [{
+            "tx": {
+                "body": {"messages": [{"routes": [{"token_out_denom": addrs[0]}], "memo": addrs[4]}]},
+                "auth_info": {"fee": {"amount": [{"denom": addrs[1], "amount": "1"}]}},
+            },
+            "logs": [{"events": [{"attributes": [{"key": "amount", "value": "5uatom,1" + addrs[2]}]}]}],
+            "events": [{"attributes": [{"key": "amount", "value": "7" + addrs[3]}]}],
+        }]
+
+        with patch.dict(IBCAddrs.addrs):
+            prefetch_ibc_addresses(NODE, elems)
+            # (non-denom fields not scanned)
+            self.assertEqual(sorted(addr for addr in IBCAddrs.addrs if addr in addrs), addrs[:4])
+
+    @patch("staketaxcsv.settings_csv.DB_CACHE", False)
+    @patch.object(LcdAPI_v1, "ibc_address_to_denom", side_effect=Exception("timeout"))
+    def test_prefetch_failure_remembered(self, mock_lookup):
+        elems = [{"tx": {"body": {"messages": [{"token": {"denom": IBC_ATOM, "amount": "1000000"}}]}}}]
+
+        with patch.dict(IBCAddrs.addrs):
+            prefetch_ibc_addresses(NODE, elems)
+            amount, currency = amount_currency_from_raw("1000000", IBC_ATOM, NODE)
+
+        self.assertEqual((amount, currency), (1.0, "unknown_" + IBC_ATOM))
+        self.assertEqual(mock_lookup.call_count, 1)
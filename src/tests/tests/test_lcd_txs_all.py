@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.common.ibc import api_lcd_v1, api_lcd_v2
+from staketaxcsv.common.ibc.constants import EVENTS_TYPE_SENDER, EVENTS_TYPE_RECIPIENT
+
+NODE = "https://lcd.example.com"
+ADDRESS = "cosmos1qqp2aydslhpx4emvqdhsyn8ztrltd4zezcr22h"
+NUM_TXS = 23
+
+
+def _fake_elems(events_type, start, count):
+    out = []
+    for i in range(start, min(start + count, NUM_TXS)):
+        # sender/recipient overlap on even txs, to exercise remove_duplicates()
+        txhash = f"TX{i:04d}" if i % 2 == 0 else f"{events_type}{i:04d}"
+        out.append({"txhash": txhash, "timestamp": f"2024-01-01T00:00:{i:02d}Z"})
+    return out
+
+
+def mock_get_txs_v1(self, wallet_address, events_type, offset, limit, sleep_seconds):
+    return {
+        "tx_responses": _fake_elems(events_type, offset, limit),
+        "pagination": {"total": str(NUM_TXS)},
+    }
+
+
+def mock_get_txs_v2(self, wallet_address, events_type, page, limit, sleep_seconds, heights=None):
+    return {
+        "tx_responses": _fake_elems(events_type, (page - 1) * limit, limit),
+        "total": str(NUM_TXS),
+    }
+
+
+class TestLcdTxsAll(unittest.TestCase):
+
+    @patch("staketaxcsv.common.ibc.api_lcd_v1.LcdAPI_v1._get_txs", new=mock_get_txs_v1)
+    def test_v1_concurrent_matches_sequential(self):
+        events_types = [EVENTS_TYPE_SENDER, EVENTS_TYPE_RECIPIENT]
+        sequential = api_lcd_v1.get_txs_all(
+            NODE, ADDRESS, 1000, limit=5, sleep_seconds=0, events_types=events_types, max_workers=1)
+        concurrent = api_lcd_v1.get_txs_all(
+            NODE, ADDRESS, 1000, limit=5, sleep_seconds=0, events_types=events_types, max_workers=4)
+
+        self.assertEqual(len(sequential), NUM_TXS + NUM_TXS // 2)
+        self.assertEqual(concurrent, sequential)
+
+    @patch("staketaxcsv.common.ibc.api_lcd_v1.LcdAPI_v1._get_txs", new=mock_get_txs_v1)
+    def test_v1_max_txs(self):
+        elems = api_lcd_v1.get_txs_all(
+            NODE, ADDRESS, 10, limit=5, sleep_seconds=0, events_types=[EVENTS_TYPE_SENDER], max_workers=4)
+        self.assertEqual(len(elems), 10)
+
+    @patch("staketaxcsv.common.ibc.api_lcd_v2.LcdAPI_v2.cosmos_sdk_version", new=lambda self: "0.50.1")
+    @patch("staketaxcsv.common.ibc.api_lcd_v2.LcdAPI_v2._get_txs", new=mock_get_txs_v2)
+    def test_v2_concurrent_matches_sequential(self):
+        events_types = [EVENTS_TYPE_SENDER, EVENTS_TYPE_RECIPIENT]
+        sequential = api_lcd_v2.get_txs_all(
+            NODE, ADDRESS, 1000, limit=5, sleep_seconds=0, events_types=events_types, max_workers=1)
+        concurrent = api_lcd_v2.get_txs_all(
+            NODE, ADDRESS, 1000, limit=5, sleep_seconds=0, events_types=events_types, max_workers=4)
+
+        self.assertEqual(len(sequential), NUM_TXS + NUM_TXS // 2)
+        self.assertEqual(concurrent, sequential)
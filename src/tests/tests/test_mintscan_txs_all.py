@@ -0,0 +1,54 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from staketaxcsv.common.ibc import api_mintscan_v1
+from staketaxcsv.settings_csv import TICKER_ATOM
+
+ADDRESS = "cosmos1qqp2aydslhpx4emvqdhsyn8ztrltd4zezcr22h"
+NUM_TXS = 1200
+FIRST_TX_TIME = datetime(2022, 3, 1)
+
+# Uneven density: burst of txs in first day, then one every 6 hours
+TX_TIMES = [FIRST_TX_TIME + timedelta(minutes=i) for i in range(600)] + \
+           [FIRST_TX_TIME + timedelta(days=1, hours=6 * i) for i in range(NUM_TXS - 600)]
+
+
+def mock_get_txs(self, address, search_after=None, limit=20, from_date_time=None, to_date_time=None):
+    from_dt = datetime.strptime(from_date_time, api_mintscan_v1.DATETIME_FORMAT)
+    to_dt = datetime.strptime(to_date_time, api_mintscan_v1.DATETIME_FORMAT) if to_date_time else datetime.max
+
+    # newest first
+    elems = [
+        {"txhash": f"TX{i:05d}", "timestamp": t.strftime("%Y-%m-%dT%H:%M:%SZ"), "tx": {}}
+        for i, t in enumerate(TX_TIMES) if from_dt <= t <= to_dt
+    ][::-1]
+    start = int(search_after) if search_after else 0
+    page = elems[start:start + limit]
+
+    return {
+        "transactions": page,
+        "pagination": {
+            "searchAfter": str(start + limit) if start < len(elems) else None,
+            "totalCount": len(elems),
+        }
+    }
+
+
+@patch("staketaxcsv.common.ibc.api_mintscan_v1.MINTSCAN_KEY", new="key")
+@patch("staketaxcsv.common.ibc.api_mintscan_v1.MintscanAPI._get_txs", new=mock_get_txs)
+class TestMintscanTxsAll(unittest.TestCase):
+
+    def test_sharded_matches_sequential(self):
+        sequential = api_mintscan_v1.get_txs_all(TICKER_ATOM, ADDRESS, 5000, max_workers=1)
+        sharded = api_mintscan_v1.get_txs_all(TICKER_ATOM, ADDRESS, 5000, max_workers=4)
+
+        self.assertEqual(len(sequential), NUM_TXS)
+        self.assertEqual([e["txhash"] for e in sharded], [e["txhash"] for e in sequential])
+
+    def test_sharded_max_txs(self):
+        elems = api_mintscan_v1.get_txs_all(TICKER_ATOM, ADDRESS, 700, end_date="2030-01-01", max_workers=4)
+
+        # newest 700 txs
+        self.assertEqual(len(elems), 700)
+        self.assertEqual(elems[-1]["txhash"], f"TX{NUM_TXS - 1:05d}")
@@ -0,0 +1,43 @@
+import glob
+import json
+import unittest
+
+from staketaxcsv.common.ibc.protobuf_decoder import (
+    CosmosTransactionFeeExtractor,
+    ProtobufParser,
+    decode_fee,
+    decode_fees,
+)
+from tests.utils_ibc import TESTDATADIR, tx_raw_from_lcd
+
+
+def _parse_fee(tx_bytes):
+    callback = CosmosTransactionFeeExtractor()
+    ProtobufParser(tx_bytes, callback).parse()
+    return callback.fee_denom, callback.fee_amount
+
+
+class TestProtobufDecoder(unittest.TestCase):
+
+    def test_decode_fee(self):
+        txs = []
+        for path in sorted(glob.glob(f"{TESTDATADIR}/*.json")):
+            with open(path, "r") as f:
+                elem = json.load(f)
+            txs.append(tx_raw_from_lcd(elem))
+
+            coins = elem["tx"]["auth_info"]["fee"]["amount"]
+            expected = (coins[-1]["denom"], coins[-1]["amount"]) if coins else (None, None)
+            self.assertEqual(decode_fee(txs[-1]), expected, path)
+            self.assertEqual(decode_fee(txs[-1]), _parse_fee(txs[-1]), path)
+
+        self.assertGreater(len(txs), 50)
+        self.assertEqual(decode_fees(txs), [_parse_fee(tx) for tx in txs])
+
+    def test_decode_fee_truncated(self):
+        path = sorted(glob.glob(f"{TESTDATADIR}/*.json"))[0]
+        with open(path, "r") as f:
+            tx_bytes = tx_raw_from_lcd(json.load(f))
+
+        with self.assertRaises(EOFError):
+            decode_fee(tx_bytes[:-5])
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.common.response_cache import response_cache, ResponseCache, TTL_FOREVER
+
+
+def _ttl_pages(call_args, data):
+    if "error" in data:
+        return 0
+    return TTL_FOREVER if call_args["cursor"] else None
+
+
+class FakeAPI:
+
+    def __init__(self, node):
+        self.node = node
+        self.calls = 0
+
+    @response_cache(ttl=_ttl_pages, instance_key=lambda api: api.node)
+    def _get_page(self, address, cursor=None):
+        self.calls += 1
+        if address == "bad":
+            return {"error": "bad address"}
+        return {"node": self.node, "address": address, "cursor": cursor}
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "response_cache.db")
+        self.patches = [
+            patch("staketaxcsv.settings_csv.RESPONSE_CACHE", True),
+            patch("staketaxcsv.settings_csv.RESPONSE_CACHE_PATH", path),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        ResponseCache._instance = None
+        self.tmpdir.cleanup()
+
+    def test_cache_hit_positional_and_keyword(self):
+        api = FakeAPI("https://node1")
+        first = api._get_page("addr1", "abc")
+        second = api._get_page("addr1", cursor="abc")
+
+        self.assertEqual(first, second)
+        self.assertEqual(api.calls, 1)
+
+    def test_instance_key_separates_nodes(self):
+        api1 = FakeAPI("https://node1")
+        api2 = FakeAPI("https://node2")
+        api1._get_page("addr1")
+        result = api2._get_page("addr1")
+
+        self.assertEqual(result["node"], "https://node2")
+        self.assertEqual(api2.calls, 1)
+
+    def test_errors_not_cached(self):
+        api = FakeAPI("https://node1")
+        api._get_page("bad")
+        api._get_page("bad")
+        self.assertEqual(api.calls, 2)
+
+    def test_expired_head_refetched(self):
+        api = FakeAPI("https://node1")
+        with patch("staketaxcsv.settings_csv.RESPONSE_CACHE_TTL_SECONDS", -10):
+            api._get_page("addr1")
+            api._get_page("addr1", "abc")
+        api._get_page("addr1")
+        api._get_page("addr1", "abc")
+
+        # head page expired (refetched), cursor page kept forever
+        self.assertEqual(api.calls, 3)
+
+    def test_disabled(self):
+        api = FakeAPI("https://node1")
+        with patch("staketaxcsv.settings_csv.RESPONSE_CACHE", False):
+            api._get_page("addr1")
+            api._get_page("addr1")
+        self.assertEqual(api.calls, 2)
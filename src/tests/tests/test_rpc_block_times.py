@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.common.ibc.api_rpc import BlockTimes, RpcAPI, _ttl_block
+from staketaxcsv.common.response_cache import TTL_FOREVER
+
+NODE = "https://rpc.example.com"
+
+
+def _time(height):
+    return "2023-01-01T00:{:02d}:{:02d}.123456Z".format(height // 60 % 60, height % 60)
+
+
+def mock_blockchain(self, min_height, max_height):
+    return {
+        "result": {
+            "last_height": "1000",
+            "block_metas": [
+                {"header": {"height": str(h), "time": _time(h)}} for h in range(max_height, min_height - 1, -1)
+            ]
+        }
+    }
+
+
+class TestRpcBlockTimes(unittest.TestCase):
+
+    def setUp(self):
+        BlockTimes.times.clear()
+
+    @patch.object(RpcAPI, "_block")
+    @patch.object(RpcAPI, "_blockchain", side_effect=mock_blockchain, autospec=True)
+    def test_load_block_times(self, mock_blockchain_, mock_block):
+        api = RpcAPI(NODE)
+        api.load_block_times(["100", "101", "119", "120", "300", "101"])
+
+        self.assertEqual([c.args[1:] for c in mock_blockchain_.call_args_list], [(100, 119), (120, 139), (300, 319)])
+
+        # Later lookups (i.e. by new RpcAPI objects for same node) use index
+        self.assertEqual(RpcAPI(NODE).block_time("119"), _time(119))
+        RpcAPI(NODE).load_block_times([101, 300])
+        self.assertEqual(mock_blockchain_.call_count, 3)
+        mock_block.assert_not_called()
+
+    def test_ttl(self):
+        self.assertEqual(_ttl_block({"height": 100}, {"result": {"block": {}}}), TTL_FOREVER)
+        self.assertEqual(_ttl_block({"height": 100}, {"error": "pruned"}), 0)
+
+        # /blockchain window: cached only if it has every height
+        call_args = {"min_height": 990, "max_height": 1009}
+        self.assertEqual(_ttl_block(call_args, mock_blockchain(None, 990, 1009)), TTL_FOREVER)
+        self.assertEqual(_ttl_block(call_args, mock_blockchain(None, 990, 1000)), 0)
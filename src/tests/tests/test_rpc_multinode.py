@@ -0,0 +1,70 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import staketaxcsv.common.ibc.api_rpc_multinode
+from staketaxcsv.common.ibc.progress_rpc_nodes import ProgressRpc
+from staketaxcsv.common.config import config
+
+NODES = ["https://rpc-a.example.com", "https://rpc-b.example.com", "https://rpc-c.example.com"]
+ADDRESS = "cosmos1qqp2aydslhpx4emvqdhsyn8ztrltd4zezcr22h"
+
+
+class NodeCalls:
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def run(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.1)
+        with self.lock:
+            self.active -= 1
+
+
+class TestRpcMultinode(unittest.TestCase):
+
+    def test_get_txs_all(self):
+        calls = NodeCalls()
+
+        def mock_get_txs_all(node, wallet_address, max_txs, progress=None, limit=50, stage_name="default",
+                             heights=None, on_page=None):
+            calls.run()
+            progress.report(1, "Fetching page 1 ...", stage_name)
+            i = NODES.index(node)
+            # node b overlaps with node a and c (same tx at boundary height)
+            elems = [{"hash": f"h{j}", "height": str(j), "timestamp": f"2023-01-01T00:00:{j:02d}Z"}
+                     for j in range(i * 10, i * 10 + 11)]
+            on_page(elems)
+            return elems
+
+        def mock_decode_page(elems):
+            for elem in elems:
+                elem["txhash"] = elem["hash"]
+            return elems
+
+        progress = ProgressRpc(config, 1, 0.1)
+        with patch("staketaxcsv.common.ibc.api_rpc.get_txs_pages_count", return_value=(1, 11)), \
+             patch("staketaxcsv.common.ibc.api_rpc.get_txs_all", side_effect=mock_get_txs_all), \
+             patch("staketaxcsv.common.ibc.api_rpc._decode_page", side_effect=mock_decode_page), \
+             patch("staketaxcsv.common.ibc.api_rpc._add_timestamp_from_block_time"), \
+             patch("staketaxcsv.common.ibc.api_rpc.RpcAPI.load_block_times"):
+            pages, txs = staketaxcsv.common.ibc.api_rpc_multinode.get_txs_pages_count(
+                NODES, ADDRESS, 10000, progress)
+            self.assertEqual((pages, txs), (3, 33))
+            self.assertEqual(list(progress.stages), [n + s for n in NODES for s in ["_fetch", "_normalize"]])
+
+            elems = staketaxcsv.common.ibc.api_rpc_multinode.get_txs_all(NODES, ADDRESS, 10000, progress)
+
+        self.assertGreater(calls.max_active, 1)
+        self.assertEqual(sorted(int(elem["height"]) for elem in elems), list(range(31)))
+        self.assertTrue(all(elem["txhash"] == elem["hash"] for elem in elems))
+        for node in NODES:
+            stage = progress.stages[node + "_normalize"]
+            self.assertEqual(stage.current_task_number, stage.total_tasks)
+            self.assertEqual(progress.stages[node + "_fetch"].current_task_number, 1)
@@ -0,0 +1,107 @@
+import base64
+import copy
+import glob
+import json
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.common.ibc.api_rpc import NormalizePool, RpcAPI, normalize_rpc_txns
+from tests.utils_ibc import TESTDATADIR, tx_raw_from_lcd
+
+NODE = "https://rpc.example.com"
+
+
+def _b64(s):
+    return base64.b64encode(s.encode("utf-8")).decode("utf-8")
+
+
+def _rpc_elem(lcd_elem):
+    """ Returns rpc /tx_search elem for lcd tx elem """
+    logs = lcd_elem.get("logs") or [{"msg_index": 0, "log": "", "events": [
+        {"type": "message", "attributes": [{"key": "action", "value": "/cosmos.bank.v1beta1.MsgSend"}]}]}]
+    return {
+        "hash": lcd_elem["txhash"],
+        "height": lcd_elem["height"],
+        "tx": base64.b64encode(tx_raw_from_lcd(lcd_elem)).decode("utf-8"),
+        "tx_result": {
+            "code": lcd_elem["code"],
+            "log": json.dumps(logs),
+            "events": [{"type": "tx", "attributes": [{"key": _b64("fee"), "value": _b64("100uatom"), "index": True}]}],
+        },
+    }
+
+
+def mock_block_time(self, height):
+    return "2023-01-01T00:00:{:02d}.123456Z".format(int(height) % 60)
+
+
+@patch.object(RpcAPI, "load_block_times")
+@patch.object(RpcAPI, "block_time", new=mock_block_time)
+class TestRpcNormalize(unittest.TestCase):
+
+    def _elems(self):
+        out = []
+        for path in sorted(glob.glob(f"{TESTDATADIR}/*.json")):
+            with open(path, "r") as f:
+                out.append(_rpc_elem(json.load(f)))
+        return out
+
+    def test_normalize(self, mock_load_block_times):
+        elems = self._elems()
+        normalize_rpc_txns(NODE, elems, max_workers=1)
+
+        elem = elems[0]
+        self.assertEqual(elem["txhash"], elem["hash"])
+        self.assertEqual(elem["timestamp"], "2023-01-01T00:00:{:02d}Z".format(int(elem["height"]) % 60))
+        self.assertEqual(elem["tx_result"]["events"][0]["attributes"][0]["value"], "100uatom")
+        self.assertIn("denom", elem["tx"]["auth_info"]["fee"]["amount"][0])
+        self.assertTrue(all(elem["tx"]["body"]["messages"] for elem in elems if elem["code"] == 0))
+
+        # block times loaded per page (50 elems)
+        self.assertEqual(mock_load_block_times.call_count, (len(elems) + 49) // 50)
+
+    def test_normalize_process_pool(self, mock_load_block_times):
+        elems = self._elems()
+        expected = copy.deepcopy(elems)
+        normalize_rpc_txns(NODE, expected, max_workers=1)
+
+        elems_ref = list(elems)
+        normalize_rpc_txns(NODE, elems, max_workers=2)
+
+        self.assertEqual(elems, expected)
+        # normalized in place
+        self.assertTrue(all(a is b for a, b in zip(elems, elems_ref)))
+
+    def test_normalize_pool_shared(self, mock_load_block_times):
+        with patch.object(NormalizePool, "executor", None):
+            executor = NormalizePool.start(max_workers=2)
+            try:
+                with patch("staketaxcsv.common.ibc.api_rpc.ProcessPoolExecutor") as mock_pool:
+                    normalize_rpc_txns(NODE, self._elems(), max_workers=2)
+                    normalize_rpc_txns(NODE, self._elems(), max_workers=2)
+                mock_pool.assert_not_called()
+                self.assertIs(NormalizePool.executor, executor)
+            finally:
+                executor.shutdown()
+
+    def test_normalize_single_tx_in_process(self, mock_load_block_times):
+        elems = self._elems()[:1]
+        with patch.object(NormalizePool, "executor", None), \
+             patch("staketaxcsv.common.ibc.api_rpc.ProcessPoolExecutor") as mock_pool:
+            normalize_rpc_txns(NODE, elems, max_workers=2)
+
+        mock_pool.assert_not_called()
+        self.assertEqual(elems[0]["txhash"], elems[0]["hash"])
+
+    def test_parse_log(self, mock_load_block_times):
+        elems = self._elems()[:3]
+        elems[0]["tx_result"]["log"] = '[{"events": [{"type": "message", "attributes": ' \
+                                       '[{"key": "action", "value": "swap"}, {"key": "ok", "value": true}]}]}]'
+        elems[1]["tx_result"]["log"] = "[{'events': []}]"
+        elems[2]["tx_result"]["log"] = "failed to execute message; message index: 0: out of gas"
+        normalize_rpc_txns(NODE, elems, max_workers=1)
+
+        self.assertEqual(elems[0]["tx"]["body"]["messages"], [{"@type": "swap", "ok": True}])
+        self.assertEqual(elems[1]["logs"], [{"events": []}])
+        self.assertEqual(elems[2]["logs"], [])
+        self.assertTrue(elems[2]["tx_result"]["log_original"].startswith("failed to execute"))
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from staketaxcsv.sol import staking_rewards_common
+from staketaxcsv.sol.api_rpc import RpcAPI
+from staketaxcsv.sol.staking_rewards_common import EpochTable, epoch_slot_and_time, epoch_time, get_epochs_all
+
+
+def mock_get_block_time(block):
+    # first guessed slot for each epoch skipped
+    if block % 432000 == 0:
+        raise KeyError("block")
+    return "2024-08-13 17:49:42"
+
+
+class TestSolEpochTable(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "sol_epochs.csv")
+        self.patches = [
+            patch("staketaxcsv.settings_csv.SOL_EPOCHS_PATH", self.path),
+            patch.object(EpochTable, "rows", {}),
+            patch.object(EpochTable, "loaded", False),
+            patch.object(staking_rewards_common, "EPOCHS_ALL", []),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmpdir.cleanup()
+
+    def _reload(self):
+        EpochTable.rows = {}
+        EpochTable.loaded = False
+
+    @patch.object(RpcAPI, "get_block_time")
+    def test_snapshot(self, mock_get_block_time_):
+        self.assertEqual(epoch_slot_and_time(132), (57456000, "2020-12-26 10:58:10"))
+        self.assertEqual(epoch_time(545), "2023-12-14 15:53:54")
+        mock_get_block_time_.assert_not_called()
+
+    @patch.object(RpcAPI, "get_block_time", side_effect=mock_get_block_time)
+    def test_lookup_appended(self, mock_get_block_time_):
+        # not in snapshot: looked up via rpc (first guess skipped), then appended to table
+        self.assertEqual(epoch_slot_and_time(655), (57456000 + 523 * 432000 + 4, "2024-08-13 17:49:42"))
+        self.assertEqual(mock_get_block_time_.call_count, 2)
+
+        # slot not in snapshot: only looked up when slot needed
+        self.assertEqual(epoch_time(300), "2022-04-16 18:13:11")
+        self.assertEqual(mock_get_block_time_.call_count, 2)
+        epoch_slot_and_time(300)
+        self.assertEqual(mock_get_block_time_.call_count, 4)
+
+        # later runs use table file
+        self._reload()
+        mock_get_block_time_.reset_mock()
+        self.assertEqual(epoch_time(655), "2024-08-13 17:49:42")
+        self.assertEqual(epoch_slot_and_time(300)[0], 57456000 + 168 * 432000 + 4)
+        mock_get_block_time_.assert_not_called()
+
+    def test_add_concurrent_create(self):
+        # Another process creates table file between exists check and create: header written once
+        real_exists = os.path.exists
+
+        def exists_before_create(path):
+            if path == self.path and not real_exists(path):
+                with open(path, "w", newline="") as f:
+                    f.write("epoch,slot,timestamp\r\n")
+                return False
+            return real_exists(path)
+
+        with patch("staketaxcsv.sol.staking_rewards_common.os.path.exists", side_effect=exists_before_create):
+            EpochTable.add(800, 345600004, "2024-08-13 17:49:42")
+
+        with open(self.path, "r") as f:
+            self.assertEqual(f.read().count("epoch,"), 1)
+
+    def test_load_skips_duplicate_header(self):
+        with open(self.path, "w", newline="") as f:
+            f.write("epoch,slot,timestamp\r\nepoch,slot,timestamp\r\n800,345600004,2024-08-13 17:49:42\r\n")
+
+        self.assertEqual(EpochTable.get(800), (345600004, "2024-08-13 17:49:42"))
+
+    @patch.object(RpcAPI, "get_latest_epoch", return_value=700)
+    def test_get_epochs_all(self, mock_get_latest_epoch):
+        # table not recent: current epoch from rpc
+        self.assertEqual(get_epochs_all()[-1], 699)
+        self.assertEqual(mock_get_latest_epoch.call_count, 1)
+
+        # latest epoch in table ended recently: no rpc call
+        staking_rewards_common.EPOCHS_ALL = []
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        EpochTable.add(800, 345600004, now)
+        self.assertEqual(get_epochs_all()[-1], 800)
+        self.assertEqual(mock_get_latest_epoch.call_count, 1)
@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.common.concurrent_util import run_pipelined
+from staketaxcsv.sol.api_rpc import RpcAPI
+
+TXIDS = ["tx{}".format(i) for i in range(5)]
+
+
+def _fetch_batch(method, list_params):
+    # Error for one tx (i.e. rate limited), and no response for another
+    out = []
+    for txid, _ in list_params:
+        if txid == "tx1":
+            out.append({"error": {"code": 429, "message": "Too many requests"}})
+        elif txid == "tx3":
+            out.append(None)
+        else:
+            out.append({"result": {"txid": txid, "from": "batch"}})
+    return out
+
+
+def _fetch(method, params_list):
+    return {"result": {"txid": params_list[0], "from": "single"}}
+
+
+class TestSolFetchTxs(unittest.TestCase):
+
+    @patch.object(RpcAPI, "_fetch", side_effect=_fetch)
+    @patch.object(RpcAPI, "_fetch_batch", side_effect=_fetch_batch)
+    def test_fetch_txs_batch(self, mock_fetch_batch, mock_fetch):
+        result = RpcAPI.fetch_txs(TXIDS)
+
+        self.assertEqual([data["result"]["txid"] for data in result], TXIDS)
+        self.assertEqual([data["result"]["from"] for data in result],
+                         ["batch", "single", "batch", "single", "batch"])
+        self.assertEqual(mock_fetch_batch.call_count, 1)
+        self.assertEqual(mock_fetch.call_count, 2)
+
+    def test_run_pipelined_keeps_order(self):
+        list_args = [(i,) for i in range(50)]
+        result = list(run_pipelined(lambda i: i * i, list_args, max_workers=4, max_pending=3))
+        self.assertEqual(result, [i * i for i in range(50)])
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.sol import staking_rewards
+from staketaxcsv.sol.api_rpc import RpcAPI
+from staketaxcsv.sol.staking_rewards_local import StakingRewardsLocalDB
+
+ADDRESSES = [
+    "2gkKivvDqc4gn2JXNfPjhSgyeE4U4SGxjrvpo6E5gkeK",
+    "61H9wkgj4KYWDXA7zJSRWy974iDhnsCVjvUQTNAKHmfR",
+    "F6dEJnUbV999jwHdA6GPb1YhwfcyPfDXq9LcwMkUFbLr",
+]
+EPOCHS = [132, 133, 134, 135, 136]
+
+
+def _amount(staking_address, epoch):
+    """ Lamports reward; none for first address in odd epochs """
+    i = ADDRESSES.index(staking_address)
+    if i == 0 and epoch % 2:
+        return None
+    return (i + 1) * 1000000000 + epoch
+
+
+def mock_fetch(method, params_list):
+    assert method == "getInflationReward"
+    staking_addresses, config = params_list
+    epoch = config["epoch"]
+    result = []
+    for staking_address in staking_addresses:
+        amount = _amount(staking_address, epoch)
+        result.append({"amount": amount, "epoch": epoch} if amount else None)
+    return {"jsonrpc": "2.0", "result": result}
+
+
+def mock_epoch_time(epoch):
+    return f"2021-01-{epoch - 130:02d} 00:00:00"
+
+
+def _expected(staking_address, epochs):
+    return [(epoch, f"2021-01-{epoch - 130:02d} 00:00:00", _amount(staking_address, epoch) / 1000000000)
+            for epoch in epochs if _amount(staking_address, epoch)]
+
+
+@patch("staketaxcsv.sol.staking_rewards.epoch_time", side_effect=mock_epoch_time)
+@patch("staketaxcsv.sol.staking_rewards.get_epochs_all", return_value=EPOCHS)
+class TestSolRewardsBatch(unittest.TestCase):
+
+    @patch.object(RpcAPI, "_fetch", side_effect=mock_fetch)
+    def test_rewards_via_rpc_addresses(self, mock_fetch_, mock_get_epochs_all, mock_epoch_time_):
+        result = staking_rewards._rewards_via_rpc_addresses(ADDRESSES)
+
+        for staking_address in ADDRESSES:
+            self.assertEqual(result[staking_address], _expected(staking_address, EPOCHS))
+
+        # one request (and one timestamp lookup) per epoch, for all staking addresses
+        self.assertEqual(mock_fetch_.call_count, len(EPOCHS))
+        self.assertEqual(mock_epoch_time_.call_count, len(EPOCHS))
+
+    @patch("staketaxcsv.sol.api_rpc.INFLATION_REWARD_MAX_ADDRESSES", 2)
+    @patch.object(RpcAPI, "_fetch", side_effect=mock_fetch)
+    def test_rewards_via_rpc_addresses_chunked(self, mock_fetch_, mock_get_epochs_all, mock_epoch_time_):
+        result = staking_rewards._rewards_via_rpc_addresses(ADDRESSES)
+
+        self.assertEqual(result[ADDRESSES[2]], _expected(ADDRESSES[2], EPOCHS))
+        self.assertEqual(mock_fetch_.call_count, 2 * len(EPOCHS))
+
+    @patch.object(RpcAPI, "_fetch", side_effect=mock_fetch)
+    def test_rewards_via_db_addresses(self, mock_fetch_, mock_get_epochs_all, mock_epoch_time_):
+        with tempfile.TemporaryDirectory() as dirpath:
+            db = StakingRewardsLocalDB(os.path.join(dirpath, "rewards.db"))
+            db.set_multi_block_rewards([
+                (132, 57456000, "2021-01-02 00:00:00", [(ADDRESSES[0], 1.0), (ADDRESSES[1], 2.0)]),
+                (133, 57888000, "2021-01-03 00:00:00", [(ADDRESSES[1], 2.0)]),
+            ])
+            result = staking_rewards._rewards_via_db_addresses(ADDRESSES, db)
+            db.conn.close()
+
+        self.assertEqual(result[ADDRESSES[0]][0], (132, "2021-01-02 00:00:00", 1.0))
+        self.assertEqual(result[ADDRESSES[1]][:2], [(132, "2021-01-02 00:00:00", 2.0),
+                                                   (133, "2021-01-03 00:00:00", 2.0)])
+        for staking_address in ADDRESSES:
+            rewards_rpc = [reward for reward in result[staking_address] if reward[0] >= 134]
+            self.assertEqual(rewards_rpc, _expected(staking_address, EPOCHS[2:]))
+
+        # epochs missing from db: one request per epoch
+        self.assertEqual(mock_fetch_.call_count, 3)
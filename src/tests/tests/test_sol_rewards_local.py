@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.sol import staking_rewards
+from staketaxcsv.sol.staking_rewards_local import StakingRewardsLocalDB
+
+STAKING_ADDRESS = "F6dEJnUbV999jwHdA6GPb1YhwfcyPfDXq9LcwMkUFbLr"
+OTHER_ADDRESS = "2gkKivvDqc4gn2JXNfPjhSgyeE4U4SGxjrvpo6E5gkeK"
+
+
+class TestSolRewardsLocal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = StakingRewardsLocalDB(os.path.join(self.tmpdir.name, "rewards.db"))
+        self.db.set_multi_block_rewards([
+            (132, 57456000, "2021-01-01 00:00:00", [(STAKING_ADDRESS, 1.5), (OTHER_ADDRESS, 2.0)]),
+            (133, 57888000, "2021-01-03 00:00:00", [(OTHER_ADDRESS, 2.1)]),
+            (134, 58320000, "2021-01-05 00:00:00", [(STAKING_ADDRESS, 1.6)]),
+        ])
+
+    def tearDown(self):
+        self.db.conn.close()
+        self.tmpdir.cleanup()
+
+    def test_get_rewards_for_address(self):
+        result = self.db.get_rewards_for_address(STAKING_ADDRESS, [132, 133, 134, 135])
+
+        self.assertEqual(result, {
+            132: ("2021-01-01 00:00:00", 1.5),
+            133: ("2021-01-03 00:00:00", 0.0),
+            134: ("2021-01-05 00:00:00", 1.6),
+        })
+        self.assertEqual(self.db.get_epoch_timestamps()["134"], "2021-01-05 00:00:00")
+
+    @patch("staketaxcsv.sol.staking_rewards._lookup_rewards_via_rpc",
+           return_value={STAKING_ADDRESS: ("2021-01-07 00:00:00", 1.7)})
+    @patch("staketaxcsv.sol.staking_rewards.get_epochs_all", return_value=[132, 133, 134, 135])
+    def test_rewards_via_db(self, mock_get_epochs_all, mock_lookup_rewards_via_rpc):
+        result = staking_rewards._rewards_via_db_addresses([STAKING_ADDRESS], self.db)[STAKING_ADDRESS]
+
+        self.assertEqual(result, [
+            (132, "2021-01-01 00:00:00", 1.5),
+            (134, "2021-01-05 00:00:00", 1.6),
+            (135, "2021-01-07 00:00:00", 1.7),
+        ])
+        # only epoch missing from db uses rpc
+        mock_lookup_rewards_via_rpc.assert_called_once_with([STAKING_ADDRESS], 135)
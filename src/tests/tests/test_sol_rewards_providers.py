@@ -0,0 +1,98 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from staketaxcsv.sol import staking_rewards_flipside, staking_rewards_solscan
+
+ADDRESSES = [
+    "2gkKivvDqc4gn2JXNfPjhSgyeE4U4SGxjrvpo6E5gkeK",
+    "61H9wkgj4KYWDXA7zJSRWy974iDhnsCVjvUQTNAKHmfR",
+    "F6dEJnUbV999jwHdA6GPb1YhwfcyPfDXq9LcwMkUFbLr",
+]
+
+
+def _row(staking_address, epoch):
+    return {
+        "stake_pubkey": staking_address,
+        "block_timestamp": f"2024-08-{epoch - 640:02d}T17:49:42.000Z",
+        "epoch_earned": epoch,
+        "reward_amount_sol": 1.5,
+        "post_balance_sol": 100.0,
+    }
+
+
+class FakeFlipside:
+    """ Query results served in pages of 2 rows """
+
+    def __init__(self):
+        self.queries = []
+        self.pages = {}
+
+    def query(self, sql, page_size):
+        self.queries.append(sql)
+        rows = [_row(addr, epoch) for addr in ADDRESSES if f"'{addr}'" in sql for epoch in (650, 651)]
+        query_id = str(len(self.queries))
+        self.pages[query_id] = [rows[i:i + 2] for i in range(0, len(rows), 2)]
+        return self.get_query_results(query_id, 1, page_size)
+
+    def get_query_results(self, query_id, page_number, page_size):
+        pages = self.pages[query_id]
+        return SimpleNamespace(
+            query_id=query_id,
+            records=pages[page_number - 1],
+            page=SimpleNamespace(currentPageNumber=page_number, totalPages=len(pages)),
+        )
+
+
+class TestSolRewardsProviders(unittest.TestCase):
+
+    def test_flipside_addresses(self):
+        client = FakeFlipside()
+        with patch.object(staking_rewards_flipside, "_flipside", return_value=client), \
+             patch.object(staking_rewards_flipside, "FLIPSIDE_MAX_ADDRESSES", 2):
+            result = staking_rewards_flipside.fetch_rewards_flipside_addresses(ADDRESSES)
+
+        # one query per chunk of addresses
+        self.assertEqual(len(client.queries), 2)
+        self.assertIn(f"STAKE_PUBKEY IN ('{ADDRESSES[0]}', '{ADDRESSES[1]}')", client.queries[0])
+
+        for staking_address in ADDRESSES:
+            self.assertEqual(result[staking_address], [
+                (650, "2024-08-10 17:49:42", 1.5),
+                (651, "2024-08-11 17:49:42", 1.5),
+            ])
+
+    @patch.object(staking_rewards_flipside, "FLIPSIDE_BACKOFF_SECONDS", 0)
+    def test_flipside_page_error_retried(self):
+        client = FakeFlipside()
+        get_query_results = client.get_query_results
+        errors = [Exception("timeout")]
+
+        def flaky_get_query_results(query_id, page_number, page_size):
+            # first fetch of page 2 fails
+            if page_number == 2 and errors:
+                raise errors.pop()
+            return get_query_results(query_id, page_number, page_size)
+
+        client.get_query_results = flaky_get_query_results
+        with patch.object(staking_rewards_flipside, "_flipside", return_value=client):
+            result = staking_rewards_flipside.fetch_rewards_flipside_addresses(ADDRESSES)
+
+        self.assertEqual(len(client.queries), 1)
+        self.assertEqual(sum(len(rewards) for rewards in result.values()), 6)
+
+    @patch.object(staking_rewards_flipside, "FLIPSIDE_BACKOFF_SECONDS", 0)
+    def test_flipside_error(self):
+        # Fails run instead of reporting no staking rewards
+        with patch.object(staking_rewards_flipside, "_flipside", side_effect=Exception("timeout")):
+            with self.assertRaises(Exception):
+                staking_rewards_flipside.fetch_rewards_flipside_addresses(ADDRESSES)
+
+    @patch.object(staking_rewards_solscan, "fetch_rewards_solscan",
+                  side_effect=lambda staking_address: [(650, "2024-08-10 17:49:42", len(staking_address))])
+    def test_solscan_addresses(self, mock_fetch):
+        result = staking_rewards_solscan.fetch_rewards_solscan_addresses(ADDRESSES)
+
+        self.assertEqual(list(result.keys()), ADDRESSES)
+        self.assertEqual(result[ADDRESSES[2]], [(650, "2024-08-10 17:49:42", 44)])
+        self.assertEqual(mock_fetch.call_count, 3)
@@ -10,7 +10,7 @@ validator or contract.  This is to ensure good faith in maintaining privacy.
 import json
 import logging
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from tests.settings_test import specialtest, rewards_db, DATADIR
 from tests.mock_sol import MockRpcAPI
@@ -22,6 +22,10 @@ STAKING_ADDRESS = "F6dEJnUbV999jwHdA6GPb1YhwfcyPfDXq9LcwMkUFbLr"
 REWARDS_GOLD_JSON = DATADIR + "/" + TICKER_SOL + "/rewards." + STAKING_ADDRESS + ".json"
 
 
+def _rewards(staking_address, start_date=None, end_date=None):
+    return staking_rewards._rewards_addresses([staking_address], MagicMock(), start_date, end_date)[staking_address]
+
+
 @specialtest
 class TestSolStakingRewards(unittest.TestCase):
     rewards_gold = None
@@ -39,14 +43,14 @@ class TestSolStakingRewards(unittest.TestCase):
     @patch("staketaxcsv.sol.staking_rewards_common.RpcAPI", new=MockRpcAPI)
     @patch("staketaxcsv.sol.staking_rewards.get_epochs_all", return_value=list(range(132, 137)))
     def test_rewards_using_rpc(self, mock_get_epochs_all):
-        result = staking_rewards._rewards(STAKING_ADDRESS)
+        result = _rewards(STAKING_ADDRESS)
         self.assertEqual(result[:5], self.rewards_gold[:5])
 
     def test_lookup_reward_via_rpc(self):
         # test pre-epoch 651
 
         staking_address = "2gkKivvDqc4gn2JXNfPjhSgyeE4U4SGxjrvpo6E5gkeK"
-        ts, amount = staking_rewards._lookup_reward_via_rpc(staking_address, 645)
+        ts, amount = staking_rewards._lookup_rewards_via_rpc([staking_address], 645)[staking_address]
         self.assertEqual(ts, "2024-07-22 19:54:28")
         self.assertEqual(amount, 32.404371735)
 
@@ -54,17 +58,17 @@ class TestSolStakingRewards(unittest.TestCase):
         # doesn't cause issues
 
         staking_address = "2gkKivvDqc4gn2JXNfPjhSgyeE4U4SGxjrvpo6E5gkeK"
-        ts, amount = staking_rewards._lookup_reward_via_rpc(staking_address, 655)
+        ts, amount = staking_rewards._lookup_rewards_via_rpc([staking_address], 655)[staking_address]
         self.assertEqual(ts, "2024-08-13 17:49:42")
         self.assertEqual(amount, 32.538007227)
         staking_address = "61H9wkgj4KYWDXA7zJSRWy974iDhnsCVjvUQTNAKHmfR"
-        ts, amount = staking_rewards._lookup_reward_via_rpc(staking_address, 654)
+        ts, amount = staking_rewards._lookup_rewards_via_rpc([staking_address], 654)[staking_address]
         self.assertEqual(ts, "2024-08-11 15:17:17")
         self.assertEqual(amount, 16.961246909)
 
     @rewards_db
     def test_rewards_using_db(self):
-        result = staking_rewards._rewards(STAKING_ADDRESS)
+        result = _rewards(STAKING_ADDRESS)
         self.assertEqual(result[:400], self.rewards_gold[:400])
 
         # Make sure all epochs are in rewards result
@@ -72,61 +76,61 @@ class TestSolStakingRewards(unittest.TestCase):
 
     @rewards_db
     def test_rewards_using_db_start_date_only(self):
-        result = staking_rewards._rewards(STAKING_ADDRESS, start_date="2023-12-12")
+        result = _rewards(STAKING_ADDRESS, start_date="2023-12-12")
         self.assertEqual(result[:2], [
             (544, "2023-12-12 08:28:18", 12.038016226),
             (545, "2023-12-14 15:53:54", 12.131610051),
         ])
 
-        result = staking_rewards._rewards(STAKING_ADDRESS, start_date="2023-12-13")
+        result = _rewards(STAKING_ADDRESS, start_date="2023-12-13")
         self.assertEqual(result[:1], [
             (545, "2023-12-14 15:53:54", 12.131610051)
         ])
 
-        result = staking_rewards._rewards(STAKING_ADDRESS, start_date="2001-01-01")
+        result = _rewards(STAKING_ADDRESS, start_date="2001-01-01")
         self.assertEqual(result[:400], self.rewards_gold[:400])
 
-        result = staking_rewards._rewards(STAKING_ADDRESS, start_date="2099-01-01")
+        result = _rewards(STAKING_ADDRESS, start_date="2099-01-01")
         self.assertEqual(result, [])
 
     @rewards_db
     def test_rewards_using_db_end_date_only(self):
-        result = staking_rewards._rewards(STAKING_ADDRESS, end_date="2020-12-28")
+        result = _rewards(STAKING_ADDRESS, end_date="2020-12-28")
         self.assertEqual(result[:2], [
             (132, "2020-12-26 10:58:10", 0.056222434),
             (133, "2020-12-28 21:05:16", 0.055973666),
         ])
 
-        result = staking_rewards._rewards(STAKING_ADDRESS, end_date="2020-12-27")
+        result = _rewards(STAKING_ADDRESS, end_date="2020-12-27")
         self.assertEqual(result[:1], [
             (132, "2020-12-26 10:58:10", 0.056222434),
         ])
 
-        result = staking_rewards._rewards(STAKING_ADDRESS, end_date="2099-01-01")
+        result = _rewards(STAKING_ADDRESS, end_date="2099-01-01")
         self.assertEqual(result[:400], self.rewards_gold[:400])
 
-        result = staking_rewards._rewards(STAKING_ADDRESS, end_date="2001-01-01")
+        result = _rewards(STAKING_ADDRESS, end_date="2001-01-01")
         self.assertEqual(result, [])
 
     @rewards_db
     def test_rewards_using_db_with_start_date_end_date(self):
-        result = staking_rewards._rewards(STAKING_ADDRESS, start_date="2023-12-07", end_date="2023-12-10")
+        result = _rewards(STAKING_ADDRESS, start_date="2023-12-07", end_date="2023-12-10")
         self.assertEqual(result, [
             (542, "2023-12-07 18:40:24", 12.097090153),
             (543, "2023-12-10 01:17:22", 12.124528007)
         ])
 
-        result = staking_rewards._rewards(STAKING_ADDRESS, start_date="2023-12-08", end_date="2023-12-10")
+        result = _rewards(STAKING_ADDRESS, start_date="2023-12-08", end_date="2023-12-10")
         self.assertEqual(result, [
             (543, "2023-12-10 01:17:22", 12.124528007)
         ])
 
-        result = staking_rewards._rewards(STAKING_ADDRESS, start_date="2001-01-01", end_date="2099-01-01")
+        result = _rewards(STAKING_ADDRESS, start_date="2001-01-01", end_date="2099-01-01")
         self.assertEqual(result[:400], self.rewards_gold[:400])
 
 
 def create_gold_json_file():
-    data = staking_rewards._rewards(STAKING_ADDRESS)
+    data = _rewards(STAKING_ADDRESS)
     with open(REWARDS_GOLD_JSON, "w") as f:
         json.dump(data, f, indent=4)
 
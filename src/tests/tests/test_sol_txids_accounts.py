@@ -0,0 +1,82 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from staketaxcsv.sol.txids import get_txids_for_accounts
+
+WALLET_ADDRESS = "4kLALtynrmd6pU2LkGXZCmUaMDfsnVixs7SkLjPKNJQG"
+TOKEN_ACCOUNTS = ["TokenAccount" + str(i) for i in range(6)]
+PAGE_SIZE = 3
+
+
+def _history(address):
+    """ (txid, block_time) newest first.  Token accounts share some txs with wallet and each other. """
+    if address == WALLET_ADDRESS:
+        times = range(1000, 1100, 10)
+    else:
+        i = TOKEN_ACCOUNTS.index(address)
+        times = range(1000 + i, 1100, 7)
+    return [(f"tx{t}", t) for t in sorted(times, reverse=True)]
+
+
+class MockRpcAPI:
+    active = 0
+    max_active = 0
+    calls = 0
+    lock = threading.Lock()
+
+    @classmethod
+    def get_txids(cls, address, limit=None, before_txid=None):
+        with cls.lock:
+            cls.calls += 1
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+        time.sleep(0.01)
+        with cls.lock:
+            cls.active -= 1
+
+        history = _history(address)
+        start = 0
+        if before_txid:
+            start = [txid for txid, _ in history].index(before_txid) + 1
+        page = history[start:start + PAGE_SIZE]
+        last_txid = page[-1][0] if page else None
+        return page, last_txid
+
+
+@patch("staketaxcsv.sol.txids.LIMIT_PER_QUERY", PAGE_SIZE)
+@patch("staketaxcsv.sol.txids.RpcAPI", new=MockRpcAPI)
+class TestSolTxidsAccounts(unittest.TestCase):
+
+    def setUp(self):
+        MockRpcAPI.max_active = 0
+        MockRpcAPI.calls = 0
+
+    def _expected(self, start_time=0):
+        times = set()
+        for address in [WALLET_ADDRESS] + TOKEN_ACCOUNTS:
+            times.update(t for _, t in _history(address) if t >= start_time)
+        return [f"tx{t}" for t in sorted(times)]
+
+    @patch("staketaxcsv.sol.txids.SOL_RPC_MAX_WORKERS", 4)
+    def test_concurrent_merge(self):
+        txids = get_txids_for_accounts([WALLET_ADDRESS] + TOKEN_ACCOUNTS, None)
+
+        # deduped, oldest first across all accounts
+        self.assertEqual(txids, self._expected())
+        self.assertGreater(MockRpcAPI.max_active, 1)
+
+    @patch("staketaxcsv.sol.txids.SOL_RPC_MAX_WORKERS", 1)
+    def test_sequential_same_result(self):
+        txids = get_txids_for_accounts([WALLET_ADDRESS] + TOKEN_ACCOUNTS, None)
+
+        self.assertEqual(txids, self._expected())
+        self.assertEqual(MockRpcAPI.max_active, 1)
+
+    @patch("staketaxcsv.sol.txids.SOL_RPC_MAX_WORKERS", 4)
+    def test_start_date(self):
+        # 1000 seconds after epoch is 1970-01-01; all txs are on the same date
+        self.assertEqual(get_txids_for_accounts([WALLET_ADDRESS] + TOKEN_ACCOUNTS, None, start_date="1970-01-02"), [])
+        self.assertEqual(get_txids_for_accounts([WALLET_ADDRESS] + TOKEN_ACCOUNTS, None, start_date="1970-01-01"),
+                         self._expected())
@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from staketaxcsv.sol import txids
+from staketaxcsv.sol.txids import get_txids_for_accounts
+
+WALLET_ADDRESS = "4kLALtynrmd6pU2LkGXZCmUaMDfsnVixs7SkLjPKNJQG"
+FIRST_SLOT = 1000
+LATEST_SLOT = 20000000
+GENESIS_TS = int(datetime(2021, 1, 1, tzinfo=timezone.utc).timestamp())
+PAGE_SIZE = 100
+
+
+def _block_time(slot):
+    return GENESIS_TS + slot * 2
+
+
+class FakeRpcAPI:
+    """ Blocks at even slots, 2 seconds per slot.  Wallet has a tx every 1000 slots. """
+    pages = 0
+    seek = True
+
+    @classmethod
+    def get_txids(cls, address, limit=None, before_txid=None):
+        cls.pages += 1
+        before_slot = int(before_txid.split("-")[1]) if before_txid else LATEST_SLOT + 1
+        start = (before_slot - 1) // 1000 * 1000
+        slots = range(start, max(start - limit * 1000, FIRST_SLOT - 1), -1000)
+        out = [(f"tx-{slot}-1", _block_time(slot)) for slot in slots]
+        return out, out[-1][0] if out and slots[-1] > FIRST_SLOT else None
+
+    @classmethod
+    def get_slot(cls):
+        return LATEST_SLOT if cls.seek else None
+
+    @classmethod
+    def get_first_available_block(cls):
+        return FIRST_SLOT
+
+    @classmethod
+    def get_block_at_or_after(cls, slot):
+        block = slot + slot % 2
+        return block if block <= LATEST_SLOT else None
+
+    @classmethod
+    def get_block_unix_time(cls, block):
+        return _block_time(block)
+
+    @classmethod
+    def get_block_first_signature(cls, block):
+        return f"vote-{block}-0"
+
+
+@patch("staketaxcsv.sol.txids.LIMIT_PER_QUERY", PAGE_SIZE)
+@patch("staketaxcsv.sol.txids.RpcAPI", new=FakeRpcAPI)
+class TestSolTxidsSeek(unittest.TestCase):
+
+    def setUp(self):
+        txids.SEEK_TXIDS.clear()
+        FakeRpcAPI.pages = 0
+        FakeRpcAPI.seek = True
+
+    def _run(self, seek, start_date=None, end_date=None):
+        txids.SEEK_TXIDS.clear()
+        FakeRpcAPI.pages = 0
+        FakeRpcAPI.seek = seek
+        return get_txids_for_accounts([WALLET_ADDRESS], None, start_date, end_date)
+
+    def test_seek_end_date(self):
+        expected = self._run(False, "2021-01-10", "2021-01-20")
+        pages_without_seek = FakeRpcAPI.pages
+
+        result = self._run(True, "2021-01-10", "2021-01-20")
+        self.assertEqual(result, expected)
+        self.assertGreater(len(result), 0)
+        self.assertLess(FakeRpcAPI.pages, pages_without_seek / 10)
+
+    def test_seek_block(self):
+        end_ts = int(datetime(2021, 1, 20, 23, 59, 59, tzinfo=timezone.utc).timestamp())
+        signature = txids._seek_before_txid(end_ts)
+        block = int(signature.split("-")[1])
+
+        self.assertGreater(_block_time(block), end_ts)
+        self.assertLessEqual(_block_time(block - txids.SEEK_SLOT_TOLERANCE - 2), end_ts)
+
+    def test_no_seek_for_recent_end_date(self):
+        # end_date after latest block: first page already reaches it
+        result = self._run(True, None, "2030-01-01")
+        self.assertEqual(result, self._run(False, None, "2030-01-01"))
+        self.assertEqual(txids.SEEK_TXIDS, {})
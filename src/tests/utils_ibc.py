@@ -1,4 +1,5 @@
 from unittest.mock import patch
+import base64
 import json
 import os
 from functools import wraps
@@ -38,3 +39,52 @@ def apply_ibc_patches(func):
             return func(*args, **kwargs)
 
     return wrapper
+
+
+def _varint(value):
+    out = bytearray()
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _field_varint(field_number, value):
+    # proto3 omits default values
+    if not value:
+        return b""
+    return _varint(field_number << 3) + _varint(value)
+
+
+def _field_bytes(field_number, value):
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    if not value:
+        return b""
+    return _varint(field_number << 3 | 2) + _varint(len(value)) + value
+
+
+def tx_raw_from_lcd(elem):
+    """ Returns protobuf encoded TxRaw (as in rpc /tx_search) for lcd tx elem (i.e. from load_tx()). """
+    tx = elem["tx"]
+    auth_info = tx["auth_info"]
+
+    signer_infos = b""
+    for signer_info in auth_info.get("signer_infos", []):
+        public_key = signer_info.get("public_key") or {}
+        any_key = _field_bytes(1, public_key.get("@type", "")) + _field_bytes(2, base64.b64decode(public_key.get("key", "")))
+        mode_info = _field_bytes(1, _field_varint(1, 127))
+        signer_infos += _field_bytes(1, _field_bytes(1, any_key) + _field_bytes(2, mode_info)
+                                     + _field_varint(3, int(signer_info.get("sequence", 0))))
+
+    fee = auth_info["fee"]
+    coins = b"".join(_field_bytes(1, _field_bytes(1, coin["denom"]) + _field_bytes(2, coin["amount"]))
+                     for coin in fee["amount"])
+    fee_bytes = coins + _field_varint(2, int(fee.get("gas_limit", 0))) + _field_bytes(3, fee.get("payer", ""))
+
+    # body is skipped by fee decoding, so any bytes of realistic size will do
+    body_bytes = json.dumps(tx["body"]).encode("utf-8")
+    signatures = b"".join(_field_bytes(3, base64.b64decode(sig)) for sig in tx.get("signatures", []))
+
+    return _field_bytes(1, body_bytes) + _field_bytes(2, signer_infos + _field_bytes(2, fee_bytes)) + signatures